@@ -0,0 +1,166 @@
+"""Asynchronous AbuseIPDB API client (requires aiohttp)."""
+
+import asyncio
+import json
+from typing import Iterable, Optional
+
+try:
+    import aiohttp
+except ImportError:  # Optional dependency, only needed for async use
+    aiohttp = None
+
+from client import API_ENDPOINT, API_TIMEOUT, ReportResult, build_report_result
+from bulk import BulkReport
+
+
+DEFAULT_MAX_CONCURRENCY = 100
+DEFAULT_POOL_SIZE = 100
+
+
+class AsyncAbuseIPDBClient:
+    """asyncio counterpart of AbuseIPDBClient for use inside event loops."""
+    
+    def __init__(
+        self,
+        api_key: str,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        pool_size: int = DEFAULT_POOL_SIZE
+    ):
+        """
+        Initialize the async AbuseIPDB client.
+        
+        All reports share one aiohttp session and connection pool. A
+        semaphore caps the number of requests in flight, so thousands of
+        reports can be scheduled at once without opening thousands of
+        sockets.
+        
+        Args:
+            api_key: The AbuseIPDB API key
+            max_concurrency: Maximum number of requests in flight
+            pool_size: Maximum number of pooled connections
+            
+        Raises:
+            ImportError: If aiohttp is not installed
+        """
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncAbuseIPDBClient requires aiohttp (pip install aiohttp)"
+            )
+        
+        self.api_key = api_key
+        self.headers = {
+            "Key": api_key,
+            "Accept": "application/json"
+        }
+        self.pool_size = pool_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session: Optional["aiohttp.ClientSession"] = None
+    
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Create the shared session on first use (inside the running loop)."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=API_TIMEOUT)
+            )
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the shared session and its pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    async def __aenter__(self) -> "AsyncAbuseIPDBClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+    
+    async def submit_report(
+        self,
+        ip: str,
+        category_ids: list[int],
+        comment: str,
+        confidence: int = 100
+    ) -> ReportResult:
+        """
+        Submit an abuse report to AbuseIPDB without blocking the event loop.
+        
+        Args:
+            ip: The IP address to report
+            category_ids: List of numeric category IDs
+            comment: Report comment/description
+            confidence: Confidence score (0-100, default 100)
+            
+        Returns:
+            ReportResult object containing the outcome
+        """
+        data = {
+            "ip": ip,
+            "categories": ",".join(str(cid) for cid in category_ids),
+            "comment": comment,
+            "confidence": confidence
+        }
+        
+        async with self._semaphore:
+            try:
+                session = self._get_session()
+                async with session.post(API_ENDPOINT, data=data) as response:
+                    status_code = response.status
+                    try:
+                        response_data = await response.json(content_type=None)
+                    except (json.JSONDecodeError, aiohttp.ContentTypeError):
+                        return ReportResult(
+                            success=False,
+                            message="Failed to parse API response",
+                            status_code=status_code,
+                            error="Invalid JSON in response body"
+                        )
+                    return build_report_result(status_code, response_data)
+            
+            except asyncio.TimeoutError:
+                return ReportResult(
+                    success=False,
+                    message="Request timed out",
+                    error=f"The API request exceeded {API_TIMEOUT} seconds"
+                )
+            except aiohttp.ClientConnectionError as e:
+                return ReportResult(
+                    success=False,
+                    message="Connection error",
+                    error=str(e)
+                )
+            except aiohttp.ClientError as e:
+                return ReportResult(
+                    success=False,
+                    message="Request failed",
+                    error=str(e)
+                )
+            except Exception as e:
+                return ReportResult(
+                    success=False,
+                    message="Unexpected error",
+                    error=str(e)
+                )
+    
+    async def submit_many(self, reports: Iterable[BulkReport]) -> list[ReportResult]:
+        """
+        Submit many reports concurrently, bounded by ``max_concurrency``.
+        
+        Args:
+            reports: Reports to submit
+            
+        Returns:
+            List of ReportResult objects in the same order as ``reports``
+        """
+        return await asyncio.gather(*(
+            self.submit_report(
+                report.ip,
+                report.category_ids,
+                report.comment,
+                report.confidence
+            )
+            for report in reports
+        ))
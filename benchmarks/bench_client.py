@@ -0,0 +1,299 @@
+"""
+Throughput and latency benchmark for the submission paths.
+
+Starts benchmarks/mock_server.py in a separate process, points the client
+at it and drives each submission mode:
+
+    single      AbuseIPDBClient.submit_report, one report at a time
+    concurrent  bulk.iter_bulk on a worker pool
+    bulk        AbuseIPDBClient.submit_bulk_report (CSV uploads)
+    streaming   --input style pipeline: lines parsed by ingest, validated
+                in batches and submitted lazily through iter_bulk
+                
+For each mode it records reports per second, p50/p95/p99 latency per
+report (including retries), retries and result status codes, and the
+peak Python memory from a second, traced run. Results are written as
+JSON. --compare checks them against an earlier file and exits with
+status 1 when a mode's throughput drops by more than --tolerance percent.
+
+Usage:
+    python benchmarks/bench_client.py [--reports N] [--latency MS] [--output FILE]
+    python benchmarks/bench_client.py --compare baseline.json
+"""
+
+import argparse
+import io
+import json
+import platform
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+import urllib.request
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import client
+from bulk import iter_bulk
+from client import AbuseIPDBClient, BulkReport, ReportResult, RetryPolicy
+from ingest import read_records, batch_records
+from ratelimit import RateLimiter
+from validators import validate_ip_batch, unpack_ip
+
+
+MOCK_SERVER = Path(__file__).resolve().parent / "mock_server.py"
+MODES = ("single", "concurrent", "bulk", "streaming")
+DEFAULT_REPORTS = 2000
+DEFAULT_CONCURRENCY = 8
+DEFAULT_OUTPUT = "bench_results.json"
+DEFAULT_TOLERANCE = 15.0
+BENCH_API_KEY = "0" * 80
+FIRST_ADDRESS = 0x0B000000    # 11.0.0.0, outside every reserved range
+
+
+def addresses(count: int) -> Iterator[str]:
+    """Yield ``count`` distinct public IPv4 addresses."""
+    for offset in range(1, count + 1):
+        yield socket.inet_ntoa((FIRST_ADDRESS + offset).to_bytes(4, "big"))
+
+
+def make_reports(count: int) -> list[BulkReport]:
+    """Build ``count`` reports with distinct addresses."""
+    return [BulkReport(ip, [18, 22], "Benchmark report", 100) for ip in addresses(count)]
+
+
+def run_single(api: AbuseIPDBClient, count: int, concurrency: int) -> list[ReportResult]:
+    """Submit reports one by one on the calling thread."""
+    return [
+        api.submit_report(report.ip, report.category_ids, report.comment, report.confidence)
+        for report in make_reports(count)
+    ]
+
+
+def run_concurrent(api: AbuseIPDBClient, count: int, concurrency: int) -> list[ReportResult]:
+    """Submit a prepared list of reports on a worker pool."""
+    return [result for _, _, result in iter_bulk(api, make_reports(count), concurrency)]
+
+
+def run_bulk(api: AbuseIPDBClient, count: int, concurrency: int) -> list[ReportResult]:
+    """Upload all reports through the /bulk-report endpoint."""
+    return api.submit_bulk_report(make_reports(count))
+
+
+def run_streaming(api: AbuseIPDBClient, count: int, concurrency: int) -> list[ReportResult]:
+    """Parse, validate and submit CSV input lazily, as --input does."""
+    # CSV text is generated and parsed lazily, as run_input_mode reads a file
+    lines = (f"{ip},18;22,Benchmark report,100\n" for ip in addresses(count))
+    stream = io.StringIO("".join(lines))
+    
+    def reports() -> Iterator[BulkReport]:
+        for batch in batch_records(read_records(stream, "csv")):
+            ip_batch = validate_ip_batch(record.ip for record in batch)
+            for record, packed_ip in zip(batch, ip_batch.values):
+                category_ids = [int(cid) for cid in record.categories.split(",")]
+                yield BulkReport(unpack_ip(packed_ip), category_ids, record.comment, record.confidence)
+    
+    return [result for _, _, result in iter_bulk(api, reports(), concurrency)]
+
+
+RUNNERS: dict[str, Callable[[AbuseIPDBClient, int, int], list[ReportResult]]] = {
+    "single": run_single,
+    "concurrent": run_concurrent,
+    "bulk": run_bulk,
+    "streaming": run_streaming,
+}
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def new_client(args: argparse.Namespace) -> AbuseIPDBClient:
+    """Create a client configured for the benchmark."""
+    limiter = RateLimiter(rate=args.client_rate, burst=max(1, int(args.client_rate)))
+    policy = RetryPolicy(max_attempts=args.max_attempts)
+    return AbuseIPDBClient(
+        BENCH_API_KEY,
+        pool_maxsize=max(client.POOL_MAXSIZE, args.concurrency),
+        rate_limiter=limiter,
+        retry_policy=policy
+    )
+
+
+def measure(mode: str, args: argparse.Namespace, mock_url: str) -> dict[str, Any]:
+    """Run one mode for timing, then again under tracemalloc for memory."""
+    runner = RUNNERS[mode]
+    count = args.reports
+    
+    requests_before = mock_stats(mock_url)["counts"].get("requests", 0)
+    with new_client(args) as api:
+        started = time.perf_counter()
+        results = runner(api, count, args.concurrency)
+        elapsed = time.perf_counter() - started
+    requests_sent = mock_stats(mock_url)["counts"].get("requests", 0) - requests_before
+    
+    tracemalloc.start()
+    with new_client(args) as api:
+        runner(api, count, args.concurrency)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    latencies = sorted(result.latency for result in results)
+    status_codes = Counter(str(result.status_code or result.message) for result in results)
+    succeeded = sum(1 for result in results if result.success)
+    return {
+        "reports": count,
+        "succeeded": succeeded,
+        "failed": count - succeeded,
+        "seconds": round(elapsed, 4),
+        "reports_per_second": round(count / elapsed, 1) if elapsed else None,
+        "http_requests": requests_sent,
+        "retries": sum(result.attempts - 1 for result in results),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99": round(percentile(latencies, 0.99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        },
+        "status_codes": dict(status_codes),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def start_mock(args: argparse.Namespace) -> tuple[subprocess.Popen, str]:
+    """Start the mock server process and return it with its base URL."""
+    command = [
+        sys.executable, str(MOCK_SERVER),
+        "--latency", str(args.latency),
+        "--jitter", str(args.jitter),
+        "--error-rate", str(args.error_rate),
+        "--throttle-rate", str(args.throttle_rate),
+        "--retry-after", str(args.retry_after),
+        "--invalid-row-rate", str(args.invalid_row_rate),
+    ]
+    if args.quota is not None:
+        command += ["--quota", str(args.quota)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline().strip()
+    if not line.startswith("listening on "):
+        process.kill()
+        raise RuntimeError(f"Mock server failed to start: {line!r}")
+    return process, line[len("listening on "):]
+
+
+def mock_stats(mock_url: str) -> dict[str, Any]:
+    """Fetch the mock server's counters."""
+    with urllib.request.urlopen(mock_url + "/stats") as response:
+        return json.load(response)
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> bool:
+    """
+    Print per-mode changes against a baseline result file.
+    
+    Returns:
+        True if no mode's throughput dropped by more than ``tolerance`` percent
+    """
+    ok = True
+    print(f"\nCompared with {baseline.get('timestamp', 'baseline')}:")
+    for mode, result in current["modes"].items():
+        old = baseline.get("modes", {}).get(mode)
+        if not old or not old.get("reports_per_second"):
+            continue
+        change = (result["reports_per_second"] / old["reports_per_second"] - 1) * 100
+        p95_old, p95_new = old["latency_ms"]["p95"], result["latency_ms"]["p95"]
+        flag = ""
+        if change < -tolerance:
+            flag = "  REGRESSION"
+            ok = False
+        print(f"  {mode:<11} {old['reports_per_second']:>9.1f} -> {result['reports_per_second']:>9.1f} "
+              f"reports/s ({change:+.1f}%), p95 {p95_old:.1f} -> {p95_new:.1f} ms{flag}")
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark submission modes against a mock API")
+    parser.add_argument("--modes", default=",".join(MODES),
+                        help=f"Comma-separated modes to run (default: {','.join(MODES)})")
+    parser.add_argument("--reports", type=int, default=DEFAULT_REPORTS,
+                        help=f"Reports per mode (default: {DEFAULT_REPORTS})")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Workers for concurrent/streaming (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--client-rate", type=float, default=1e6,
+                        help="Client rate limit in requests/s (default: effectively unlimited)")
+    parser.add_argument("--max-attempts", type=int, default=RetryPolicy.max_attempts,
+                        help=f"Attempts per request (default: {RetryPolicy.max_attempts})")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random mock latency in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 responses")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of 429 responses")
+    parser.add_argument("--quota", type=int, help="Mock request quota before 429s")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on 429")
+    parser.add_argument("--invalid-row-rate", type=float, default=0.0,
+                        help="Fraction of bulk rows the mock rejects")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT,
+                        help=f"JSON results file (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--compare", metavar="FILE", help="Baseline JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed throughput drop in percent (default: {DEFAULT_TOLERANCE:g})")
+    args = parser.parse_args()
+    
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in RUNNERS]
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(unknown)}")
+    
+    baseline: Optional[dict[str, Any]] = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    
+    process, mock_url = start_mock(args)
+    client.API_ENDPOINT = mock_url + "/api/v2/report"
+    client.BULK_API_ENDPOINT = mock_url + "/api/v2/bulk-report"
+    
+    output: dict[str, Any] = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            key: value for key, value in vars(args).items()
+            if key not in ("modes", "output", "compare", "tolerance")
+        },
+        "modes": {},
+    }
+    try:
+        print(f"{'mode':<11} {'reports/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+              f"{'failed':>7} {'requests':>9} {'peak KiB':>9}")
+        for mode in modes:
+            result = measure(mode, args, mock_url)
+            output["modes"][mode] = result
+            latency = result["latency_ms"]
+            print(f"{mode:<11} {result['reports_per_second']:>10.1f} {latency['p50']:>8.2f} "
+                  f"{latency['p95']:>8.2f} {latency['p99']:>8.2f} {result['failed']:>7} "
+                  f"{result['http_requests']:>9} {result['peak_memory_kb']:>9.1f}")
+    finally:
+        process.terminate()
+        process.wait()
+    
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    
+    if baseline is not None and not compare(output, baseline, args.tolerance):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Cold-start benchmark for the CLI.
+
+Runs main.py in fresh interpreters for commands that never touch the
+network and prints the median wall time of each next to a bare
+interpreter. Exits with status 1 if one of those commands imports a
+module that only the network, daemon or GUI paths need, or if a median
+exceeds --max-ms.
+
+Usage:
+    python benchmarks/import_time.py [--runs N] [--max-ms MS]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+MAIN = ROOT / "main.py"
+
+DEFAULT_RUNS = 15
+
+# Modules that must stay out of offline commands
+HEAVY_MODULES = (
+    "requests",
+    "urllib3",
+    "dotenv",
+    "http.server",
+    "sqlite3",
+    "concurrent.futures",
+    "PyQt6",
+)
+
+SCENARIOS = {
+    "--help": ["--help"],
+    "--list-categories": ["--list-categories"],
+    "--dry-run": ["--ip", "8.8.8.8", "--categories", "ssh", "--comment", "Benchmark", "--dry-run"],
+}
+
+
+def run_once(args: list[str], import_time: bool = False) -> tuple[float, str]:
+    """
+    Run a Python command in a fresh interpreter.
+    
+    Args:
+        args: Interpreter arguments
+        import_time: Pass -X importtime and return its report
+        
+    Returns:
+        Tuple of (wall time in seconds, stderr)
+    """
+    command = [sys.executable]
+    if import_time:
+        command += ["-X", "importtime"]
+    start = time.perf_counter()
+    completed = subprocess.run(command + args, cwd=ROOT, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} exited with {completed.returncode}: {completed.stderr}")
+    return elapsed, completed.stderr
+
+
+def median_time(args: list[str], runs: int) -> float:
+    """Return the median wall time of ``runs`` fresh runs, in milliseconds."""
+    return statistics.median(run_once(args)[0] for _ in range(runs)) * 1000
+
+
+def imported_modules(args: list[str]) -> set[str]:
+    """Return the names of all modules a command imports."""
+    _, report = run_once(args, import_time=True)
+    modules = set()
+    for line in report.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            modules.add(line.rsplit("|", 1)[1].strip())
+    return modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure CLI cold-start latency")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS,
+                        help=f"Runs per command (default: {DEFAULT_RUNS})")
+    parser.add_argument("--max-ms", type=float,
+                        help="Fail if a command's median wall time exceeds this")
+    args = parser.parse_args()
+    
+    baseline = median_time(["-c", "pass"], args.runs)
+    print(f"{'python -c pass':<22}{baseline:8.1f} ms")
+    
+    failed = False
+    for name, scenario in SCENARIOS.items():
+        command = [str(MAIN)] + scenario
+        elapsed = median_time(command, args.runs)
+        print(f"{name:<22}{elapsed:8.1f} ms  (+{elapsed - baseline:.1f} ms over the interpreter)")
+        
+        modules = imported_modules(command)
+        heavy = [
+            heavy_module for heavy_module in HEAVY_MODULES
+            if any(module == heavy_module or module.startswith(heavy_module + ".") for module in modules)
+        ]
+        if heavy:
+            print(f"  FAIL: imports {', '.join(heavy)}")
+            failed = True
+        if args.max_ms is not None and elapsed > args.max_ms:
+            print(f"  FAIL: slower than {args.max_ms:g} ms")
+            failed = True
+    
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+"""
+Local stand-in for the AbuseIPDB report endpoints.
+
+Serves POST /api/v2/report, POST /api/v2/bulk-report, GET /api/v2/check
+and GET /api/v2/blacklist with responses shaped like the real API, plus
+GET /stats with request counters. Latency,
+5xx errors, 429 throttling, a request quota (counted per API key and
+endpoint, like the real one), rejected keys and rejected bulk rows can be injected, and every response carries X-RateLimit-* headers, so the client
+and its rate limiter can be exercised without spending real API quota.
+
+Usage:
+    python benchmarks/mock_server.py [--port N] [--latency MS] [--error-rate F] ...
+    
+The first line printed is "listening on http://HOST:PORT".
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+REPORT_PATH = "/api/v2/report"
+BULK_REPORT_PATH = "/api/v2/bulk-report"
+CHECK_PATH = "/api/v2/check"
+BLACKLIST_PATH = "/api/v2/blacklist"
+STATS_PATH = "/stats"
+UNLIMITED_QUOTA = 1000000
+
+
+@dataclass
+class MockConfig:
+    """Behaviour injected into every response."""
+    latency: float = 0.0            # Seconds added to each response
+    jitter: float = 0.0             # Extra random latency, up to this many seconds
+    error_rate: float = 0.0         # Fraction of requests answered with 503
+    throttle_rate: float = 0.0      # Fraction of requests answered with 429
+    quota: Optional[int] = None     # Requests allowed per window, then 429
+    bulk_quota: Optional[int] = None    # Uploads to /bulk-report per window (default: quota)
+    quota_window: int = 86400       # Seconds until the quota resets
+    retry_after: int = 1            # Retry-After sent with every 429
+    invalid_row_rate: float = 0.0   # Fraction of bulk rows reported as invalid
+    rejected_keys: tuple[str, ...] = ()    # API keys answered with 401
+
+
+class MockState:
+    """Quota bookkeeping and counters shared by all handler threads."""
+    
+    def __init__(self, config: MockConfig):
+        self.config = config
+        self.counts: Counter = Counter()
+        self._used: Counter = Counter()    # Requests per (API key, endpoint) in this window
+        self._window_start = time.time()
+        self._lock = threading.Lock()
+    
+    def admit(self, key: str = "", endpoint: str = "") -> tuple[Optional[int], dict[str, str]]:
+        """
+        Decide the fate of one request.
+        
+        Args:
+            key: API key the request was sent with
+            endpoint: Path of the request; each endpoint has its own quota
+        
+        Returns:
+            Tuple of (forced status code or None for success, rate-limit headers)
+        """
+        config = self.config
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= config.quota_window:
+                self._window_start = now
+                self._used.clear()
+            limit = config.quota
+            if endpoint == BULK_REPORT_PATH and config.bulk_quota is not None:
+                limit = config.bulk_quota
+            if limit is None:
+                limit = UNLIMITED_QUOTA
+            reset = int(self._window_start + config.quota_window)
+            
+            status = None
+            used = (key, endpoint)
+            if self._used[used] >= limit:
+                status = 429
+            else:
+                self._used[used] += 1
+                roll = random.random()
+                if roll < config.throttle_rate:
+                    status = 429
+                elif roll < config.throttle_rate + config.error_rate:
+                    status = 503
+            
+            headers = {
+                "X-RateLimit-Limit": str(limit),
+                "X-RateLimit-Remaining": str(max(0, limit - self._used[used])),
+                "X-RateLimit-Reset": str(reset),
+            }
+            if status == 429:
+                headers["Retry-After"] = str(config.retry_after)
+            self.counts["requests"] += 1
+            self.counts[str(status or 200)] += 1
+            return status, headers
+    
+    def count(self, name: str, amount: int = 1) -> int:
+        """Add to a named counter, returning its previous value."""
+        with self._lock:
+            previous = self.counts[name]
+            self.counts[name] += amount
+            return previous
+    
+    def stats(self) -> dict[str, Any]:
+        """Return the configuration and counters."""
+        with self._lock:
+            return {"config": asdict(self.config), "counts": dict(self.counts)}
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    """Answers report and bulk-report requests like AbuseIPDB would."""
+    
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path not in (REPORT_PATH, BULK_REPORT_PATH):
+            self._send_json(404, {"errors": [{"detail": "Not found", "status": 404}]})
+            return
+        headers = self._admit()
+        if headers is None:
+            return
+        
+        if self.path == REPORT_PATH:
+            ip = parse_qs(body.decode("utf-8", "replace")).get("ip", [""])[0]
+            self._send_json(200, {"data": {"ipAddress": ip, "abuseConfidenceScore": 100}}, headers)
+        else:
+            state: MockState = self.server.state
+            rows = _csv_rows(body, self.headers.get("Content-Type", ""))
+            invalid = [
+                {"error": "Duplicate IP", "input": row.split(",", 1)[0], "rowNumber": index + 2}
+                for index, row in enumerate(rows)
+                if random.random() < state.config.invalid_row_rate
+            ]
+            state.count("bulk_rows", len(rows))
+            data = {"savedReports": len(rows) - len(invalid), "invalidReports": invalid}
+            self._send_json(200, {"data": data}, headers)
+    
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == STATS_PATH:
+            self._send_json(200, self.server.state.stats())
+            return
+        if url.path not in (CHECK_PATH, BLACKLIST_PATH):
+            self._send_json(404, {"errors": [{"detail": "Not found", "status": 404}]})
+            return
+        headers = self._admit()
+        if headers is None:
+            return
+        
+        query = parse_qs(url.query)
+        if url.path == BLACKLIST_PATH:
+            # Each download shifts the list by half, like a changing top list
+            limit = int(query.get("limit", ["10000"])[0])
+            offset = self.server.state.count("blacklist_downloads") * (limit // 2)
+            data = [
+                {"ipAddress": f"11.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}", "abuseConfidenceScore": 100}
+                for n in range(offset, offset + limit)
+            ]
+            self._send_json(200, {"meta": {"generatedAt": time.strftime("%Y-%m-%dT%H:%M:%S+00:00")},
+                                  "data": data}, headers)
+            return
+        
+        ip = query.get("ipAddress", [""])[0]
+        # Stable pseudo-reputation, so repeated lookups agree
+        score = sum(ip.encode("utf-8")) % 101
+        data = {
+            "ipAddress": ip,
+            "isPublic": True,
+            "isWhitelisted": False,
+            "abuseConfidenceScore": score,
+            "countryCode": "ZZ",
+            "isp": "Mock ISP",
+            "totalReports": score * 3,
+            "numDistinctUsers": score,
+            "lastReportedAt": None,
+        }
+        self._send_json(200, {"data": data}, headers)
+    
+    def _admit(self) -> Optional[dict[str, str]]:
+        """
+        Authenticate, delay and admit an API request, answering it with an
+        error response when it is rejected.
+        
+        Returns:
+            Rate-limit headers for the success response, or None if an
+            error response was sent
+        """
+        state: MockState = self.server.state
+        config = state.config
+        key = self.headers.get("Key")
+        if not key or key in config.rejected_keys:
+            state.count("401")
+            self._send_json(401, {"errors": [{"detail": "Authentication failed", "status": 401}]})
+            return None
+        
+        if config.latency or config.jitter:
+            time.sleep(config.latency + random.uniform(0, config.jitter))
+        
+        status, headers = state.admit(key, urlsplit(self.path).path)
+        if status == 429:
+            self._send_json(429, {"errors": [{"detail": "Daily rate limit exceeded", "status": 429}]}, headers)
+            return None
+        if status == 503:
+            self._send_json(503, {"errors": [{"detail": "Service unavailable", "status": 503}]}, headers)
+            return None
+        return headers
+    
+    def log_message(self, format: str, *args: Any) -> None:
+        """Keep benchmark output clean."""
+    
+    def _send_json(self, code: int, body: Any, headers: Optional[dict[str, str]] = None) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class MockAbuseIPDB(ThreadingHTTPServer):
+    """Threaded mock server holding a MockState."""
+    
+    daemon_threads = True
+    request_queue_size = 128
+    
+    def __init__(self, address: tuple[str, int], config: MockConfig):
+        super().__init__(address, MockRequestHandler)
+        self.state = MockState(config)
+    
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def _csv_rows(body: bytes, content_type: str) -> list[str]:
+    """Return the data rows of the uploaded CSV in a multipart body."""
+    _, _, boundary = content_type.partition("boundary=")
+    for part in body.split(b"--" + boundary.strip('"').encode("ascii")):
+        headers, _, payload = part.partition(b"\r\n\r\n")
+        if b'name="csv"' in headers:
+            lines = payload.rstrip(b"\r\n").decode("utf-8", "replace").split("\n")
+            return [line for line in lines[1:] if line]
+    return []
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mock AbuseIPDB API for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    parser.add_argument("--latency", type=float, default=0.0, help="Milliseconds per response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random milliseconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 responses")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of 429 responses")
+    parser.add_argument("--quota", type=int, help="Requests allowed per window before 429")
+    parser.add_argument("--bulk-quota", type=int, help="/bulk-report uploads allowed per window (default: --quota)")
+    parser.add_argument("--quota-window", type=int, default=86400, help="Quota window in seconds")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on 429")
+    parser.add_argument("--invalid-row-rate", type=float, default=0.0,
+                        help="Fraction of bulk rows reported as invalid")
+    parser.add_argument("--reject-key", action="append", default=[], metavar="KEY",
+                        help="Answer requests made with KEY with 401 (repeatable)")
+    args = parser.parse_args()
+    
+    config = MockConfig(
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        quota=args.quota,
+        bulk_quota=args.bulk_quota,
+        quota_window=args.quota_window,
+        retry_after=args.retry_after,
+        invalid_row_rate=args.invalid_row_rate,
+        rejected_keys=tuple(args.reject_key)
+    )
+    server = MockAbuseIPDB((args.host, args.port), config)
+    print(f"listening on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
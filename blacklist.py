@@ -0,0 +1,244 @@
+"""Local snapshot of the AbuseIPDB blacklist for offline membership checks."""
+
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional, Union
+
+from validators import IPV4_MAPPED_PREFIX, pack_ip
+
+if TYPE_CHECKING:
+    from client import AbuseIPDBClient
+
+
+DEFAULT_BLACKLIST_FILE = ".abuse_reporter_blacklist.bin"
+DEFAULT_CONFIDENCE_MINIMUM = 100
+DEFAULT_LIMIT = 10000                   # Largest list the free plan may download
+DEFAULT_REFRESH_INTERVAL = 6 * 60 * 60  # The free plan allows 5 downloads a day
+DEFAULT_RETENTION = 7 * 24 * 60 * 60    # Entries missing from this long are dropped
+
+# File layout: header, then ``count`` 16-byte big-endian keys in ascending
+# order, then ``count`` uint32 last-seen times (little-endian)
+MAGIC = b"ABLK0001"
+HEADER = struct.Struct("<8sdQ")   # magic, downloaded-at time, count
+KEY_SIZE = 16
+
+
+class _PackedKeys:
+    """Read-only sequence view over sorted 16-byte keys, for bisect."""
+    
+    __slots__ = ("_data", "_count")
+    
+    def __init__(self, data: bytes):
+        self._data = data
+        self._count = len(data) // KEY_SIZE
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, index: int) -> int:
+        start = index * KEY_SIZE
+        return int.from_bytes(self._data[start:start + KEY_SIZE], "big")
+
+
+class BlacklistSnapshot:
+    """
+    Sorted, packed set of blacklisted addresses.
+    
+    Addresses are stored as 16-byte packed keys (see validators.pack_ip)
+    in one contiguous bytes object, so a snapshot of 500,000 addresses
+    takes about 10 MB and a lookup is one binary search. IPv4 keys, the
+    bulk of the list, are mirrored in a uint32 array that bisect searches
+    without calling back into Python. Each key carries
+    the time it was last seen in a download: merge() adds and refreshes
+    addresses and drops those not listed for ``retention`` seconds, so
+    an IP that briefly falls out of the downloaded top list is still
+    known.
+    """
+    
+    def __init__(self, keys: bytes = b"", seen: Optional[array] = None, downloaded: float = 0.0):
+        """
+        Initialize a snapshot.
+        
+        Args:
+            keys: Concatenated 16-byte keys in ascending order
+            seen: Last-seen time (epoch seconds) of each key
+            downloaded: Time of the last download merged in
+        """
+        self.downloaded = downloaded
+        self._seen = seen if seen is not None else array("I")
+        self._set_keys(keys)
+    
+    def __len__(self) -> int:
+        return len(self._index)
+    
+    def __contains__(self, value: int) -> bool:
+        """Return True if a packed address is blacklisted."""
+        if value >> 32 == IPV4_MAPPED_PREFIX >> 32:
+            keys, value = self._ipv4, value & 0xFFFFFFFF
+        else:
+            keys = self._index
+        i = bisect_left(keys, value)
+        return i < len(keys) and keys[i] == value
+    
+    def contains_ip(self, ip: str) -> bool:
+        """Return True if an IP address string is blacklisted."""
+        value = pack_ip(ip)
+        return value is not None and value in self
+    
+    @property
+    def age(self) -> float:
+        """Seconds since the last download (infinite if never downloaded)."""
+        return time.time() - self.downloaded if self.downloaded else float("inf")
+    
+    def merge(
+        self,
+        ips: Iterable[str],
+        retention: float = DEFAULT_RETENTION,
+        now: Optional[float] = None
+    ) -> tuple[int, int]:
+        """
+        Merge a downloaded blacklist into the snapshot.
+        
+        Args:
+            ips: Addresses listed by the download
+            retention: Seconds an address is kept after it was last listed
+            now: Download time (defaults to the current time)
+            
+        Returns:
+            Tuple of (addresses added, addresses expired)
+        """
+        now = time.time() if now is None else now
+        stamp = int(now)
+        cutoff = now - retention
+        
+        entries = {
+            self._keys[i * KEY_SIZE:(i + 1) * KEY_SIZE]: seen
+            for i, seen in enumerate(self._seen)
+            if seen > cutoff
+        }
+        expired = len(self._seen) - len(entries)
+        
+        added = 0
+        for ip in ips:
+            value = pack_ip(ip)
+            if value is None:
+                continue
+            key = value.to_bytes(KEY_SIZE, "big")
+            if key not in entries:
+                added += 1
+            entries[key] = stamp
+        
+        ordered = sorted(entries)
+        self._seen = array("I", (entries[key] for key in ordered))
+        self._set_keys(b"".join(ordered))
+        self.downloaded = now
+        return added, expired
+    
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "BlacklistSnapshot":
+        """
+        Read a snapshot file; a missing file gives an empty snapshot.
+        
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a valid snapshot
+        """
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return cls()
+        
+        if len(data) < HEADER.size:
+            raise ValueError(f"{path}: not a blacklist snapshot")
+        magic, downloaded, count = HEADER.unpack_from(data)
+        if magic != MAGIC or len(data) != HEADER.size + count * (KEY_SIZE + 4):
+            raise ValueError(f"{path}: not a blacklist snapshot")
+        
+        keys_end = HEADER.size + count * KEY_SIZE
+        seen = array("I", data[keys_end:])
+        if sys.byteorder == "big":
+            seen.byteswap()
+        return cls(data[HEADER.size:keys_end], seen, downloaded)
+    
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the snapshot file atomically."""
+        seen = array("I", self._seen)
+        if sys.byteorder == "big":
+            seen.byteswap()
+        
+        path = Path(path)
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.downloaded, len(self)))
+            f.write(self._keys)
+            f.write(seen.tobytes())
+        os.replace(temp_path, path)
+    
+    def _set_keys(self, keys: bytes) -> None:
+        """Install new keys and rebuild the IPv4 mirror."""
+        self._keys = keys
+        self._index = _PackedKeys(keys)
+        
+        # IPv4-mapped keys form one contiguous run in the sorted keys
+        first = bisect_left(self._index, IPV4_MAPPED_PREFIX) * KEY_SIZE
+        last = bisect_left(self._index, IPV4_MAPPED_PREFIX + (1 << 32)) * KEY_SIZE
+        self._ipv4 = array("I", b"".join(
+            keys[start + 12:start + KEY_SIZE] for start in range(first, last, KEY_SIZE)
+        ))
+        if sys.byteorder == "little":
+            self._ipv4.byteswap()
+
+
+def refresh_blacklist(
+    client: "AbuseIPDBClient",
+    path: Union[str, Path] = DEFAULT_BLACKLIST_FILE,
+    max_age: float = DEFAULT_REFRESH_INTERVAL,
+    confidence_minimum: int = DEFAULT_CONFIDENCE_MINIMUM,
+    limit: int = DEFAULT_LIMIT,
+    retention: float = DEFAULT_RETENTION
+) -> tuple[BlacklistSnapshot, str]:
+    """
+    Load the snapshot at ``path`` and download the blacklist into it if
+    it is older than ``max_age`` seconds.
+    
+    A failed download keeps the existing snapshot.
+    
+    Args:
+        client: Client used for the download
+        path: Snapshot file
+        max_age: Seconds a snapshot is used before it is refreshed (0
+            always downloads)
+        confidence_minimum: Lowest abuse confidence score listed (25-100)
+        limit: Maximum number of addresses downloaded
+        retention: Seconds an address is kept after it was last listed
+        
+    Returns:
+        Tuple of (snapshot, one-line description of what happened)
+        
+    Raises:
+        OSError: If the snapshot cannot be read or written
+        ValueError: If the snapshot file is corrupt
+    """
+    snapshot = BlacklistSnapshot.load(path)
+    if snapshot.age < max_age:
+        return snapshot, f"Blacklist snapshot is current ({len(snapshot)} addresses)"
+    
+    result = client.fetch_blacklist(confidence_minimum, limit)
+    if not result.success:
+        return snapshot, (f"Blacklist download failed ({result.message}: {result.error}); "
+                          f"using {len(snapshot)} cached addresses")
+    
+    entries = (result.response_data or {}).get("data") or []
+    added, expired = snapshot.merge(
+        (entry.get("ipAddress", "") for entry in entries if isinstance(entry, dict)),
+        retention
+    )
+    snapshot.save(path)
+    return snapshot, (f"Blacklist updated: {len(entries)} listed, {added} new, "
+                      f"{expired} expired, {len(snapshot)} addresses in total")
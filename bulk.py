@@ -0,0 +1,190 @@
+"""Concurrent bulk report submission."""
+
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional
+
+from client import AbuseIPDBClient, BulkReport, ReportResult, RATE_LIMITED_MESSAGE
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+
+DEFAULT_CONCURRENCY = 4
+MAX_CONCURRENCY = 16
+
+# Batches at least this large go through the /bulk-report CSV endpoint,
+# as long as no report carries a confidence below 100 (the CSV has no
+# confidence column)
+BULK_ENDPOINT_THRESHOLD = 50
+
+CANCELLED_MESSAGE = "Cancelled"
+
+
+def iter_bulk(
+    client: AbuseIPDBClient,
+    reports: Iterable[BulkReport],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    cancel: Optional[threading.Event] = None
+) -> Iterator[tuple[int, BulkReport, ReportResult]]:
+    """
+    Submit reports on a bounded worker pool and yield results in input order.
+    
+    The input is consumed lazily and only a small window of reports
+    (twice the worker count) is queued at once, so ``reports`` may be an
+    arbitrarily long generator.
+    
+    Args:
+        client: Shared client whose connection pool is used by all workers
+        reports: Reports to submit
+        concurrency: Number of worker threads
+        cancel: Optional event; once set, no further reports are started
+            and only those already in flight are yielded
+            
+    Yields:
+        Tuples of (input_index, report, result)
+    """
+    # Imported on first use; most CLI invocations never start a pool
+    from concurrent.futures import ThreadPoolExecutor
+    
+    concurrency = max(1, concurrency)
+    # Keep workers busy while the caller waits on the oldest report
+    window = concurrency * 2
+    pending: deque[tuple[int, BulkReport, Future]] = deque()
+    
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for index, report in enumerate(_until_cancelled(reports, cancel)):
+            future = executor.submit(
+                client.submit_report,
+                report.ip,
+                report.category_ids,
+                report.comment,
+                report.confidence
+            )
+            pending.append((index, report, future))
+            
+            if len(pending) >= window:
+                yield _pop_finished(pending)
+        
+        while pending:
+            yield _pop_finished(pending)
+
+
+def _until_cancelled(
+    reports: Iterable[BulkReport],
+    cancel: Optional[threading.Event]
+) -> Iterator[BulkReport]:
+    """Yield reports until the cancel event is set."""
+    for report in reports:
+        if cancel is not None and cancel.is_set():
+            return
+        yield report
+
+
+def _iter_bulk_endpoint(
+    client: AbuseIPDBClient,
+    reports: list[BulkReport],
+    concurrency: int,
+    cancel: Optional[threading.Event]
+) -> Iterator[tuple[int, BulkReport, ReportResult]]:
+    """
+    Upload reports through /bulk-report, yielding (index, report, result).
+    
+    /bulk-report has a much smaller daily quota than /report. Reports
+    whose upload was throttled (429) or held back by the rate limiter are
+    resent one request each through iter_bulk() instead of being lost.
+    """
+    throttled: list[tuple[int, BulkReport]] = []
+    uploads = client.iter_bulk_report(_until_cancelled(reports, cancel))
+    
+    for (index, report), result in zip(enumerate(reports), uploads):
+        if not result.success and result.message == RATE_LIMITED_MESSAGE:
+            throttled.append((index, report))
+        else:
+            yield index, report, result
+    
+    if throttled:
+        retried = iter_bulk(client, [report for _, report in throttled], concurrency, cancel)
+        for position, report, result in retried:
+            yield throttled[position][0], report, result
+
+
+def _pop_finished(
+    pending: "deque[tuple[int, BulkReport, Future]]"
+) -> tuple[int, BulkReport, ReportResult]:
+    """Wait for the oldest in-flight report and return its result."""
+    index, report, future = pending.popleft()
+    return index, report, future.result()
+
+
+def can_use_bulk_endpoint(reports: list[BulkReport]) -> bool:
+    """
+    Return True if ``reports`` would be uploaded through /bulk-report by
+    default: the batch is large enough and every report has confidence
+    100, which is all the endpoint can record.
+    """
+    return (
+        len(reports) >= BULK_ENDPOINT_THRESHOLD
+        and all(report.confidence == 100 for report in reports)
+    )
+
+
+def submit_bulk(
+    client: AbuseIPDBClient,
+    reports: list[BulkReport],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    on_result: Optional[Callable[[int, BulkReport, ReportResult], None]] = None,
+    use_bulk_endpoint: Optional[bool] = None,
+    cancel: Optional[threading.Event] = None
+) -> list[ReportResult]:
+    """
+    Submit a batch of reports concurrently.
+    
+    Args:
+        client: Shared client whose connection pool is used by all workers
+        reports: Reports to submit
+        concurrency: Number of worker threads
+        on_result: Optional callback invoked on the calling thread with
+            (input_index, report, result) for each finished report (not
+            necessarily in input order)
+        use_bulk_endpoint: Upload the batch as CSV via /bulk-report instead
+            of one request per report. /bulk-report ignores confidence,
+            so the default is True only for batches of
+            BULK_ENDPOINT_THRESHOLD reports or more in which every report
+            has confidence 100 (see can_use_bulk_endpoint). Reports whose
+            upload is rate-limited fall back to one request each.
+        cancel: Optional event that stops the run early. Reports already
+            sent still get their real result; the rest get a failed result
+            with CANCELLED_MESSAGE (a transient failure, so a journaled
+            report stays pending).
+            
+    Returns:
+        List of ReportResult objects in the same order as ``reports``
+    """
+    if use_bulk_endpoint is None:
+        use_bulk_endpoint = can_use_bulk_endpoint(reports)
+    
+    if use_bulk_endpoint:
+        completed = _iter_bulk_endpoint(client, reports, concurrency, cancel)
+    else:
+        completed = iter_bulk(client, reports, concurrency, cancel)
+    
+    results: list[Optional[ReportResult]] = [None] * len(reports)
+    
+    for index, report, result in completed:
+        results[index] = result
+        if on_result:
+            on_result(index, report, result)
+    
+    for index, report in enumerate(reports):
+        if results[index] is None:
+            results[index] = ReportResult(
+                success=False,
+                message=CANCELLED_MESSAGE,
+                error="Cancelled before the report was sent",
+                attempts=0
+            )
+            if on_result:
+                on_result(index, report, results[index])
+    
+    return results
@@ -55,7 +55,8 @@ ALL_NAMES: Dict[str, int] = {**NAME_TO_ID, **ALIASES}
 def get_category_id(category_name: str) -> Optional[int]:
     """
     Convert a human-readable category name to its numeric ID.
-    Supports both hyphenated and non-hyphenated formats.
+    Supports both hyphenated and non-hyphenated formats, as well as
+    numeric IDs passed as strings (e.g. "18").
     
     Args:
         category_name: The human-readable category name (case-insensitive)
@@ -68,6 +69,10 @@ def get_category_id(category_name: str) -> Optional[int]:
     if normalized in ALL_NAMES:
         return ALL_NAMES[normalized]
     
+    # Accept numeric IDs
+    if normalized.isdigit() and int(normalized) in CATEGORIES:
+        return int(normalized)
+    
     # Try removing hyphens
     normalized_no_hyphens = normalized.replace("-", "")
     if normalized_no_hyphens in ALL_NAMES:
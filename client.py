@@ -1,14 +1,56 @@
 """AbuseIPDB API client."""
 
+import csv
+import io
 import json
-import requests
-from typing import Optional, Dict, Any
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Optional, Dict, Any, Iterable, Iterator, Union
 from dataclasses import dataclass
 
+from metrics import (
+    MetricsSink, NULL_METRICS, status_class,
+    REQUESTS_TOTAL, REQUEST_PHASE_SECONDS, REQUESTS_IN_FLIGHT, REQUESTS_WAITING,
+    RETRIES_TOTAL, CONNECTIONS_OPENED_TOTAL, QUOTA_REMAINING,
+    PHASE_WAIT, PHASE_CONNECT, PHASE_TLS, PHASE_SERVER, PHASE_READ, PHASE_BACKOFF, PHASE_TOTAL,
+    STATUS_TIMEOUT, STATUS_CONNECTION_ERROR, STATUS_ERROR, STATUS_NOT_SENT
+)
+from keypool import KeyPool
+from ratelimit import RateLimiter
+
+if TYPE_CHECKING:
+    import requests
+    from reputation import ReputationCache
+
 
 API_ENDPOINT = "https://api.abuseipdb.com/api/v2/report"
+BULK_API_ENDPOINT = "https://api.abuseipdb.com/api/v2/bulk-report"
+CHECK_API_ENDPOINT = "https://api.abuseipdb.com/api/v2/check"
+BLACKLIST_API_ENDPOINT = "https://api.abuseipdb.com/api/v2/blacklist"
 API_TIMEOUT = 15
 
+# Message of a result that was answered with 429 or held back by the rate limiter
+RATE_LIMITED_MESSAGE = "Rate limit exceeded"
+
+# /check counts reports from this many days back (the API allows 1-365)
+DEFAULT_MAX_AGE_DAYS = 30
+
+# /bulk-report accepts at most 10,000 rows and 2 MB per uploaded CSV
+BULK_MAX_ROWS = 10000
+BULK_MAX_BYTES = 2 * 1024 * 1024
+BULK_CSV_HEADER = ["IP", "Categories", "ReportDate", "Comment"]
+
+# Connection pool defaults (one pool per host, kept alive between reports)
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+
+# Connect/TLS time of connections opened by the request running on each
+# thread, filled in by the pool classes from _timed_pool_classes()
+_connection_timings = threading.local()
+_TIMED_POOL_CLASSES: Optional[Dict[str, type]] = None
+
 
 @dataclass
 class ReportResult:
@@ -18,23 +60,158 @@ class ReportResult:
     status_code: Optional[int] = None
     response_data: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
+    attempts: int = 1
+    latency: float = 0.0       # Seconds spent, including retries
+    timings: Optional[Dict[str, float]] = None    # Seconds per phase, summed over attempts
+
+
+@dataclass
+class CheckResult:
+    """Represents the result of an IP reputation lookup."""
+    success: bool
+    message: str
+    ip: str
+    data: Optional[Dict[str, Any]] = None    # The response's "data" object
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    attempts: int = 0          # 0 when answered from the cache
+    latency: float = 0.0
+    cached: bool = False
+    
+    @property
+    def abuse_confidence_score(self) -> Optional[int]:
+        """AbuseIPDB's 0-100 confidence that the IP is abusive."""
+        return (self.data or {}).get("abuseConfidenceScore")
+    
+    @property
+    def total_reports(self) -> Optional[int]:
+        """Number of reports within the lookup's max age."""
+        return (self.data or {}).get("totalReports")
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retry settings for transient failures.
+    
+    Timeouts, connection errors, 429 and 5xx responses are retried with
+    exponential backoff plus random jitter. Other outcomes (400, 401, ...)
+    are returned immediately.
+    """
+    max_attempts: int = 3
+    backoff: float = 0.5       # Delay before the first retry, in seconds
+    max_backoff: float = 8.0   # Upper bound for a single delay
+    jitter: float = 0.5        # Extra random delay, as a fraction of the delay
+    deadline: float = 60.0     # Total time budget across all attempts
+    
+    def delay(self, attempt: int) -> float:
+        """
+        Return the delay before the retry that follows ``attempt``.
+        
+        Args:
+            attempt: The 1-based attempt that just failed
+            
+        Returns:
+            Delay in seconds
+        """
+        delay = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+        return delay + random.uniform(0, delay * self.jitter)
+
+
+@dataclass
+class BulkReport:
+    """A single report queued for bulk submission."""
+    ip: str
+    category_ids: list[int]
+    comment: str
+    confidence: int = 100
 
 
 class AbuseIPDBClient:
     """Client for interacting with AbuseIPDB API v2."""
     
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: Union[str, KeyPool],
+        pool_connections: int = POOL_CONNECTIONS,
+        pool_maxsize: int = POOL_MAXSIZE,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        check_cache: Optional["ReputationCache"] = None,
+        metrics: Optional[MetricsSink] = None
+    ):
         """
         Initialize the AbuseIPDB client.
         
+        The client keeps a persistent HTTP session so that consecutive
+        reports reuse the same keep-alive TCP/TLS connection. Create one
+        client per bulk run and close it (or use it as a context manager)
+        when done.
+        
+        Given a KeyPool instead of a single key, every request goes out
+        under the pooled key with the most quota left for its endpoint,
+        paced by that key's own rate limiters (``rate_limiter`` is then
+        unused); a 401 or 429 is retried at once on another key while one
+        is available.
+        
         Args:
-            api_key: The AbuseIPDB API key
+            api_key: The AbuseIPDB API key, or a KeyPool of several
+            pool_connections: Number of per-host connection pools to cache
+            pool_maxsize: Maximum connections kept open per host
+            rate_limiter: Limiter shared by all requests from this client
+                (a default RateLimiter is created if omitted)
+            retry_policy: Retry settings for transient failures
+                (defaults to RetryPolicy())
+            check_cache: Cache answering repeated check() lookups
+                without an API call
+            metrics: Sink receiving request counters, phase timings and
+                in-flight gauges (discarded if omitted)
         """
         self.api_key = api_key
-        self.headers = {
-            "Key": api_key,
-            "Accept": "application/json"
-        }
+        self.key_pool = api_key if isinstance(api_key, KeyPool) else None
+        self.headers = {"Accept": "application/json"}
+        if self.key_pool is None:
+            self.headers["Key"] = api_key
+        
+        # Imported here so commands that never touch the network
+        # (--list-categories, --dry-run, ...) don't pay for requests
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize
+        )
+        if metrics is not None:
+            # Time DNS/TCP connect and TLS handshakes of new connections
+            adapter.poolmanager.pool_classes_by_scheme = _timed_pool_classes()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.metrics = metrics or NULL_METRICS
+        
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        
+        # /bulk-report, /check and /blacklist have their own daily quotas,
+        # separate from /report
+        self.bulk_rate_limiter = RateLimiter()
+        self.check_rate_limiter = RateLimiter()
+        self.blacklist_rate_limiter = RateLimiter()
+        self.check_cache = check_cache
+        self._checks_in_flight: Dict[tuple[str, int], threading.Event] = {}
+        self._checks_lock = threading.Lock()
+    
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections."""
+        self.session.close()
+    
+    def __enter__(self) -> "AbuseIPDBClient":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
     
     def submit_report(
         self,
@@ -55,49 +232,348 @@ class AbuseIPDBClient:
         Returns:
             ReportResult object containing the outcome
         """
+        data = {
+            "ip": ip,
+            "categories": ",".join(str(cid) for cid in category_ids),
+            "comment": comment,
+            "confidence": confidence
+        }
+        
+        return self._request("post", API_ENDPOINT, data=data)
+    
+    def check(self, ip: str, max_age_days: int = DEFAULT_MAX_AGE_DAYS) -> CheckResult:
+        """
+        Look up an IP's reputation through the /check endpoint.
+        
+        Successful lookups are stored in ``check_cache``, so repeating one
+        within the cache TTL costs no API call. Concurrent lookups of the
+        same IP (e.g. from bulk worker threads) wait for the first one
+        instead of each sending a request.
+        
+        Args:
+            ip: The IP address to look up
+            max_age_days: Only count reports from this many days back
+            
+        Returns:
+            CheckResult object containing the outcome
+        """
+        cache = self.check_cache
+        if cache is None:
+            return self._check_once(ip, max_age_days)
+        
+        key = (ip, max_age_days)
+        while True:
+            with self._checks_lock:
+                # Only consult the cache once no request for this IP is
+                # pending, so waiting threads are counted as hits only
+                in_flight = self._checks_in_flight.get(key)
+                if in_flight is None:
+                    data = cache.get(ip, max_age_days)
+                    if data is not None:
+                        return CheckResult(
+                            success=True,
+                            message="Lookup answered from cache",
+                            ip=ip,
+                            data=data,
+                            cached=True
+                        )
+                    self._checks_in_flight[key] = threading.Event()
+                    break
+            in_flight.wait()
+        
         try:
-            data = {
-                "ip": ip,
-                "categories": ",".join(str(cid) for cid in category_ids),
-                "comment": comment,
-                "confidence": confidence
-            }
+            result = self._check_once(ip, max_age_days)
+            if result.success:
+                cache.put(ip, max_age_days, result.data)
+            return result
+        finally:
+            with self._checks_lock:
+                self._checks_in_flight.pop(key).set()
+    
+    def fetch_blacklist(self, confidence_minimum: int = 100, limit: int = 10000) -> ReportResult:
+        """
+        Download the /blacklist of most-reported addresses.
+        
+        Args:
+            confidence_minimum: Lowest abuse confidence score listed (25-100)
+            limit: Maximum number of addresses returned
             
-            response = requests.post(
-                API_ENDPOINT,
-                headers=self.headers,
-                data=data,
-                timeout=API_TIMEOUT
-            )
+        Returns:
+            ReportResult whose ``response_data["data"]`` lists one
+            {"ipAddress", "abuseConfidenceScore", ...} object per address
+        """
+        result = self._request(
+            "get",
+            BLACKLIST_API_ENDPOINT,
+            rate_limiter=self.blacklist_rate_limiter,
+            params={"confidenceMinimum": confidence_minimum, "limit": limit}
+        )
+        if result.success:
+            result.message = "Blacklist downloaded"
+        return result
+    
+    def _check_once(self, ip: str, max_age_days: int) -> CheckResult:
+        """Send one /check lookup, bypassing the cache."""
+        result = self._request(
+            "get",
+            CHECK_API_ENDPOINT,
+            rate_limiter=self.check_rate_limiter,
+            params={"ipAddress": ip, "maxAgeInDays": max_age_days}
+        )
+        return CheckResult(
+            success=result.success,
+            message="Lookup succeeded" if result.success else result.message,
+            ip=ip,
+            data=(result.response_data or {}).get("data") if result.success else None,
+            status_code=result.status_code,
+            error=result.error,
+            attempts=result.attempts,
+            latency=result.latency
+        )
+    
+    def submit_bulk_report(self, reports: Iterable[BulkReport]) -> list[ReportResult]:
+        """
+        Submit many reports through the /bulk-report CSV endpoint.
+        
+        See iter_bulk_report() for details.
+        
+        Args:
+            reports: Reports to submit
             
-            return self._handle_response(response)
+        Returns:
+            List of ReportResult objects in the same order as ``reports``
+        """
+        return list(self.iter_bulk_report(reports))
+    
+    def iter_bulk_report(self, reports: Iterable[BulkReport]) -> Iterator[ReportResult]:
+        """
+        Submit reports through /bulk-report, one CSV upload per chunk.
+        
+        The input is consumed lazily and split into CSV uploads of at most
+        BULK_MAX_ROWS rows and BULK_MAX_BYTES bytes. The endpoint does not
+        accept a confidence score, so ``BulkReport.confidence`` is ignored.
+        
+        Args:
+            reports: Reports to submit
             
-        except requests.exceptions.Timeout:
-            return ReportResult(
-                success=False,
-                message="Request timed out",
-                error="The API request exceeded 15 seconds"
-            )
-        except requests.exceptions.ConnectionError as e:
-            return ReportResult(
-                success=False,
-                message="Connection error",
-                error=str(e)
+        Yields:
+            One ReportResult per input report, in input order
+        """
+        chunk: list[BulkReport] = []
+        rows: list[str] = []
+        size = 0
+        
+        for report in reports:
+            row = _bulk_csv_row(report)
+            if chunk and (len(chunk) >= BULK_MAX_ROWS or size + len(row) > BULK_MAX_BYTES):
+                yield from self._post_bulk_chunk(chunk, rows)
+                chunk, rows, size = [], [], 0
+            chunk.append(report)
+            rows.append(row)
+            size += len(row)
+        
+        if chunk:
+            yield from self._post_bulk_chunk(chunk, rows)
+    
+    def _post_bulk_chunk(self, chunk: list[BulkReport], rows: list[str]) -> list[ReportResult]:
+        """
+        Upload one CSV chunk and expand the response into per-row results.
+        
+        Args:
+            chunk: Reports contained in this upload
+            rows: Pre-rendered CSV rows matching ``chunk``
+            
+        Returns:
+            List of ReportResult objects, one per report in ``chunk``
+        """
+        header = _csv_line(BULK_CSV_HEADER)
+        body = (header + "".join(rows)).encode("utf-8")
+        
+        result = self._request(
+            "post",
+            BULK_API_ENDPOINT,
+            rate_limiter=self.bulk_rate_limiter,
+            files={"csv": ("reports.csv", body, "text/csv")}
+        )
+        
+        if not result.success:
+            return [result] * len(chunk)
+        
+        return _split_bulk_result(chunk, result)
+    
+    def _request(
+        self,
+        method: str,
+        url: str,
+        rate_limiter: Optional[RateLimiter] = None,
+        **kwargs: Any
+    ) -> ReportResult:
+        """
+        Call the API, retrying transient failures per the retry policy.
+        
+        Args:
+            method: HTTP method ("get" or "post")
+            url: Endpoint URL
+            rate_limiter: Limiter for this endpoint (defaults to the
+                client's report limiter)
+            **kwargs: Extra arguments for requests.Session.request
+            
+        Returns:
+            ReportResult object with ``attempts``, ``latency`` and
+            ``timings`` set
+        """
+        policy = self.retry_policy
+        labels = (("endpoint", url.rsplit("/", 1)[-1]),)
+        timings = dict.fromkeys((PHASE_WAIT, PHASE_CONNECT, PHASE_TLS, PHASE_SERVER, PHASE_READ, PHASE_BACKOFF), 0.0)
+        started = time.monotonic()
+        deadline = started + policy.deadline
+        attempt = 0
+        
+        while True:
+            attempt += 1
+            result, retryable = self._request_once(
+                method, url, rate_limiter or self.rate_limiter, labels, timings, **kwargs
             )
-        except requests.exceptions.RequestException as e:
-            return ReportResult(
+            result.attempts = attempt
+            result.latency = time.monotonic() - started
+            result.timings = timings
+            
+            if attempt >= policy.max_attempts:
+                return result
+            if (self.key_pool is not None and result.status_code in (401, 429)
+                    and self.key_pool.active_count()):
+                # The failed key is benched now; another one can go at once
+                self.metrics.increment(RETRIES_TOTAL, labels)
+                continue
+            if not retryable:
+                return result
+            
+            delay = policy.delay(attempt)
+            if time.monotonic() + delay > deadline:
+                return result
+            self.metrics.increment(RETRIES_TOTAL, labels)
+            self.metrics.observe(REQUEST_PHASE_SECONDS, delay, labels + (("phase", PHASE_BACKOFF),))
+            timings[PHASE_BACKOFF] += delay
+            time.sleep(delay)
+    
+    def _request_once(
+        self,
+        method: str,
+        url: str,
+        rate_limiter: RateLimiter,
+        labels: tuple[tuple[str, str], ...],
+        timings: Dict[str, float],
+        **kwargs: Any
+    ) -> tuple[ReportResult, bool]:
+        """
+        Make a single rate-limited request and parse the outcome.
+        
+        Args:
+            method: HTTP method
+            url: Endpoint URL
+            rate_limiter: Limiter the request is paced by
+            labels: Metric labels identifying the endpoint
+            timings: Phase timings of the whole call, added to in place
+            **kwargs: Extra arguments for requests.Session.request
+            
+        Returns:
+            Tuple of (result, is_retryable)
+        """
+        metrics = self.metrics
+        pooled = None
+        if self.key_pool is not None:
+            endpoint = dict(labels)["endpoint"]
+            pooled, rate_limiter = self.key_pool.acquire(endpoint)
+            kwargs["headers"] = {"Key": pooled.key}
+        
+        metrics.adjust(REQUESTS_WAITING, 1, labels)
+        started = time.monotonic()
+        acquired = rate_limiter.acquire()
+        waited = time.monotonic() - started
+        metrics.adjust(REQUESTS_WAITING, -1, labels)
+        metrics.observe(REQUEST_PHASE_SECONDS, waited, labels + (("phase", PHASE_WAIT),))
+        timings[PHASE_WAIT] += waited
+        
+        if not acquired:
+            if pooled is not None:
+                self.key_pool.release(pooled, endpoint, None)
+            metrics.increment(REQUESTS_TOTAL, labels + (("status", STATUS_NOT_SENT),))
+            result = ReportResult(
                 success=False,
-                message="Request failed",
-                error=str(e)
+                message=RATE_LIMITED_MESSAGE,
+                error="API quota exhausted - request not sent"
             )
+            return result, False
+        
+        headers = None
+        response = None
+        status = STATUS_ERROR
+        connection = _connection_timings.current = {PHASE_CONNECT: 0.0, PHASE_TLS: 0.0, "opened": 0}
+        metrics.adjust(REQUESTS_IN_FLIGHT, 1, labels)
+        started = time.monotonic()
+        try:
+            response = self.session.request(method, url, timeout=API_TIMEOUT, **kwargs)
+            headers = response.headers
+            status = status_class(response.status_code)
+            result = self._handle_response(response)
+            retryable = response.status_code == 429 or response.status_code >= 500
+            return result, retryable
         except Exception as e:
-            return ReportResult(
-                success=False,
-                message="Unexpected error",
-                error=str(e)
-            )
+            import requests
+            if isinstance(e, requests.exceptions.Timeout):
+                status = STATUS_TIMEOUT
+            elif isinstance(e, requests.exceptions.ConnectionError):
+                status = STATUS_CONNECTION_ERROR
+            retryable = status != STATUS_ERROR
+            return _exception_result(e), retryable
+        finally:
+            total = time.monotonic() - started
+            _connection_timings.current = None
+            rate_limiter.update(headers)
+            quota_labels = labels
+            if pooled is not None:
+                self.key_pool.release(pooled, endpoint, response.status_code if response is not None else None)
+                quota_labels = labels + (("key", pooled.label),)
+            self._record_attempt(labels, status, total, response, connection, timings)
+            if rate_limiter.remaining is not None:
+                metrics.set(QUOTA_REMAINING, rate_limiter.remaining, quota_labels)
+    
+    def _record_attempt(
+        self,
+        labels: tuple[tuple[str, str], ...],
+        status: str,
+        total: float,
+        response: Optional["requests.Response"],
+        connection: Dict[str, float],
+        timings: Dict[str, float]
+    ) -> None:
+        """
+        Split one attempt's duration into phases and report it.
+        
+        ``response.elapsed`` runs from sending the request until its
+        headers are parsed and includes opening a connection; the rest of
+        the attempt is spent reading and decoding the body.
+        """
+        metrics = self.metrics
+        metrics.adjust(REQUESTS_IN_FLIGHT, -1, labels)
+        metrics.increment(REQUESTS_TOTAL, labels + (("status", status),))
+        
+        until_headers = response.elapsed.total_seconds() if response is not None else total
+        phases = {
+            PHASE_CONNECT: connection[PHASE_CONNECT],
+            PHASE_TLS: connection[PHASE_TLS],
+            PHASE_SERVER: max(0.0, until_headers - connection[PHASE_CONNECT] - connection[PHASE_TLS]),
+            PHASE_READ: max(0.0, total - until_headers),
+        }
+        if connection["opened"]:
+            metrics.increment(CONNECTIONS_OPENED_TOTAL, labels, connection["opened"])
+        for phase, seconds in phases.items():
+            timings[phase] += seconds
+            if seconds or phase not in (PHASE_CONNECT, PHASE_TLS):
+                metrics.observe(REQUEST_PHASE_SECONDS, seconds, labels + (("phase", phase),))
+        metrics.observe(REQUEST_PHASE_SECONDS, total, labels + (("phase", PHASE_TOTAL),))
     
-    def _handle_response(self, response: requests.Response) -> ReportResult:
+    def _handle_response(self, response: "requests.Response") -> ReportResult:
         """
         Handle and parse the API response.
         
@@ -119,62 +595,249 @@ class AbuseIPDBClient:
                 error="Invalid JSON in response body"
             )
         
-        # Success responses - check for 200/201 status AND presence of data
-        if status_code in [200, 201] and "data" in response_data:
-            return ReportResult(
-                success=True,
-                message="Report submitted successfully",
-                status_code=status_code,
-                response_data=response_data
-            )
-        
-        # 400 Bad Request
-        if status_code == 400:
-            error_msg = response_data.get("errors", [{}])[0].get("detail", "Bad request")
-            return ReportResult(
-                success=False,
-                message="Bad request",
-                status_code=status_code,
-                response_data=response_data,
-                error=error_msg
-            )
-        
-        # 401 Unauthorized / Invalid key
-        if status_code == 401:
-            return ReportResult(
-                success=False,
-                message="Authentication failed",
-                status_code=status_code,
-                response_data=response_data,
-                error="Invalid API key"
-            )
-        
-        # 429 Rate limit
-        if status_code == 429:
-            return ReportResult(
-                success=False,
-                message="Rate limit exceeded",
-                status_code=status_code,
-                response_data=response_data,
-                error="Too many requests - please wait before trying again"
-            )
-        
-        # 500+ Server errors
-        if status_code >= 500:
-            return ReportResult(
-                success=False,
-                message="Server error",
-                status_code=status_code,
-                response_data=response_data,
-                error="AbuseIPDB API server error"
-            )
+        return build_report_result(status_code, response_data)
+
+
+def build_report_result(status_code: int, response_data: Dict[str, Any]) -> ReportResult:
+    """
+    Map an API status code and decoded JSON body to a ReportResult.
+    
+    Shared by the synchronous and asynchronous clients so both apply the
+    same status-code handling.
+    
+    Args:
+        status_code: HTTP status code of the response
+        response_data: Decoded JSON response body
         
-        # Other errors
-        error_msg = response_data.get("errors", [{}])[0].get("detail", "Unknown error")
+    Returns:
+        ReportResult object
+    """
+    # Success responses - check for 200/201 status AND presence of data
+    if status_code in [200, 201] and "data" in response_data:
+        return ReportResult(
+            success=True,
+            message="Report submitted successfully",
+            status_code=status_code,
+            response_data=response_data
+        )
+    
+    # 400 Bad Request
+    if status_code == 400:
+        error_msg = response_data.get("errors", [{}])[0].get("detail", "Bad request")
         return ReportResult(
             success=False,
-            message="API error",
+            message="Bad request",
             status_code=status_code,
             response_data=response_data,
             error=error_msg
         )
+    
+    # 401 Unauthorized / Invalid key
+    if status_code == 401:
+        return ReportResult(
+            success=False,
+            message="Authentication failed",
+            status_code=status_code,
+            response_data=response_data,
+            error="Invalid API key"
+        )
+    
+    # 429 Rate limit
+    if status_code == 429:
+        return ReportResult(
+            success=False,
+            message=RATE_LIMITED_MESSAGE,
+            status_code=status_code,
+            response_data=response_data,
+            error="Too many requests - please wait before trying again"
+        )
+    
+    # 500+ Server errors
+    if status_code >= 500:
+        return ReportResult(
+            success=False,
+            message="Server error",
+            status_code=status_code,
+            response_data=response_data,
+            error="AbuseIPDB API server error"
+        )
+    
+    # Other errors
+    error_msg = response_data.get("errors", [{}])[0].get("detail", "Unknown error")
+    return ReportResult(
+        success=False,
+        message="API error",
+        status_code=status_code,
+        response_data=response_data,
+        error=error_msg
+    )
+
+
+def _exception_result(e: Exception) -> ReportResult:
+    """
+    Map an exception raised while talking to the API to a ReportResult.
+    
+    Args:
+        e: The exception raised by requests (or anything unexpected)
+        
+    Returns:
+        ReportResult object
+    """
+    import requests
+    
+    if isinstance(e, requests.exceptions.Timeout):
+        return ReportResult(
+            success=False,
+            message="Request timed out",
+            error=f"The API request exceeded {API_TIMEOUT} seconds"
+        )
+    if isinstance(e, requests.exceptions.ConnectionError):
+        return ReportResult(
+            success=False,
+            message="Connection error",
+            error=str(e)
+        )
+    if isinstance(e, requests.exceptions.RequestException):
+        return ReportResult(
+            success=False,
+            message="Request failed",
+            error=str(e)
+        )
+    return ReportResult(
+        success=False,
+        message="Unexpected error",
+        error=str(e)
+    )
+
+
+def _timed_pool_classes() -> Dict[str, type]:
+    """
+    Return urllib3 connection pool classes (by scheme) whose new
+    connections add their DNS/TCP connect and TLS handshake time to the
+    calling thread's ``_connection_timings.current``.
+    
+    Built on first use, so urllib3 is only imported with requests.
+    """
+    global _TIMED_POOL_CLASSES
+    if _TIMED_POOL_CLASSES is not None:
+        return _TIMED_POOL_CLASSES
+    
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+    
+    def timed(connection_class: type, tls: bool) -> type:
+        class TimedConnection(connection_class):
+            def _new_conn(self):
+                # DNS lookup plus TCP connect
+                started = time.monotonic()
+                try:
+                    return super()._new_conn()
+                finally:
+                    self._socket_seconds = time.monotonic() - started
+            
+            def connect(self):
+                # Recorded even when connecting fails, so a slow DNS lookup
+                # or handshake is not mistaken for server time
+                self._socket_seconds = 0.0
+                started = time.monotonic()
+                try:
+                    super().connect()
+                finally:
+                    timings = getattr(_connection_timings, "current", None)
+                    if timings is not None:
+                        timings[PHASE_CONNECT] += self._socket_seconds
+                        if tls:
+                            timings[PHASE_TLS] += max(0.0, time.monotonic() - started - self._socket_seconds)
+                        timings["opened"] += 1
+        
+        TimedConnection.__name__ = "Timed" + connection_class.__name__
+        return TimedConnection
+    
+    class TimedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = timed(HTTPConnection, tls=False)
+    
+    class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = timed(HTTPSConnection, tls=True)
+    
+    _TIMED_POOL_CLASSES = {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+    return _TIMED_POOL_CLASSES
+
+
+def _csv_line(fields: list[str]) -> str:
+    """Render one CSV line (with trailing newline)."""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerow(fields)
+    return buffer.getvalue()
+
+
+def _bulk_csv_row(report: BulkReport) -> str:
+    """Render a BulkReport as a /bulk-report CSV row."""
+    return _csv_line([
+        report.ip,
+        ",".join(str(cid) for cid in report.category_ids),
+        datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        report.comment
+    ])
+
+
+def _split_bulk_result(chunk: list[BulkReport], result: ReportResult) -> list[ReportResult]:
+    """
+    Turn a successful /bulk-report response into per-row ReportResults.
+    
+    The API lists rejected rows under ``invalidReports`` with a 1-based
+    ``rowNumber`` that counts the CSV header. Rows are matched by row
+    number first and by IP as a fallback; everything else was saved.
+    
+    Args:
+        chunk: Reports contained in the upload
+        result: The successful ReportResult for the whole upload
+        
+    Returns:
+        List of ReportResult objects, one per report in ``chunk``
+    """
+    data = (result.response_data or {}).get("data", {})
+    invalid_by_index: Dict[int, Dict[str, Any]] = {}
+    indices_by_ip: Optional[Dict[str, list[int]]] = None
+    
+    for invalid in data.get("invalidReports", []):
+        ip = invalid.get("input")
+        row_number = invalid.get("rowNumber")
+        if isinstance(row_number, int) and 0 <= row_number - 2 < len(chunk):
+            if chunk[row_number - 2].ip == ip:
+                invalid_by_index[row_number - 2] = invalid
+                continue
+        
+        # Fall back to the first unmatched row for this IP
+        if indices_by_ip is None:
+            indices_by_ip = {}
+            for i, report in enumerate(chunk):
+                indices_by_ip.setdefault(report.ip, []).append(i)
+        for i in indices_by_ip.get(ip, []):
+            if i not in invalid_by_index:
+                invalid_by_index[i] = invalid
+                break
+    
+    results = []
+    for index in range(len(chunk)):
+        invalid = invalid_by_index.get(index)
+        if invalid is None:
+            results.append(ReportResult(
+                success=True,
+                message="Report submitted successfully",
+                status_code=result.status_code,
+                attempts=result.attempts,
+                latency=result.latency,
+                timings=result.timings
+            ))
+        else:
+            results.append(ReportResult(
+                success=False,
+                message="Report rejected",
+                status_code=result.status_code,
+                response_data={"invalidReport": invalid},
+                error=invalid.get("error", "Invalid report"),
+                attempts=result.attempts,
+                latency=result.latency,
+                timings=result.timings
+            ))
+    return results
@@ -0,0 +1,173 @@
+"""Coalescing of repeated events into one report per IP."""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+from client import BulkReport
+from validators import MAX_COMMENT_LENGTH
+
+
+DEFAULT_WINDOW = 60.0
+DEFAULT_MAX_GROUPS = 10000
+COMMENT_SEPARATOR = " | "
+
+
+@dataclass
+class CoalescedReport:
+    """A report built from one or more events for the same IP."""
+    report: BulkReport
+    line_number: Optional[int]
+    events: int
+
+
+class _Group:
+    """Events for one IP that are still being collected."""
+    __slots__ = ("first_seen", "line_number", "category_ids", "comments",
+                 "comment_length", "confidence", "events")
+    
+    def __init__(self, report: BulkReport, line_number: Optional[int], now: float):
+        self.first_seen = now
+        self.line_number = line_number
+        self.category_ids = list(report.category_ids)
+        self.comments = [report.comment]
+        self.comment_length = len(report.comment)
+        self.confidence = report.confidence
+        self.events = 1
+    
+    def merge(self, report: BulkReport) -> None:
+        """Fold another event for the same IP into this group."""
+        self.events += 1
+        self.confidence = max(self.confidence, report.confidence)
+        
+        for cid in report.category_ids:
+            if cid not in self.category_ids:
+                self.category_ids.append(cid)
+        
+        # Keep distinct comments while the merged text fits the API limit
+        if report.comment not in self.comments:
+            length = self.comment_length + len(COMMENT_SEPARATOR) + len(report.comment)
+            if length <= MAX_COMMENT_LENGTH:
+                self.comments.append(report.comment)
+                self.comment_length = length
+    
+    def build(self, ip: str) -> CoalescedReport:
+        """Return the merged report for this group."""
+        report = BulkReport(
+            ip=ip,
+            category_ids=self.category_ids,
+            comment=COMMENT_SEPARATOR.join(self.comments),
+            confidence=self.confidence
+        )
+        return CoalescedReport(report, self.line_number, self.events)
+
+
+class ReportCoalescer:
+    """
+    Groups events by IP over a time window and emits one report per group.
+    
+    A group is emitted ``window`` seconds after its first event, or earlier
+    when more than ``max_groups`` IPs are buffered (oldest first). Merged
+    reports carry the union of category IDs, the distinct comments joined
+    up to MAX_COMMENT_LENGTH characters and the highest confidence.
+    """
+    
+    def __init__(
+        self,
+        window: float = DEFAULT_WINDOW,
+        max_groups: Optional[int] = DEFAULT_MAX_GROUPS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the coalescer.
+        
+        Args:
+            window: Seconds to collect events for an IP before reporting it
+            max_groups: Maximum number of IPs buffered at once (None for
+                no limit)
+            clock: Time source (monotonic seconds)
+        """
+        self.window = window
+        self.max_groups = max_groups
+        self.clock = clock
+        self.merged = 0
+        
+        self._groups: "OrderedDict[str, _Group]" = OrderedDict()
+    
+    def add(self, report: BulkReport, line_number: Optional[int] = None) -> list[CoalescedReport]:
+        """
+        Add an event and return any groups that are now due.
+        
+        Args:
+            report: A validated report for one event
+            line_number: Input line of the event, if any
+            
+        Returns:
+            List of CoalescedReport objects ready to submit
+        """
+        now = self.clock()
+        ready = self.pop_due(now)
+        
+        group = self._groups.get(report.ip)
+        if group is None:
+            self._groups[report.ip] = _Group(report, line_number, now)
+            if self.max_groups is not None and len(self._groups) > self.max_groups:
+                ip, oldest = self._groups.popitem(last=False)
+                ready.append(oldest.build(ip))
+        else:
+            group.merge(report)
+            self.merged += 1
+        
+        return ready
+    
+    def pop_due(self, now: Optional[float] = None) -> list[CoalescedReport]:
+        """
+        Remove and return groups whose window has elapsed.
+        
+        Args:
+            now: Current clock value (defaults to ``clock()``)
+            
+        Returns:
+            List of CoalescedReport objects ready to submit
+        """
+        if now is None:
+            now = self.clock()
+        
+        ready = []
+        cutoff = now - self.window
+        while self._groups:
+            ip, group = next(iter(self._groups.items()))
+            if group.first_seen > cutoff:
+                break
+            self._groups.popitem(last=False)
+            ready.append(group.build(ip))
+        return ready
+    
+    def flush(self) -> list[CoalescedReport]:
+        """Remove and return every buffered group."""
+        ready = [group.build(ip) for ip, group in self._groups.items()]
+        self._groups.clear()
+        return ready
+    
+    def oldest_line(self) -> Optional[int]:
+        """Return the input line of the oldest buffered event, if any."""
+        for group in self._groups.values():
+            return group.line_number
+        return None
+
+
+def coalesce_reports(reports: Iterable[BulkReport]) -> list[BulkReport]:
+    """
+    Merge all reports for the same IP in a batch into one report each.
+    
+    Args:
+        reports: Validated reports, possibly with repeated IPs
+        
+    Returns:
+        One merged report per distinct IP, in first-seen order
+    """
+    coalescer = ReportCoalescer(window=float("inf"), max_groups=None)
+    for report in reports:
+        coalescer.add(report)
+    return [coalesced.report for coalesced in coalescer.flush()]
@@ -0,0 +1,124 @@
+"""Suppression of duplicate reports for recently reported IPs."""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+
+DEFAULT_CACHE_FILE = ".abuse_reporter_recent.json"
+DEFAULT_TTL = 15 * 60        # AbuseIPDB rejects repeat reports within 15 minutes
+DEFAULT_MAX_SIZE = 100000
+
+
+class RecentReportCache:
+    """
+    Bounded, TTL-evicting record of IPs reported recently.
+    
+    Checking an IP records it, so later duplicates within ``ttl`` seconds
+    are dropped before they reach the network. Entries are kept in report
+    order, which makes expiry and size eviction O(1) per entry. The cache
+    can be persisted to a JSON file so suppression survives restarts.
+    """
+    
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        ttl: float = DEFAULT_TTL,
+        max_size: int = DEFAULT_MAX_SIZE
+    ):
+        """
+        Initialize the cache, loading unexpired entries from ``path``.
+        
+        Args:
+            path: JSON file used by load()/save(), or None for memory only
+            ttl: Seconds an IP stays suppressed after being reported
+            max_size: Maximum number of IPs remembered
+        """
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.max_size = max_size
+        self.suppressed = 0
+        
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        if self.path and self.path.exists():
+            self.load()
+    
+    def check(self, ip: str) -> bool:
+        """
+        Record an IP about to be reported, unless it was reported recently.
+        
+        Args:
+            ip: The IP address to report
+            
+        Returns:
+            True if the report should be sent, False if it is a duplicate
+        """
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            if ip in self._entries:
+                self.suppressed += 1
+                return False
+            
+            self._entries[ip] = now
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return True
+    
+    def forget(self, ip: str) -> None:
+        """
+        Remove an IP, e.g. after its report failed and may be retried.
+        
+        Args:
+            ip: The IP address to remove
+        """
+        with self._lock:
+            self._entries.pop(ip, None)
+    
+    def load(self) -> None:
+        """Load unexpired entries from the cache file (ignoring bad files)."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict):
+            return
+        
+        cutoff = time.time() - self.ttl
+        entries = sorted(
+            (timestamp, ip) for ip, timestamp in data.items()
+            if isinstance(timestamp, (int, float)) and timestamp > cutoff
+        )
+        with self._lock:
+            for timestamp, ip in entries[-self.max_size:]:
+                self._entries[ip] = timestamp
+    
+    def save(self) -> None:
+        """Write unexpired entries to the cache file atomically."""
+        if not self.path:
+            return
+        
+        with self._lock:
+            self._expire(time.time())
+            data = dict(self._entries)
+        
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(temp_path, self.path)
+    
+    def _expire(self, now: float) -> None:
+        """Drop entries older than the TTL (oldest entries come first)."""
+        cutoff = now - self.ttl
+        while self._entries:
+            ip, timestamp = next(iter(self._entries.items()))
+            if timestamp > cutoff:
+                break
+            self._entries.popitem(last=False)
@@ -0,0 +1,117 @@
+"""Tailing of log files that survives rotation and truncation."""
+
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Largest chunk read from a file per poll
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class FileTailer:
+    """
+    Follows one file like ``tail -F``, returning complete new lines.
+    
+    The file is identified by device and inode. When the path starts
+    pointing at a different file (logrotate's create mode), the rest of
+    the old file is read and the new one is followed from its start. When
+    the file shrinks below the read position (copytruncate), reading
+    restarts at the beginning. A missing file is waited for.
+    """
+    
+    def __init__(self, path: Union[str, Path], from_start: bool = False):
+        """
+        Open the file (if it exists) for following.
+        
+        Args:
+            path: File to follow
+            from_start: Read existing content instead of only new lines
+        """
+        self.path = Path(path)
+        self.line_number = 0
+        
+        self._file = None
+        self._identity: Optional[tuple[int, int]] = None
+        self._position = 0
+        self._partial = b""
+        
+        self._open(from_start)
+    
+    def close(self) -> None:
+        """Close the underlying file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def read_lines(self) -> tuple[int, list[str]]:
+        """
+        Return the complete lines written since the last call.
+        
+        A trailing line without a newline is held back until it is
+        finished (or the file is rotated away).
+        
+        Returns:
+            Tuple of (line number of the first line, lines without newlines)
+        """
+        first_line = self.line_number + 1
+        if self._file is None and not self._open(from_start=True):
+            return first_line, []
+        
+        lines = self._read_available()
+        
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            stat = None    # Rotated away and not recreated yet
+        
+        if stat is not None and (stat.st_dev, stat.st_ino) != self._identity:
+            # Rotated: the old file is drained, switch to the new one
+            if self._partial:
+                lines.append(self._decode(self._partial))
+                self.line_number += 1
+            self.close()
+            if self._open(from_start=True):
+                lines.extend(self._read_available())
+        elif stat is not None and stat.st_size < self._position:
+            # Truncated in place
+            self._file.seek(0)
+            self._position = 0
+            self._partial = b""
+            lines.extend(self._read_available())
+        
+        return first_line, lines
+    
+    def _open(self, from_start: bool) -> bool:
+        """Open the file, returning False if it does not exist yet."""
+        try:
+            self._file = open(self.path, "rb")
+        except FileNotFoundError:
+            return False
+        
+        stat = os.fstat(self._file.fileno())
+        self._identity = (stat.st_dev, stat.st_ino)
+        self._position = 0 if from_start else self._file.seek(0, os.SEEK_END)
+        self._partial = b""
+        return True
+    
+    def _read_available(self) -> list[str]:
+        """Read everything appended since the last read."""
+        lines = []
+        while True:
+            data = self._file.read(READ_CHUNK_SIZE)
+            if not data:
+                return lines
+            self._position += len(data)
+            
+            chunks = (self._partial + data).split(b"\n")
+            self._partial = chunks.pop()
+            self.line_number += len(chunks)
+            lines.extend(self._decode(chunk) for chunk in chunks)
+    
+    @staticmethod
+    def _decode(chunk: bytes) -> str:
+        """Decode one raw line, tolerating bad bytes and CRLF endings."""
+        return chunk.decode("utf-8", errors="replace").rstrip("\r")
@@ -8,16 +8,23 @@ Category text displays with correct colors and automatically hides/shows based o
 
 import sys
 import os
+import csv
+import threading
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QTabWidget, QLabel, QLineEdit, QComboBox, QTextEdit,
     QPushButton, QCheckBox, QSlider, QMessageBox, QScrollArea,
-    QFrame, QProgressBar
+    QFrame, QProgressBar, QTableView, QHeaderView, QFileDialog
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont, QPixmap, QIcon
+from PyQt6.QtCore import (
+    Qt, QObject, QThread, pyqtSignal, pyqtSlot,
+    QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+)
+from PyQt6.QtGui import QFont, QPixmap, QIcon, QColor
 
 from dotenv import load_dotenv
 
@@ -34,8 +41,236 @@ else:
     load_dotenv()
 
 from categories import CATEGORIES, get_category_id
-from validators import validate_ip, validate_confidence, validate_comment, validate_api_key
-from client import AbuseIPDBClient
+from validators import (
+    validate_ip, validate_ip_batch, pack_ip, validate_confidence, validate_comment, validate_api_key
+)
+from client import AbuseIPDBClient, ReportResult
+from keypool import KeyPool, API_KEY_ENV, API_KEYS_ENV, parse_api_keys
+from bulk import BulkReport, submit_bulk, DEFAULT_CONCURRENCY, MAX_CONCURRENCY, CANCELLED_MESSAGE
+from submission_queue import SubmissionQueue, DEFAULT_QUEUE_FILE
+from dedup import RecentReportCache, DEFAULT_CACHE_FILE
+from coalesce import coalesce_reports
+from ipfilter import AddressFilter, DEFAULT_ALLOWLIST_FILE, drop_message
+from blacklist import BlacklistSnapshot, refresh_blacklist, DEFAULT_BLACKLIST_FILE
+from iprange import is_ip_range
+from ingest import InputRecord, expand_records
+
+
+# Most addresses (after range expansion) one Bulk tab run accepts
+MAX_BULK_ADDRESSES = 65536
+
+
+@dataclass
+class BulkRun:
+    """State of the bulk submission currently running."""
+    queue: SubmissionQueue
+    cache: RecentReportCache
+    entries: list        # (queue_entry_id, BulkReport) per submitted report
+    rows: list           # Results table row for each entry
+    merged: int = 0
+    suppressed: int = 0
+    filtered: str = ""   # Drop counts of private/reserved/allowlisted IPs
+    done: int = 0
+    successful: int = 0
+    cancelled: int = 0
+
+
+@dataclass
+class ResultRow:
+    """One report shown in the Bulk results table."""
+    entry_id: int
+    report: BulkReport
+    status: str = "Pending"
+    status_code: Optional[int] = None
+    latency: Optional[float] = None
+    error: str = ""
+
+
+class ResultsTableModel(QAbstractTableModel):
+    """Per-IP bulk results, updated in place as reports finish."""
+    
+    COLUMNS = ("IP", "Status", "HTTP", "Latency (ms)", "Error")
+    PENDING = "Pending"
+    SUBMITTED = "Submitted"
+    FAILED = "Failed"
+    CANCELLED = "Cancelled"
+    STATUS_COLORS = {SUBMITTED: "#00aa00", FAILED: "#ff3333", CANCELLED: "#ffaa00"}
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        column = index.column()
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.display_values(row)[column]
+        if role == Qt.ItemDataRole.UserRole:
+            # Raw values so numeric columns sort numerically
+            return (
+                row.report.ip,
+                row.status,
+                row.status_code or 0,
+                row.latency if row.latency is not None else -1.0,
+                row.error
+            )[column]
+        if role == Qt.ItemDataRole.ForegroundRole and column == 1:
+            color = self.STATUS_COLORS.get(row.status)
+            return QColor(color) if color else None
+        if role == Qt.ItemDataRole.ToolTipRole and column == 4 and row.error:
+            return row.error
+        return None
+    
+    def display_values(self, row):
+        """Return the text shown in each column for a row."""
+        return (
+            row.report.ip,
+            row.status,
+            str(row.status_code) if row.status_code is not None else "",
+            f"{row.latency * 1000:.0f}" if row.latency is not None else "",
+            row.error
+        )
+    
+    def set_entries(self, entries):
+        """Replace the table with one pending row per (entry_id, report)."""
+        self.beginResetModel()
+        self.rows = [ResultRow(entry_id, report) for entry_id, report in entries]
+        self.endResetModel()
+    
+    def set_pending(self, row_numbers):
+        """Mark rows as pending again before they are retried."""
+        for number in row_numbers:
+            row = self.rows[number]
+            row.status = self.PENDING
+            row.status_code = None
+            row.latency = None
+            row.error = ""
+        if row_numbers:
+            self.dataChanged.emit(
+                self.index(min(row_numbers), 0),
+                self.index(max(row_numbers), len(self.COLUMNS) - 1)
+            )
+    
+    def set_result(self, number, result):
+        """Show the outcome of the report in one row."""
+        row = self.rows[number]
+        if result.success:
+            row.status = self.SUBMITTED
+        elif result.message == CANCELLED_MESSAGE:
+            row.status = self.CANCELLED
+        else:
+            row.status = self.FAILED
+        row.status_code = result.status_code
+        row.latency = result.latency if result.attempts else None
+        row.error = "" if result.success else (result.error or result.message)
+        self.dataChanged.emit(self.index(number, 0), self.index(number, len(self.COLUMNS) - 1))
+    
+    def retryable_rows(self):
+        """Return the numbers of rows that failed or were cancelled."""
+        return [
+            number for number, row in enumerate(self.rows)
+            if row.status in (self.FAILED, self.CANCELLED)
+        ]
+
+
+class ResultsFilterProxy(QSortFilterProxyModel):
+    """Filters the results table by status and IP substring."""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.status_filter = None
+        self.ip_filter = ""
+        self.setSortRole(Qt.ItemDataRole.UserRole)
+    
+    def set_filters(self, status_filter, ip_filter):
+        """Apply a status (None for all) and an IP substring filter."""
+        self.status_filter = status_filter
+        self.ip_filter = ip_filter.strip()
+        self.invalidateFilter()
+    
+    def filterAcceptsRow(self, source_row, source_parent):
+        row = self.sourceModel().rows[source_row]
+        if self.status_filter and row.status != self.status_filter:
+            return False
+        return self.ip_filter in row.report.ip
+
+
+class SubmissionWorker(QObject):
+    """Runs report submissions on a background QThread."""
+    
+    result_ready = pyqtSignal(int, object, object)  # index, BulkReport, ReportResult
+    finished = pyqtSignal(list)                     # ReportResult per report
+    failed = pyqtSignal(str)
+    
+    def __init__(self, client, reports, concurrency=1):
+        super().__init__()
+        self.client = client
+        self.reports = reports
+        self.concurrency = concurrency
+        self.cancel_event = threading.Event()
+    
+    @pyqtSlot()
+    def run(self):
+        """Submit all reports, emitting each result as it completes."""
+        try:
+            results = submit_bulk(
+                self.client,
+                self.reports,
+                self.concurrency,
+                on_result=self.result_ready.emit,
+                cancel=self.cancel_event
+            )
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(results)
+    
+    def cancel(self):
+        """Stop starting new reports; ones already in flight still finish."""
+        self.cancel_event.set()
+
+
+class BlacklistWorker(QObject):
+    """Loads the blacklist snapshot on a background QThread, downloading it when stale."""
+    
+    finished = pyqtSignal(object, str)  # BlacklistSnapshot, status message
+    failed = pyqtSignal(str)
+    
+    def __init__(self, client, path, max_age=None):
+        super().__init__()
+        self.client = client
+        self.path = path
+        self.max_age = max_age
+    
+    @pyqtSlot()
+    def run(self):
+        """Load (and, with a client, refresh) the snapshot and emit it."""
+        try:
+            if self.client is None:
+                snapshot = BlacklistSnapshot.load(self.path)
+                message = f"Using blacklist snapshot as is ({len(snapshot)} addresses)"
+            elif self.max_age is None:
+                snapshot, message = refresh_blacklist(self.client, self.path)
+            else:
+                snapshot, message = refresh_blacklist(self.client, self.path, self.max_age)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(snapshot, message)
 
 
 class AbuseReporterGUI(QMainWindow):
@@ -59,7 +294,25 @@ class AbuseReporterGUI(QMainWindow):
         if logo_path.exists():
             self.setWindowIcon(QIcon(str(logo_path)))
         
-        self.api_key = os.getenv("ABUSEIPDB_API_KEY")
+        self.api_key = os.getenv(API_KEY_ENV)
+        # Further keys pooled with api_key (ABUSEIPDB_API_KEYS)
+        self.pool_keys = parse_api_keys(os.getenv(API_KEYS_ENV))
+        if not self.api_key and self.pool_keys:
+            self.api_key = self.pool_keys[0]
+        self.client = None
+        self.client_keys = ()
+        self.worker = None
+        self.worker_thread = None
+        self.blacklist_worker = None
+        self.blacklist_thread = None
+        self.bulk_run = None
+        self.pending_bulk = None
+        self.skip_blacklisted = False
+        
+        # Kept across theme changes, which rebuild the tabs
+        self.results_model = ResultsTableModel(self)
+        self.results_proxy = ResultsFilterProxy(self)
+        self.results_proxy.setSourceModel(self.results_model)
         self.apply_theme()
         self.create_ui()
         
@@ -167,7 +420,7 @@ class AbuseReporterGUI(QMainWindow):
         
         layout.addWidget(QLabel("IP Address"))
         self.ip_input = QLineEdit()
-        self.ip_input.setPlaceholderText("e.g., 192.0.2.1")
+        self.ip_input.setPlaceholderText("e.g., 1.2.3.4")
         layout.addWidget(self.ip_input)
         
         layout.addWidget(QLabel("Category"))
@@ -216,9 +469,9 @@ class AbuseReporterGUI(QMainWindow):
         layout = QVBoxLayout()
         layout.setSpacing(12)
         
-        layout.addWidget(QLabel("IP Addresses (one per line)"))
+        layout.addWidget(QLabel("IP Addresses, CIDR blocks or ranges (one per line)"))
         self.bulk_ips = QTextEdit()
-        self.bulk_ips.setPlaceholderText("192.0.2.1\n192.0.2.2")
+        self.bulk_ips.setPlaceholderText("1.2.3.4\n1.2.4.0/28\n1.2.5.10-20")
         self.bulk_ips.setMaximumHeight(80)
         layout.addWidget(self.bulk_ips)
         
@@ -245,19 +498,87 @@ class AbuseReporterGUI(QMainWindow):
         bulk_conf_h.addWidget(self.bulk_conf_label)
         layout.addLayout(bulk_conf_h)
         
+        layout.addWidget(QLabel(f"Concurrency (1-{MAX_CONCURRENCY} parallel reports)"))
+        bulk_conc_h = QHBoxLayout()
+        self.bulk_conc_slider = QSlider(Qt.Orientation.Horizontal)
+        self.bulk_conc_slider.setRange(1, MAX_CONCURRENCY)
+        self.bulk_conc_slider.setValue(DEFAULT_CONCURRENCY)
+        self.bulk_conc_slider.setTickInterval(1)
+        self.bulk_conc_label = QLabel(str(DEFAULT_CONCURRENCY))
+        self.bulk_conc_label.setMinimumWidth(40)
+        self.bulk_conc_slider.valueChanged.connect(lambda v: self.bulk_conc_label.setText(str(v)))
+        bulk_conc_h.addWidget(self.bulk_conc_slider, 1)
+        bulk_conc_h.addWidget(self.bulk_conc_label)
+        layout.addLayout(bulk_conc_h)
+        
+        self.bulk_blacklist_cb = QCheckBox(" Skip IPs already on the AbuseIPDB blacklist")
+        self.bulk_blacklist_cb.setToolTip("Uses the local blacklist snapshot (see Settings), refreshed when stale")
+        self.bulk_blacklist_cb.setChecked(self.skip_blacklisted)
+        self.bulk_blacklist_cb.toggled.connect(lambda checked: setattr(self, "skip_blacklisted", checked))
+        layout.addWidget(self.bulk_blacklist_cb)
+        
         self.bulk_progress = QProgressBar()
         self.bulk_progress.setVisible(False)
         layout.addWidget(self.bulk_progress)
         
+        bulk_btn_h = QHBoxLayout()
         btn = QPushButton("🚀 Submit Bulk")
         btn.setMinimumHeight(42)
         btn.clicked.connect(self.submit_bulk)
-        layout.addWidget(btn)
+        bulk_btn_h.addWidget(btn, 1)
+        
+        self.bulk_cancel_btn = QPushButton("⏹ Cancel")
+        self.bulk_cancel_btn.setMinimumHeight(42)
+        self.bulk_cancel_btn.setVisible(False)
+        self.bulk_cancel_btn.clicked.connect(self.cancel_bulk)
+        bulk_btn_h.addWidget(self.bulk_cancel_btn)
+        layout.addLayout(bulk_btn_h)
         
         self.bulk_status = QLabel("")
         self.bulk_status.setWordWrap(True)
         layout.addWidget(self.bulk_status)
-        layout.addStretch()
+        
+        # Per-IP results
+        results_h = QHBoxLayout()
+        self.results_ip_filter = QLineEdit()
+        self.results_ip_filter.setPlaceholderText("Filter by IP")
+        self.results_ip_filter.setText(self.results_proxy.ip_filter)
+        self.results_ip_filter.textChanged.connect(self.apply_results_filter)
+        results_h.addWidget(self.results_ip_filter, 1)
+        
+        self.results_status_filter = QComboBox()
+        self.results_status_filter.addItems([
+            "All", ResultsTableModel.SUBMITTED, ResultsTableModel.FAILED,
+            ResultsTableModel.CANCELLED, ResultsTableModel.PENDING
+        ])
+        self.results_status_filter.setCurrentText(self.results_proxy.status_filter or "All")
+        self.results_status_filter.currentTextChanged.connect(self.apply_results_filter)
+        results_h.addWidget(self.results_status_filter)
+        
+        retry_btn = QPushButton("🔁 Retry Failed")
+        retry_btn.setToolTip("Resubmit failed and cancelled reports only")
+        retry_btn.clicked.connect(self.retry_failed)
+        results_h.addWidget(retry_btn)
+        
+        export_btn = QPushButton("💾 Export CSV")
+        export_btn.clicked.connect(self.export_results)
+        results_h.addWidget(export_btn)
+        layout.addLayout(results_h)
+        
+        self.results_view = QTableView()
+        self.results_view.setModel(self.results_proxy)
+        self.results_view.setSortingEnabled(True)
+        self.results_view.setAlternatingRowColors(True)
+        self.results_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.results_view.setMinimumHeight(160)
+        # Fixed row heights and column widths keep large tables fast
+        self.results_view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.results_view.verticalHeader().setDefaultSectionSize(24)
+        self.results_view.verticalHeader().setVisible(False)
+        self.results_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.results_view.horizontalHeader().setStretchLastSection(True)
+        self.results_view.setColumnWidth(0, 260)
+        layout.addWidget(self.results_view, 1)
         
         tab.setLayout(layout)
         self.tabs.addTab(tab, "📦 Bulk")
@@ -348,6 +669,25 @@ class AbuseReporterGUI(QMainWindow):
         key_h.addWidget(save_key_btn)
         layout.addLayout(key_h)
         
+        # Keys of other accounts, used together with the key above
+        layout.addWidget(QLabel("Key Pool (more keys, comma-separated):"))
+        pool_h = QHBoxLayout()
+        self.pool_keys_input = QLineEdit()
+        self.pool_keys_input.setPlaceholderText("Optional: keys of other accounts to spread reports across")
+        self.pool_keys_input.setEchoMode(QLineEdit.EchoMode.Password)
+        self.pool_keys_input.setText(", ".join(self.pool_keys))
+        pool_h.addWidget(self.pool_keys_input, 1)
+        
+        save_pool_btn = QPushButton("💾 Save Pool")
+        save_pool_btn.setMinimumHeight(35)
+        save_pool_btn.clicked.connect(self.save_key_pool)
+        pool_h.addWidget(save_pool_btn)
+        layout.addLayout(pool_h)
+        
+        self.pool_lbl = QLabel(self.key_pool_status())
+        self.pool_lbl.setWordWrap(True)
+        layout.addWidget(self.pool_lbl)
+        
         layout.addWidget(QLabel("Setup Instructions:"))
         
         inst = QLabel(
@@ -361,6 +701,17 @@ class AbuseReporterGUI(QMainWindow):
         inst.setWordWrap(True)
         layout.addWidget(inst)
         
+        layout.addSpacing(15)
+        layout.addWidget(QLabel("🛡 Blacklist Snapshot"))
+        blacklist_h = QHBoxLayout()
+        self.blacklist_lbl = QLabel(self.blacklist_status())
+        blacklist_h.addWidget(self.blacklist_lbl, 1)
+        update_blacklist_btn = QPushButton("⬇ Update Blacklist")
+        update_blacklist_btn.setMinimumHeight(35)
+        update_blacklist_btn.clicked.connect(self.update_blacklist)
+        blacklist_h.addWidget(update_blacklist_btn)
+        layout.addLayout(blacklist_h)
+        
         layout.addSpacing(15)
         layout.addWidget(QLabel("ℹ️ About"))
         
@@ -379,8 +730,156 @@ class AbuseReporterGUI(QMainWindow):
         tab.setLayout(layout)
         self.tabs.addTab(tab, "⚙️ Settings")
     
+    def get_client(self):
+        """Return the shared API client, recreating it if the keys changed."""
+        keys = tuple(dict.fromkeys([self.api_key] + self.pool_keys))
+        if self.client is None or self.client_keys != keys:
+            if self.client is not None:
+                self.client.close()
+            self.client = AbuseIPDBClient(KeyPool(keys) if len(keys) > 1 else self.api_key)
+            self.client_keys = keys
+        return self.client
+    
+    def key_pool_status(self):
+        """Describe the key pool for the Settings tab."""
+        if self.client is not None and self.client.key_pool is not None:
+            return f"🔑 {self.client.key_pool.summary()}"
+        keys = len(set([self.api_key] + self.pool_keys)) if self.api_key else 0
+        if keys > 1:
+            return f"🔑 {keys} keys pooled; reports are spread by remaining quota"
+        return "🔑 Single key (add more keys to pool several accounts)"
+    
+    def closeEvent(self, event):
+        """Stop background work and release pooled connections."""
+        if self.worker_thread is not None:
+            self.worker.cancel()
+            self.worker_thread.quit()
+            self.worker_thread.wait()
+            # Deliver results queued by the worker before it stopped
+            QApplication.processEvents()
+        if self.blacklist_thread is not None:
+            # A download cannot be interrupted; the snapshot is saved when it arrives
+            self.blacklist_thread.quit()
+            self.blacklist_thread.wait()
+        if self.bulk_run is not None:
+            self.finish_bulk_run()
+        if self.client is not None:
+            self.client.close()
+        super().closeEvent(event)
+    
+    def start_worker(self, reports, concurrency, on_finished, on_failed, on_result=None):
+        """Run a submission on a background thread, wiring its signals."""
+        thread = QThread(self)
+        worker = SubmissionWorker(self.get_client(), reports, concurrency)
+        worker.moveToThread(thread)
+        
+        thread.started.connect(worker.run)
+        if on_result is not None:
+            worker.result_ready.connect(on_result)
+        worker.finished.connect(on_finished)
+        worker.failed.connect(on_failed)
+        worker.finished.connect(thread.quit)
+        worker.failed.connect(thread.quit)
+        thread.finished.connect(self.worker_done)
+        
+        self.worker = worker
+        self.worker_thread = thread
+        thread.start()
+    
+    @pyqtSlot()
+    def worker_done(self):
+        """Release the finished worker and its thread."""
+        if self.worker_thread is not None:
+            self.worker_thread.deleteLater()
+            self.worker.deleteLater()
+        self.worker = None
+        self.worker_thread = None
+    
+    def get_address_filter(self, blacklist=None):
+        """Return a filter for reserved ranges plus the app's allowlist file."""
+        allowlist = Path(__file__).parent / DEFAULT_ALLOWLIST_FILE
+        return AddressFilter.from_allowlist_file(allowlist if allowlist.exists() else None, blacklist)
+    
+    def start_blacklist_worker(self, on_finished, on_failed, max_age=None):
+        """
+        Load the blacklist snapshot on a background thread, downloading it
+        first when older than ``max_age`` seconds (default: the refresh
+        interval) and a key is set.
+        
+        ``on_finished`` receives (snapshot, status message) and
+        ``on_failed`` an error message, both on the GUI thread.
+        """
+        thread = QThread(self)
+        client = self.get_client() if self.api_key else None
+        worker = BlacklistWorker(client, Path(__file__).parent / DEFAULT_BLACKLIST_FILE, max_age)
+        worker.moveToThread(thread)
+        
+        thread.started.connect(worker.run)
+        worker.finished.connect(on_finished)
+        worker.failed.connect(on_failed)
+        worker.finished.connect(thread.quit)
+        worker.failed.connect(thread.quit)
+        thread.finished.connect(self.blacklist_done)
+        
+        self.blacklist_worker = worker
+        self.blacklist_thread = thread
+        thread.start()
+    
+    @pyqtSlot()
+    def blacklist_done(self):
+        """Release the finished blacklist worker and its thread."""
+        if self.blacklist_thread is not None:
+            self.blacklist_thread.deleteLater()
+            self.blacklist_worker.deleteLater()
+        self.blacklist_worker = None
+        self.blacklist_thread = None
+    
+    def blacklist_status(self):
+        """Describe the blacklist snapshot for the Settings tab."""
+        try:
+            snapshot = BlacklistSnapshot.load(Path(__file__).parent / DEFAULT_BLACKLIST_FILE)
+        except (OSError, ValueError) as e:
+            return f"❌ {e}"
+        if not snapshot.downloaded:
+            return "Not downloaded yet"
+        return f"{len(snapshot)} addresses, updated {snapshot.age / 3600:.1f} hours ago"
+    
+    def update_blacklist(self):
+        """Download the blacklist into the local snapshot now."""
+        if not self.api_key:
+            QMessageBox.critical(self, "Error", "API key not configured")
+            return
+        if self.is_busy():
+            return
+        self.blacklist_lbl.setText("⏳ Downloading blacklist...")
+        self.start_blacklist_worker(self.on_blacklist_updated, self.on_blacklist_update_failed, max_age=0)
+    
+    @pyqtSlot(object, str)
+    def on_blacklist_updated(self, snapshot, message):
+        """Show the result of a blacklist update."""
+        self.blacklist_lbl.setText(self.blacklist_status())
+        QMessageBox.information(self, "Blacklist", message)
+    
+    @pyqtSlot(str)
+    def on_blacklist_update_failed(self, error):
+        """Show an error raised while updating the blacklist."""
+        self.blacklist_lbl.setText(self.blacklist_status())
+        QMessageBox.critical(self, "Error", f"Cannot update blacklist:\n{error}")
+    
+    def is_busy(self):
+        """Return True (and tell the user) if a submission or blacklist download is running."""
+        if self.worker_thread is not None:
+            QMessageBox.warning(self, "Busy", "A submission is already running. Wait for it or cancel it first.")
+            return True
+        if self.blacklist_thread is not None:
+            QMessageBox.warning(self, "Busy", "The blacklist is being downloaded. Wait for it to finish first.")
+            return True
+        return False
+    
     def toggle_theme(self):
         """Toggle between light and dark mode."""
+        if self.is_busy():
+            return
         self.dark_mode = not self.dark_mode
         self.apply_theme()
         
@@ -406,29 +905,10 @@ class AbuseReporterGUI(QMainWindow):
             QMessageBox.critical(self, "Error", "API key seems too short")
             return
         
+        # Find or create .env file in script directory
+        env_file = Path(__file__).parent / '.env'
         try:
-            # Find or create .env file in script directory
-            env_file = Path(__file__).parent / '.env'
-            
-            # Read existing .env if it exists
-            env_content = {}
-            if env_file.exists():
-                with open(env_file, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#') and '=' in line:
-                            k, v = line.split('=', 1)
-                            env_content[k.strip()] = v.strip()
-            
-            # Update API key
-            env_content['ABUSEIPDB_API_KEY'] = key
-            
-            # Write back to .env
-            with open(env_file, 'w') as f:
-                f.write("# AbuseIPDB Reporter Configuration\n")
-                f.write("# Keep this file secure - it contains your API key\n\n")
-                for k, v in env_content.items():
-                    f.write(f"{k}={v}\n")
+            self.update_env_file(env_file, API_KEY_ENV, key)
             
             # Update the instance variable
             self.api_key = key
@@ -436,6 +916,7 @@ class AbuseReporterGUI(QMainWindow):
             # Update status label
             self.status_lbl.setText(f"✅ API Key: {key[:10]}{'*'*10}")
             self.status_lbl.setStyleSheet(f"color: {self.SUCCESS};")
+            self.pool_lbl.setText(self.key_pool_status())
             
             # Clear and disable input
             self.api_key_input.setText("")
@@ -451,6 +932,55 @@ class AbuseReporterGUI(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save API key:\n{str(e)}")
     
+    def save_key_pool(self):
+        """Save the pooled keys to the .env file (empty clears the pool)."""
+        keys = parse_api_keys(self.pool_keys_input.text())
+        for index, key in enumerate(keys, 1):
+            key_valid, key_error = validate_api_key(key)
+            if not key_valid:
+                QMessageBox.critical(self, "Error", f"Pooled key {index}: {key_error}")
+                return
+        
+        env_file = Path(__file__).parent / '.env'
+        try:
+            self.update_env_file(env_file, API_KEYS_ENV, ",".join(keys))
+        except PermissionError:
+            QMessageBox.critical(self, "Error",
+                f"Permission denied writing to {env_file}\n\n"
+                "Try running the application as administrator.")
+            return
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save key pool:\n{str(e)}")
+            return
+        
+        self.pool_keys = keys
+        self.pool_lbl.setText(self.key_pool_status())
+        QMessageBox.information(self, "✅ Success",
+            f"Key pool saved ({len(keys)} extra keys)\n\nFile: {env_file}\n\n"
+            "Reports are spread across all keys by their remaining quota;\n"
+            "a key rejected (401) or throttled (429) is set aside for a while.")
+    
+    def update_env_file(self, env_file, name, value):
+        """Set one variable in the .env file, keeping the others."""
+        # Read existing .env if it exists
+        env_content = {}
+        if env_file.exists():
+            with open(env_file, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith('#') and '=' in line:
+                        k, v = line.split('=', 1)
+                        env_content[k.strip()] = v.strip()
+        
+        env_content[name] = value
+        
+        # Write back to .env
+        with open(env_file, 'w') as f:
+            f.write("# AbuseIPDB Reporter Configuration\n")
+            f.write("# Keep this file secure - it contains your API key\n\n")
+            for k, v in env_content.items():
+                f.write(f"{k}={v}\n")
+    
     def submit_single(self):
         """Submit single report."""
         ip = self.ip_input.text().strip()
@@ -467,6 +997,15 @@ class AbuseReporterGUI(QMainWindow):
         cat_name = self.category_combo.currentText()
         cat_id = get_category_id(cat_name)
         
+        try:
+            reason = self.get_address_filter().check(pack_ip(ip))
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"Cannot load allowlist:\n{str(e)}")
+            return
+        if reason:
+            QMessageBox.critical(self, "Error", f"{drop_message(ip, reason)} and cannot be reported")
+            return
+        
         if self.dry_run_cb.isChecked():
             self.submit_status.setText("✅ Validation passed (dry-run)")
             self.submit_status.setStyleSheet(f"color: {self.SUCCESS};")
@@ -477,38 +1016,82 @@ class AbuseReporterGUI(QMainWindow):
             QMessageBox.critical(self, "Error", "API key not configured")
             return
         
+        if self.is_busy():
+            return
+        
         try:
             self.submit_status.setText("⏳ Submitting...")
             self.submit_status.setStyleSheet(f"color: {self.WARNING};")
-            QApplication.processEvents()
-            
-            client = AbuseIPDBClient(self.api_key)
-            result = client.submit_report(ip, [cat_id], comment, confidence)
             
-            if result.success:
-                self.submit_status.setText("✅ Report submitted successfully")
-                self.submit_status.setStyleSheet(f"color: {self.SUCCESS};")
-                QMessageBox.information(self, "✅ Success", "Report submitted!")
-                self.ip_input.clear()
-                self.comment_input.clear()
-            else:
-                self.submit_status.setText(f"❌ {result.message}")
-                self.submit_status.setStyleSheet(f"color: {self.ERROR};")
-                QMessageBox.critical(self, "Error", result.message)
+            report = BulkReport(ip, [cat_id], comment, confidence)
+            self.start_worker([report], 1, self.on_single_finished, self.on_single_failed)
         except Exception as e:
-            self.submit_status.setText(f"❌ Error: {str(e)}")
+            self.on_single_failed(str(e))
+    
+    @pyqtSlot(list)
+    def on_single_finished(self, results):
+        """Show the outcome of a single report."""
+        result = results[0]
+        if result.success:
+            self.submit_status.setText("✅ Report submitted successfully")
+            self.submit_status.setStyleSheet(f"color: {self.SUCCESS};")
+            QMessageBox.information(self, "✅ Success", "Report submitted!")
+            self.ip_input.clear()
+            self.comment_input.clear()
+        else:
+            self.submit_status.setText(f"❌ {result.message}")
             self.submit_status.setStyleSheet(f"color: {self.ERROR};")
-            QMessageBox.critical(self, "Error", str(e))
+            QMessageBox.critical(self, "Error", result.message)
+    
+    @pyqtSlot(str)
+    def on_single_failed(self, error):
+        """Show an error raised while submitting a single report."""
+        self.submit_status.setText(f"❌ Error: {error}")
+        self.submit_status.setStyleSheet(f"color: {self.ERROR};")
+        QMessageBox.critical(self, "Error", error)
     
     def submit_bulk(self):
         """Submit bulk reports."""
-        ips = [ip.strip() for ip in self.bulk_ips.toPlainText().split('\n') if ip.strip()]
-        if not ips:
+        lines = [ip.strip() for ip in self.bulk_ips.toPlainText().split('\n') if ip.strip()]
+        if not lines:
             QMessageBox.critical(self, "Error", "Enter at least one IP")
             return
         
-        if not all(validate_ip(ip) for ip in ips):
-            QMessageBox.critical(self, "Error", "Invalid IP in list")
+        # Expand CIDR blocks and a-b ranges into the validator. Every report
+        # gets a row in the results table, so the whole batch is held in
+        # memory: the total is capped at MAX_BULK_ADDRESSES (larger lists
+        # belong in the CLI's streaming --input). Only lines typed as
+        # single addresses are kept, to name the invalid ones
+        errors = []
+        typed = {}    # Position in the expanded stream -> line
+        ranges = {number for number, line in enumerate(lines, 1) if is_ip_range(line)}
+        
+        def addresses():
+            records = expand_records(InputRecord(number, line) for number, line in enumerate(lines, 1))
+            for position, record in enumerate(records):
+                if position >= MAX_BULK_ADDRESSES:
+                    errors.append(
+                        f"More than {MAX_BULK_ADDRESSES} addresses; "
+                        "use the command line (--input) for larger lists"
+                    )
+                    return
+                if record.error:
+                    # Oversized or malformed range: counted invalid, named by its error
+                    errors.append(record.error)
+                    yield None
+                    continue
+                if record.line_number not in ranges:
+                    typed[position] = record.ip
+                yield record.ip
+        
+        ip_batch = validate_ip_batch(addresses())
+        errors.extend(typed[index] for index in ip_batch.errors if index in typed)
+        if errors:
+            shown = "\n".join(errors[:10])
+            more = len(errors) - 10
+            if more > 0:
+                shown += f"\n... and {more} more"
+            QMessageBox.critical(self, "Error", f"Invalid IP in list:\n{shown}")
             return
         
         comment = self.bulk_comment.toPlainText().strip()
@@ -520,34 +1103,277 @@ class AbuseReporterGUI(QMainWindow):
             QMessageBox.critical(self, "Error", "API key not configured")
             return
         
+        if self.is_busy():
+            return
+        
+        if not self.skip_blacklisted:
+            self.submit_filtered_bulk(ip_batch, comment)
+            return
+        
+        # Loading (or refreshing) the snapshot can mean a download; keep it
+        # off the GUI thread and continue once it arrives
+        self.pending_bulk = (ip_batch, comment)
+        self.bulk_status.setText("⏳ Loading blacklist snapshot...")
+        self.bulk_status.setStyleSheet(f"color: {self.WARNING};")
+        self.start_blacklist_worker(self.on_bulk_blacklist_ready, self.on_bulk_blacklist_failed)
+    
+    @pyqtSlot(object, str)
+    def on_bulk_blacklist_ready(self, snapshot, message):
+        """Continue the pending bulk submission with the loaded blacklist."""
+        ip_batch, comment = self.pending_bulk
+        self.pending_bulk = None
+        self.bulk_status.setText("")
+        self.submit_filtered_bulk(ip_batch, comment, snapshot)
+    
+    @pyqtSlot(str)
+    def on_bulk_blacklist_failed(self, error):
+        """Abandon the pending bulk submission when the blacklist cannot be loaded."""
+        self.pending_bulk = None
+        self.bulk_status.setText("")
+        QMessageBox.critical(self, "Error", f"Cannot load allowlist or blacklist:\n{error}")
+    
+    def submit_filtered_bulk(self, ip_batch, comment, blacklist=None):
+        """Filter validated IPs and start the bulk run."""
+        # Never report private, reserved or allowlisted (or, optionally,
+        # already blacklisted) addresses
+        try:
+            address_filter = self.get_address_filter(blacklist)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"Cannot load allowlist or blacklist:\n{str(e)}")
+            return
+        reasons = address_filter.check_many(ip_batch.values)
+        ips = [ip_batch.address(index) for index, reason in enumerate(reasons) if reason is None]
+        filtered = address_filter.summary()
+        if not ips:
+            QMessageBox.critical(self, "Error", f"No reportable IPs left (skipped {filtered})")
+            return
+        
+        queue = None
+        cache = None
         try:
-            self.bulk_progress.setVisible(True)
-            self.bulk_progress.setMaximum(len(ips))
-            
             cat_id = get_category_id(self.bulk_cat.currentText())
             confidence = self.bulk_conf_slider.value()
+            concurrency = self.bulk_conc_slider.value()
             
-            client = AbuseIPDBClient(self.api_key)
-            successful = 0
+            # Journal the run so a crash or kill can be resumed next time
+            queue = SubmissionQueue(Path(__file__).parent / DEFAULT_QUEUE_FILE)
+            pending = self.pending_bulk_entries(queue)
             
-            for i, ip in enumerate(ips, 1):
-                self.bulk_status.setText(f"⏳ Submitting {i}/{len(ips)}...")
-                self.bulk_progress.setValue(i)
-                QApplication.processEvents()
-                
-                result = client.submit_report(ip, [cat_id], comment, confidence)
-                if result.success:
-                    successful += 1
+            # One report per IP, even if it is listed several times or was
+            # left pending by an interrupted run
+            reports = [report for _, report in pending]
+            reports.extend(BulkReport(ip, [cat_id], comment, confidence) for ip in ips)
+            batch = coalesce_reports(reports)
+            merged = len(reports) - len(batch)
             
-            self.bulk_progress.setVisible(False)
-            self.bulk_status.setText(f"✅ Complete: {successful}/{len(ips)} successful")
-            self.bulk_status.setStyleSheet(f"color: {self.SUCCESS};")
-            QMessageBox.information(self, "✅ Done", f"Submitted {successful}/{len(ips)}")
+            # Skip IPs reported within the last 15 minutes
+            cache = RecentReportCache(Path(__file__).parent / DEFAULT_CACHE_FILE)
+            fresh = [report for report in batch if cache.check(report.ip)]
+            suppressed = len(batch) - len(fresh)
+            
+            entries = [(queue.enqueue(report), report) for report in fresh]
+            
+            # Pending reports are journaled again above (merged where needed)
+            # or were duplicates; either way their old entries are done
+            queued_ips = {report.ip for report in fresh}
+            for entry_id, report in pending:
+                queue.complete(entry_id, ReportResult(
+                    success=True,
+                    message=("Queued again with a new bulk run" if report.ip in queued_ips
+                             else "Already reported within the last 15 minutes"),
+                    attempts=0
+                ))
+            queue.flush()
+            
+            self.results_model.set_entries(entries)
+            rows = list(range(len(entries)))
+            run = BulkRun(queue, cache, entries, rows, merged, suppressed, filtered)
+            self.start_bulk_run(run, concurrency)
         except Exception as e:
-            self.bulk_progress.setVisible(False)
-            self.bulk_status.setText(f"❌ Error: {str(e)}")
-            self.bulk_status.setStyleSheet(f"color: {self.ERROR};")
-            QMessageBox.critical(self, "Error", str(e))
+            if self.bulk_run is None:
+                if cache is not None:
+                    cache.save()
+                if queue is not None:
+                    queue.close()
+            self.on_bulk_failed(str(e))
+    
+    def retry_failed(self):
+        """Resubmit only the failed and cancelled reports in the results table."""
+        if self.is_busy():
+            return
+        
+        numbers = self.results_model.retryable_rows()
+        if not numbers:
+            QMessageBox.information(self, "Retry Failed", "No failed reports to retry")
+            return
+        
+        if not self.api_key:
+            QMessageBox.critical(self, "Error", "API key not configured")
+            return
+        
+        queue = None
+        cache = None
+        try:
+            # Failed reports keep their journal entries, so a retry reuses them
+            queue = SubmissionQueue(Path(__file__).parent / DEFAULT_QUEUE_FILE)
+            cache = RecentReportCache(Path(__file__).parent / DEFAULT_CACHE_FILE)
+            
+            rows = []
+            entries = []
+            for number in numbers:
+                row = self.results_model.rows[number]
+                if cache.check(row.report.ip):
+                    rows.append(number)
+                    entries.append((row.entry_id, row.report))
+            suppressed = len(numbers) - len(rows)
+            
+            self.results_model.set_pending(rows)
+            run = BulkRun(queue, cache, entries, rows, suppressed=suppressed)
+            self.start_bulk_run(run, self.bulk_conc_slider.value())
+        except Exception as e:
+            if self.bulk_run is None:
+                if cache is not None:
+                    cache.save()
+                if queue is not None:
+                    queue.close()
+            self.on_bulk_failed(str(e))
+    
+    def start_bulk_run(self, run, concurrency):
+        """Show progress for a bulk run and start it on the worker thread."""
+        self.bulk_run = run
+        reports = [report for _, report in run.entries]
+        
+        self.bulk_progress.setVisible(True)
+        self.bulk_progress.setMaximum(len(reports))
+        self.bulk_progress.setValue(0)
+        self.bulk_cancel_btn.setVisible(True)
+        self.bulk_cancel_btn.setEnabled(True)
+        self.bulk_status.setText(f"⏳ Submitting {len(reports)} reports...")
+        self.bulk_status.setStyleSheet(f"color: {self.WARNING};")
+        
+        self.start_worker(
+            reports, concurrency,
+            self.on_bulk_finished, self.on_bulk_failed, self.on_bulk_result
+        )
+    
+    def apply_results_filter(self):
+        """Filter the results table by the selected status and IP text."""
+        status = self.results_status_filter.currentText()
+        self.results_proxy.set_filters(
+            None if status == "All" else status,
+            self.results_ip_filter.text()
+        )
+    
+    def export_results(self):
+        """Save the rows currently shown in the results table as CSV."""
+        if not self.results_proxy.rowCount():
+            QMessageBox.information(self, "Export CSV", "No results to export")
+            return
+        
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Results", str(Path.home() / "abuse_reports.csv"), "CSV files (*.csv)"
+        )
+        if not path:
+            return
+        
+        try:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(ResultsTableModel.COLUMNS)
+                for proxy_row in range(self.results_proxy.rowCount()):
+                    source = self.results_proxy.mapToSource(self.results_proxy.index(proxy_row, 0))
+                    row = self.results_model.rows[source.row()]
+                    writer.writerow(self.results_model.display_values(row))
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to export results:\n{str(e)}")
+            return
+        
+        self.bulk_status.setText(f"💾 Exported {self.results_proxy.rowCount()} rows to {path}")
+    
+    def cancel_bulk(self):
+        """Stop the running bulk submission after in-flight reports finish."""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.bulk_cancel_btn.setEnabled(False)
+            self.bulk_status.setText("⏳ Cancelling - waiting for reports already sent...")
+    
+    @pyqtSlot(int, object, object)
+    def on_bulk_result(self, index, report, result):
+        """Record one finished report and update progress."""
+        run = self.bulk_run
+        run.done += 1
+        run.queue.complete(run.entries[index][0], result)
+        self.results_model.set_result(run.rows[index], result)
+        if result.success:
+            run.successful += 1
+            line = f"✅ {report.ip}"
+        else:
+            run.cache.forget(report.ip)
+            if result.message == CANCELLED_MESSAGE:
+                run.cancelled += 1
+            line = f"❌ {report.ip}: {result.message}"
+        
+        cancelling = self.worker is not None and self.worker.cancel_event.is_set()
+        if not cancelling:
+            self.bulk_status.setText(f"⏳ Submitted {run.done}/{len(run.entries)} - {line}")
+        self.bulk_progress.setValue(run.done)
+    
+    @pyqtSlot(list)
+    def on_bulk_finished(self, results):
+        """Summarize a completed (or cancelled) bulk run."""
+        run = self.bulk_run
+        self.finish_bulk_run()
+        
+        summary = f"{run.successful}/{len(results)} successful"
+        if run.merged:
+            summary += f", {run.merged} repeated IPs merged"
+        if run.suppressed:
+            summary += f", {run.suppressed} duplicates suppressed"
+        if run.filtered:
+            summary += f", skipped {run.filtered}"
+        if run.cancelled:
+            summary += f", {run.cancelled} cancelled (kept for resume)"
+        
+        title = "⏹ Cancelled" if run.cancelled else "✅ Done"
+        self.bulk_status.setText(f"{title}: {summary}")
+        self.bulk_status.setStyleSheet(f"color: {self.WARNING if run.cancelled else self.SUCCESS};")
+        QMessageBox.information(self, title, f"Submitted {summary}")
+    
+    @pyqtSlot(str)
+    def on_bulk_failed(self, error):
+        """Show an error raised during a bulk run."""
+        self.finish_bulk_run()
+        self.bulk_status.setText(f"❌ Error: {error}")
+        self.bulk_status.setStyleSheet(f"color: {self.ERROR};")
+        QMessageBox.critical(self, "Error", error)
+    
+    def finish_bulk_run(self):
+        """Persist the journal and dedup cache of the current bulk run."""
+        self.bulk_progress.setVisible(False)
+        self.bulk_cancel_btn.setVisible(False)
+        run = self.bulk_run
+        self.bulk_run = None
+        if run is not None:
+            run.cache.save()
+            run.queue.close()
+        self.pool_lbl.setText(self.key_pool_status())
+    
+    def pending_bulk_entries(self, queue):
+        """Offer to resume reports left pending by an interrupted bulk run."""
+        pending = queue.pending_count()
+        if not pending:
+            return []
+        
+        answer = QMessageBox.question(
+            self, "Resume Bulk Run",
+            f"{pending} reports from an interrupted bulk run are still pending.\n\n"
+            "Submit them together with this batch?"
+        )
+        if answer == QMessageBox.StandardButton.Yes:
+            return [(entry_id, report) for entry_id, _, report in queue.pending()]
+        
+        queue.reset()
+        return []
 
 
 def main():
@@ -0,0 +1,212 @@
+"""Streaming report ingestion from files or stdin."""
+
+import csv
+import json
+import sys
+from dataclasses import dataclass, replace
+from itertools import islice
+from typing import Iterable, Iterator, Optional, TextIO, Union
+
+from iprange import DEFAULT_MAX_EXPANSION, expand_ip_range, is_ip_range
+from logparse import LOG_FORMATS, parse_log
+
+
+INPUT_FORMATS = ("auto", "csv", "jsonl", "plain") + LOG_FORMATS
+
+# Records validated together when reading from a file
+RECORD_BATCH_SIZE = 1024
+
+# Positional CSV columns used when the file has no header row
+CSV_COLUMNS = ("ip", "categories", "comment", "confidence")
+
+
+@dataclass
+class InputRecord:
+    """One report read from an input stream (fields not yet validated)."""
+    line_number: int
+    ip: Optional[str]
+    categories: Optional[str] = None
+    comment: Optional[str] = None
+    confidence: Optional[Union[int, str]] = None
+    error: Optional[str] = None
+    partial: bool = False    # More addresses from the same line's range follow
+
+
+def open_input(path: str) -> TextIO:
+    """
+    Open an input file for streaming, or stdin for "-".
+    
+    Args:
+        path: File path or "-" for stdin
+        
+    Returns:
+        Text stream to read records from
+    """
+    if path == "-":
+        return sys.stdin
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def read_records(stream: TextIO, input_format: str = "auto") -> Iterator[InputRecord]:
+    """
+    Lazily parse one report per line from a text stream.
+    
+    Supported formats:
+        plain: one IP address (or CIDR block / "a-b" range) per line
+        csv:   ip,categories,comment,confidence (optional header row;
+               categories separated by ";" or quoted with ",")
+        jsonl: {"ip": ..., "categories": ..., "comment": ..., "confidence": ...}
+        auto:  detect the format of each line
+        sshd, nginx, fail2ban: attack events from log files (see logparse);
+               categories and comment come from the matched pattern and
+               lines without an event are skipped
+               
+    Blank lines and lines starting with "#" are skipped. Only the current
+    line is held in memory, so arbitrarily large inputs are fine.
+    
+    Args:
+        stream: Text stream to read from
+        input_format: One of INPUT_FORMATS
+        
+    Yields:
+        InputRecord objects in input order
+    """
+    if input_format in LOG_FORMATS:
+        for line_number, ip, categories, comment in parse_log(stream, input_format):
+            yield InputRecord(line_number=line_number, ip=ip, categories=categories, comment=comment)
+        return
+    
+    csv_columns = CSV_COLUMNS
+    seen_csv_row = False
+    
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        
+        line_format = input_format
+        if line_format == "auto":
+            line_format = _detect_format(line)
+        
+        if line_format == "jsonl":
+            yield _parse_json_line(line, line_number)
+        elif line_format == "csv":
+            fields = next(csv.reader([line]))
+            if not seen_csv_row and fields and fields[0].strip().lower() == "ip":
+                # Header row: map columns by name instead of position
+                csv_columns = tuple(field.strip().lower() for field in fields)
+                seen_csv_row = True
+                continue
+            seen_csv_row = True
+            yield record_from_mapping(dict(zip(csv_columns, fields)), line_number)
+        else:
+            yield InputRecord(line_number=line_number, ip=line)
+
+
+def expand_records(
+    records: Iterable[InputRecord],
+    max_addresses: int = DEFAULT_MAX_EXPANSION
+) -> Iterator[InputRecord]:
+    """
+    Expand records whose IP is a CIDR block or "a-b" range.
+    
+    Each address becomes its own record with the line's other fields.
+    Expansion is lazy, so a /16 is never held in memory. Every record but
+    the last one from a range has ``partial`` set. Ranges larger than
+    ``max_addresses`` become a single record with an error.
+    
+    Args:
+        records: Records from read_records()
+        max_addresses: Largest range expanded
+        
+    Yields:
+        InputRecord objects, one per address
+    """
+    for record in records:
+        if record.error or not record.ip or not is_ip_range(record.ip):
+            yield record
+            continue
+        
+        try:
+            addresses = expand_ip_range(record.ip, max_addresses)
+        except ValueError as e:
+            yield replace(record, error=str(e))
+            continue
+        
+        # Hold one address back so the last one can be marked complete
+        previous = None
+        for address in addresses:
+            if previous is not None:
+                yield replace(record, ip=previous, partial=True)
+            previous = address
+        if previous is not None:
+            yield replace(record, ip=previous)
+
+
+def batch_records(records: Iterable[InputRecord], size: int = RECORD_BATCH_SIZE) -> Iterator[list[InputRecord]]:
+    """
+    Group records into lists of up to ``size`` for batch validation.
+    
+    Args:
+        records: Records from read_records()
+        size: Maximum records per batch (1 keeps streaming latency minimal)
+        
+    Yields:
+        Lists of InputRecord objects in input order
+    """
+    records = iter(records)
+    while True:
+        batch = list(islice(records, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _detect_format(line: str) -> str:
+    """Guess the format of a single input line."""
+    if line.startswith("{"):
+        return "jsonl"
+    if "," in line:
+        return "csv"
+    return "plain"
+
+
+def _parse_json_line(line: str, line_number: int) -> InputRecord:
+    """Parse a JSONL line into an InputRecord."""
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError:
+        return InputRecord(line_number=line_number, ip=None, error="Invalid JSON")
+    
+    if not isinstance(data, dict):
+        return InputRecord(line_number=line_number, ip=None, error="Expected a JSON object")
+    
+    return record_from_mapping(data, line_number)
+
+
+def record_from_mapping(data: dict, line_number: int) -> InputRecord:
+    """Build an InputRecord from a CSV row or JSON object."""
+    categories = data.get("categories")
+    if isinstance(categories, list):
+        categories = ",".join(str(category) for category in categories)
+    elif categories is not None:
+        categories = str(categories).replace(";", ",")
+    
+    confidence = data.get("confidence")
+    if isinstance(confidence, str):
+        confidence = confidence.strip()
+        if confidence.isdigit():
+            confidence = int(confidence)
+        elif not confidence:
+            confidence = None
+    
+    ip = data.get("ip")
+    comment = data.get("comment")
+    
+    return InputRecord(
+        line_number=line_number,
+        ip=str(ip).strip() if ip is not None else None,
+        categories=categories or None,
+        comment=comment or None,
+        confidence=confidence
+    )
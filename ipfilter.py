@@ -0,0 +1,244 @@
+"""Pre-submission filtering of reserved and allowlisted addresses."""
+
+from bisect import bisect_right
+from collections import Counter
+from ipaddress import ip_network
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional, Union
+
+from validators import IPV4_MAPPED_PREFIX
+
+if TYPE_CHECKING:
+    from blacklist import BlacklistSnapshot
+
+
+DEFAULT_ALLOWLIST_FILE = "allowlist.txt"
+ALLOWLISTED = "allowlisted"
+BLACKLISTED = "blacklisted"
+
+# Ranges AbuseIPDB will not accept reports for (IANA special-purpose registries)
+RESERVED_NETWORKS = (
+    ("0.0.0.0/8", "unspecified"),
+    ("10.0.0.0/8", "private"),
+    ("100.64.0.0/10", "shared"),
+    ("127.0.0.0/8", "loopback"),
+    ("169.254.0.0/16", "link-local"),
+    ("172.16.0.0/12", "private"),
+    ("192.0.0.0/24", "reserved"),
+    ("192.0.2.0/24", "documentation"),
+    ("192.88.99.0/24", "reserved"),
+    ("192.168.0.0/16", "private"),
+    ("198.18.0.0/15", "benchmarking"),
+    ("198.51.100.0/24", "documentation"),
+    ("203.0.113.0/24", "documentation"),
+    ("224.0.0.0/4", "multicast"),
+    ("240.0.0.0/4", "reserved"),
+    ("::/128", "unspecified"),
+    ("::1/128", "loopback"),
+    ("64:ff9b:1::/48", "private"),
+    ("100::/64", "reserved"),
+    ("2001:2::/48", "benchmarking"),
+    ("2001:db8::/32", "documentation"),
+    ("3fff::/20", "documentation"),
+    ("fc00::/7", "private"),
+    ("fe80::/10", "link-local"),
+    ("fec0::/10", "link-local"),
+    ("ff00::/8", "multicast"),
+)
+
+
+class PrefixIndex:
+    """
+    Sorted, non-overlapping address intervals with a label each.
+    
+    Networks are converted to [first, last] ranges of packed addresses
+    (see validators.pack_ip) and merged, so a lookup is one binary search
+    over a flat list of ints regardless of how many networks were added.
+    Where networks overlap, the one starting lower keeps the overlap
+    (ties go to the one added first).
+    """
+    
+    def __init__(self, networks: Iterable[tuple[str, str]] = ()):
+        """
+        Build the index.
+        
+        Args:
+            networks: (CIDR or single address, label) pairs
+        """
+        intervals = []
+        for order, (network, label) in enumerate(networks):
+            first, last = network_range(network)
+            intervals.append((first, order, last, label))
+        intervals.sort()
+        
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        self._labels: list[str] = []
+        
+        for first, _, last, label in intervals:
+            if self._ends and first <= self._ends[-1] + 1:
+                if last <= self._ends[-1]:
+                    continue
+                if label == self._labels[-1]:
+                    self._ends[-1] = last
+                    continue
+                first = self._ends[-1] + 1
+            self._starts.append(first)
+            self._ends.append(last)
+            self._labels.append(label)
+    
+    def __len__(self) -> int:
+        return len(self._starts)
+    
+    def lookup(self, value: int) -> Optional[str]:
+        """
+        Return the label of the interval containing a packed address.
+        
+        Args:
+            value: Packed address
+            
+        Returns:
+            Label, or None if the address is in no interval
+        """
+        i = bisect_right(self._starts, value) - 1
+        if i >= 0 and value <= self._ends[i]:
+            return self._labels[i]
+        return None
+
+
+class AddressFilter:
+    """
+    Drops reserved and allowlisted addresses before they are reported.
+    
+    Built-in special-purpose ranges (private, loopback, link-local,
+    documentation, multicast, ...) are always dropped; networks from a
+    user allowlist (our own infrastructure) are dropped as "allowlisted".
+    With a blacklist snapshot, addresses AbuseIPDB already lists are
+    dropped as "blacklisted". Drop counts are kept per reason.
+    """
+    
+    def __init__(
+        self,
+        allowlist: Iterable[str] = (),
+        blacklist: Optional["BlacklistSnapshot"] = None
+    ):
+        """
+        Initialize the filter.
+        
+        Args:
+            allowlist: CIDRs or single addresses never to report
+            blacklist: Optional snapshot of already-blacklisted addresses
+        """
+        networks = list(RESERVED_NETWORKS)
+        networks.extend((network, ALLOWLISTED) for network in allowlist)
+        self.index = PrefixIndex(networks)
+        self.blacklist = blacklist
+        self.dropped: Counter = Counter()
+    
+    @classmethod
+    def from_allowlist_file(
+        cls,
+        path: Optional[Union[str, Path]],
+        blacklist: Optional["BlacklistSnapshot"] = None
+    ) -> "AddressFilter":
+        """
+        Create a filter using an allowlist file (None for built-ins only).
+        
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If a line is not a valid CIDR or address
+        """
+        return cls(load_allowlist(path) if path else (), blacklist)
+    
+    def check(self, value: int) -> Optional[str]:
+        """
+        Check a packed address, counting it if it is dropped.
+        
+        Args:
+            value: Packed address from pack_ip() or validate_ip_batch()
+            
+        Returns:
+            Reason the address must not be reported, or None if it may be
+        """
+        reason = self._lookup(value)
+        if reason is not None:
+            self.dropped[reason] += 1
+        return reason
+    
+    def check_many(self, values: Iterable[int]) -> list[Optional[str]]:
+        """
+        Check many packed addresses at once.
+        
+        Args:
+            values: Packed addresses
+            
+        Returns:
+            Drop reason (or None) for each address, in input order
+        """
+        lookup = self._lookup
+        reasons = [lookup(value) for value in values]
+        self.dropped.update(reason for reason in reasons if reason is not None)
+        return reasons
+    
+    def summary(self) -> str:
+        """Return the drop counts as text, e.g. "3 private, 1 allowlisted"."""
+        return ", ".join(f"{count} {reason}" for reason, count in self.dropped.most_common())
+    
+    def _lookup(self, value: int) -> Optional[str]:
+        """Return the drop reason of a packed address without counting it."""
+        reason = self.index.lookup(value)
+        if reason is None and self.blacklist is not None and value in self.blacklist:
+            return BLACKLISTED
+        return reason
+
+
+def drop_message(ip: str, reason: str) -> str:
+    """Explain why an address is not reported."""
+    if reason == ALLOWLISTED:
+        return f"{ip} is on the allowlist"
+    if reason == BLACKLISTED:
+        return f"{ip} is already on the AbuseIPDB blacklist"
+    return f"{ip} is a {reason} address"
+
+
+def network_range(network: str) -> tuple[int, int]:
+    """
+    Return the first and last packed address of a CIDR or single address.
+    
+    Raises:
+        ValueError: If ``network`` is not a valid CIDR or address
+    """
+    net = ip_network(network.strip(), strict=False)
+    first = int(net.network_address)
+    last = int(net.broadcast_address)
+    if net.version == 4:
+        return IPV4_MAPPED_PREFIX | first, IPV4_MAPPED_PREFIX | last
+    return first, last
+
+
+def load_allowlist(path: Union[str, Path]) -> list[str]:
+    """
+    Read an allowlist file: one CIDR or address per line, "#" comments.
+    
+    Args:
+        path: Allowlist file
+        
+    Returns:
+        List of networks, validated
+        
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If a line is not a valid CIDR or address
+    """
+    networks = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            network = line.split("#", 1)[0].strip()
+            if not network:
+                continue
+            try:
+                network_range(network)
+            except ValueError:
+                raise ValueError(f"{path}:{line_number}: invalid network: {network}") from None
+            networks.append(network)
+    return networks
@@ -0,0 +1,103 @@
+"""Lazy expansion of CIDR blocks and address ranges."""
+
+import socket
+from ipaddress import IPv4Address, IPv6Address, ip_address, ip_network
+from typing import Iterator
+
+
+DEFAULT_MAX_EXPANSION = 65536    # Largest range expanded (a /16)
+
+
+def is_ip_range(text: str) -> bool:
+    """Return True if ``text`` looks like a CIDR block or an "a-b" range."""
+    return "/" in text or "-" in text
+
+
+def ip_range_bounds(text: str) -> tuple[int, int, int]:
+    """
+    Parse a CIDR block or "a-b" range into integer bounds.
+    
+    Supported forms:
+        192.0.2.0/24             all hosts (IPv4 network and broadcast
+                                 addresses are skipped for prefixes < /31)
+        2001:db8::/120           every address
+        192.0.2.10-192.0.2.20    inclusive range
+        192.0.2.10-20            last-octet shorthand (IPv4 only)
+        
+    Args:
+        text: Range to parse
+        
+    Returns:
+        Tuple of (ip_version, first, last) with inclusive integer bounds
+        
+    Raises:
+        ValueError: If the range is malformed or empty
+    """
+    text = text.strip()
+    if "/" in text:
+        try:
+            network = ip_network(text, strict=False)
+        except ValueError:
+            raise ValueError(f"Invalid CIDR block: {text}") from None
+        first = int(network.network_address)
+        last = int(network.broadcast_address)
+        if network.version == 4 and network.prefixlen < 31:
+            first, last = first + 1, last - 1
+        return network.version, first, last
+    
+    start_text, _, end_text = text.partition("-")
+    start_text, end_text = start_text.strip(), end_text.strip()
+    try:
+        start = ip_address(start_text)
+        if end_text.isdigit() and start.version == 4:
+            if int(end_text) > 255:
+                raise ValueError(end_text)
+            end = IPv4Address(int(start) & 0xFFFFFF00 | int(end_text))
+        else:
+            end = ip_address(end_text)
+    except ValueError:
+        raise ValueError(f"Invalid address range: {text}") from None
+    
+    if start.version != end.version:
+        raise ValueError(f"Range mixes IPv4 and IPv6: {text}")
+    if int(end) < int(start):
+        raise ValueError(f"Range end is before its start: {text}")
+    return start.version, int(start), int(end)
+
+
+def expand_ip_range(text: str, max_addresses: int = DEFAULT_MAX_EXPANSION) -> Iterator[str]:
+    """
+    Expand a CIDR block or "a-b" range into addresses, lazily.
+    
+    The range is parsed and checked against ``max_addresses`` immediately,
+    so errors surface before anything is yielded; addresses are then
+    generated one at a time and never held in a list.
+    
+    Args:
+        text: Range to expand (see ip_range_bounds())
+        max_addresses: Largest number of addresses allowed
+        
+    Returns:
+        Iterator over the addresses as strings, in ascending order
+        
+    Raises:
+        ValueError: If the range is malformed or larger than ``max_addresses``
+    """
+    version, first, last = ip_range_bounds(text)
+    size = last - first + 1
+    if size > max_addresses:
+        raise ValueError(
+            f"Range {text.strip()} has {size} addresses (limit {max_addresses})"
+        )
+    return _iter_addresses(version, first, last)
+
+
+def _iter_addresses(version: int, first: int, last: int) -> Iterator[str]:
+    """Yield addresses from ``first`` to ``last`` inclusive."""
+    if version == 4:
+        inet_ntoa = socket.inet_ntoa
+        for value in range(first, last + 1):
+            yield inet_ntoa(value.to_bytes(4, "big"))
+    else:
+        for value in range(first, last + 1):
+            yield str(IPv6Address(value))
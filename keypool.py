@@ -0,0 +1,218 @@
+"""Pool of AbuseIPDB API keys, balanced by each key's remaining quota."""
+
+import os
+import re
+import threading
+import time
+from typing import Any, Iterable, Mapping, Optional
+
+from ratelimit import RateLimiter, DEFAULT_RATE, DEFAULT_BURST, DEFAULT_MAX_WAIT
+from validators import validate_api_key
+
+
+API_KEY_ENV = "ABUSEIPDB_API_KEY"
+API_KEYS_ENV = "ABUSEIPDB_API_KEYS"    # Extra keys, separated by commas or whitespace
+UNAUTHORIZED_BENCH = 60 * 60           # A rejected key sits out for an hour
+THROTTLED_BENCH = 60.0                 # Shortest time a throttled key sits out
+
+
+def parse_api_keys(text: Optional[str]) -> list[str]:
+    """Split a comma- or whitespace-separated key list, dropping duplicates."""
+    return list(dict.fromkeys(key for key in re.split(r"[\s,]+", text or "") if key))
+
+
+def api_keys_from_env(environ: Optional[Mapping[str, str]] = None) -> list[str]:
+    """
+    Return the configured keys: ABUSEIPDB_API_KEY first, then every key
+    listed in ABUSEIPDB_API_KEYS.
+    """
+    environ = os.environ if environ is None else environ
+    return parse_api_keys(f"{environ.get(API_KEY_ENV, '')},{environ.get(API_KEYS_ENV, '')}")
+
+
+class PooledKey:
+    """One key of a KeyPool: its rate limiters, load and health."""
+    
+    __slots__ = ("key", "limiters", "in_flight", "benched_until", "bench_reason", "last_used")
+    
+    def __init__(self, key: str):
+        self.key = key
+        self.limiters: dict[str, RateLimiter] = {}    # One per endpoint, as quotas are
+        self.in_flight = 0
+        self.benched_until = 0.0
+        self.bench_reason: Optional[str] = None
+        self.last_used = 0
+    
+    @property
+    def label(self) -> str:
+        """Short, non-secret name of the key for logs and status lines."""
+        return f"{self.key[:6]}..."
+
+
+class KeyPool:
+    """
+    Thread-safe set of API keys that requests are spread across.
+    
+    Every key has its own RateLimiter per endpoint, fed by that key's
+    X-RateLimit-* headers. acquire() picks the key with the most quota
+    left on the endpoint (the least busy, least recently used one while
+    quotas are unknown), so several accounts' daily limits add up. A key
+    answered with 401 or 429 is benched: 401 for UNAUTHORIZED_BENCH
+    seconds, 429 until its quota resets (or Retry-After passes), but at
+    least THROTTLED_BENCH seconds. Benched keys are only used when no
+    other key is left.
+    """
+    
+    def __init__(
+        self,
+        keys: Iterable[str],
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        max_wait: float = DEFAULT_MAX_WAIT
+    ):
+        """
+        Initialize the pool.
+        
+        Args:
+            keys: API keys (duplicates are ignored)
+            rate: Sustained requests per second, per key and endpoint
+            burst: Requests allowed back-to-back, per key and endpoint
+            max_wait: Maximum seconds a request waits for its key's limiter
+            
+        Raises:
+            ValueError: If no key is given
+        """
+        self._keys = [PooledKey(key) for key in dict.fromkeys(keys)]
+        if not self._keys:
+            raise ValueError("A key pool needs at least one API key")
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self._uses = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    @property
+    def keys(self) -> list[str]:
+        """The pooled API keys, in configuration order."""
+        return [pooled.key for pooled in self._keys]
+    
+    def validate(self) -> tuple[bool, Optional[str]]:
+        """Check the format of every key, like validators.validate_api_key."""
+        for index, pooled in enumerate(self._keys, 1):
+            key_valid, key_error = validate_api_key(pooled.key)
+            if not key_valid:
+                return False, f"{key_error} (key {index} of {len(self._keys)})"
+        return True, None
+    
+    def acquire(self, endpoint: str) -> tuple[PooledKey, RateLimiter]:
+        """
+        Pick the key for one request to ``endpoint``.
+        
+        Every acquire() must be followed by exactly one release().
+        
+        Returns:
+            Tuple of (key, the key's limiter for the endpoint)
+        """
+        with self._lock:
+            now = time.monotonic()
+            active = []
+            for pooled in self._keys:
+                if pooled.benched_until and now >= pooled.benched_until:
+                    pooled.benched_until = 0.0
+                    pooled.bench_reason = None
+                if not pooled.benched_until:
+                    active.append(pooled)
+            
+            if active:
+                chosen = max(active, key=lambda pooled: self._score(pooled, endpoint))
+            else:
+                chosen = min(self._keys, key=lambda pooled: pooled.benched_until)
+            
+            self._uses += 1
+            chosen.last_used = self._uses
+            chosen.in_flight += 1
+            return chosen, self._limiter(chosen, endpoint)
+    
+    def release(self, pooled: PooledKey, endpoint: str, status_code: Optional[int]) -> None:
+        """
+        Record the outcome of a request started with acquire(), benching
+        the key on 401 or 429. Call it after the limiter's update().
+        
+        Args:
+            pooled: Key returned by acquire()
+            endpoint: Endpoint passed to acquire()
+            status_code: HTTP status of the response, or None if none arrived
+        """
+        with self._lock:
+            pooled.in_flight = max(0, pooled.in_flight - 1)
+            if status_code == 401:
+                self._bench(pooled, UNAUTHORIZED_BENCH, "rejected (401)")
+            elif status_code == 429:
+                wait = self._limiter(pooled, endpoint).available_in()
+                self._bench(pooled, max(wait, THROTTLED_BENCH), "throttled (429)")
+    
+    def active_count(self) -> int:
+        """Number of keys not currently benched."""
+        now = time.monotonic()
+        with self._lock:
+            return sum(1 for pooled in self._keys if pooled.benched_until <= now)
+    
+    def status(self) -> list[dict[str, Any]]:
+        """Return one dict per key: label, per-endpoint quota and bench state."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "key": pooled.label,
+                    "remaining": {
+                        endpoint: limiter.remaining
+                        for endpoint, limiter in pooled.limiters.items()
+                        if limiter.remaining is not None
+                    },
+                    "in_flight": pooled.in_flight,
+                    "benched": pooled.bench_reason if pooled.benched_until > now else None,
+                    "benched_for": max(0.0, pooled.benched_until - now),
+                }
+                for pooled in self._keys
+            ]
+    
+    def summary(self) -> str:
+        """Describe every key in one line, e.g. for a run summary."""
+        parts = []
+        for entry in self.status():
+            text = entry["key"]
+            if entry["remaining"]:
+                text += " " + ", ".join(
+                    f"{remaining} {endpoint} left" for endpoint, remaining in sorted(entry["remaining"].items())
+                )
+            if entry["benched"]:
+                text += f" ({entry['benched']}, back in {entry['benched_for'] / 60:.0f} min)"
+            parts.append(text)
+        return f"{len(parts)} keys: " + "; ".join(parts)
+    
+    def _score(self, pooled: PooledKey, endpoint: str) -> tuple[float, int, int]:
+        """Sort key of an active key: quota left, then idleness."""
+        limiter = pooled.limiters.get(endpoint)
+        remaining = limiter.remaining if limiter is not None else None
+        return (
+            float("inf") if remaining is None else remaining,
+            -pooled.in_flight,
+            -pooled.last_used
+        )
+    
+    def _limiter(self, pooled: PooledKey, endpoint: str) -> RateLimiter:
+        """Return (creating on first use) the key's limiter for an endpoint."""
+        limiter = pooled.limiters.get(endpoint)
+        if limiter is None:
+            limiter = pooled.limiters[endpoint] = RateLimiter(self.rate, self.burst, self.max_wait)
+        return limiter
+    
+    def _bench(self, pooled: PooledKey, seconds: float, reason: str) -> None:
+        """Take a key out of rotation (never shortening an existing bench)."""
+        until = time.monotonic() + seconds
+        if until > pooled.benched_until:
+            pooled.benched_until = until
+            pooled.bench_reason = reason
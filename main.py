@@ -1,36 +1,48 @@
 """AbuseIPDB CLI tool for submitting abuse reports."""
 
 import argparse
-import os
+import signal
 import sys
 import json
-from typing import Optional
+import threading
+import time
+from collections import deque
+from itertools import chain
+from typing import Optional, Union
 from pathlib import Path
 
-# Load environment variables from .env file
-from dotenv import load_dotenv
-
-# Multi-location .env discovery for better portability
-# Especially useful for exe distribution where .env might be in different locations
-env_paths = [
-    Path.cwd() / '.env',              # Current working directory (exe users)
-    Path(__file__).parent / '.env',   # Script/exe directory (development)
-]
-for env_path in env_paths:
-    if env_path.exists():
-        load_dotenv(env_path)
-        break
-else:
-    load_dotenv()  # Fallback to environment variables only
-
 from categories import validate_categories, get_category_id
 from validators import (
     validate_ip,
+    validate_ip_batch,
+    pack_ip,
+    unpack_ip,
+    INVALID_IP,
     validate_confidence,
     validate_comment,
+    validate_concurrency,
     validate_api_key
 )
-from client import AbuseIPDBClient
+from keypool import KeyPool, api_keys_from_env
+from client import AbuseIPDBClient, CheckResult, ReportResult, DEFAULT_MAX_AGE_DAYS
+from bulk import (
+    BulkReport, submit_bulk, iter_bulk, can_use_bulk_endpoint,
+    BULK_ENDPOINT_THRESHOLD, DEFAULT_CONCURRENCY, MAX_CONCURRENCY
+)
+from ingest import (
+    INPUT_FORMATS, RECORD_BATCH_SIZE, InputRecord,
+    open_input, read_records, expand_records, batch_records
+)
+from iprange import DEFAULT_MAX_EXPANSION
+from submission_queue import SubmissionQueue, DEFAULT_QUEUE_FILE
+from dedup import RecentReportCache, DEFAULT_CACHE_FILE
+from coalesce import CoalescedReport, ReportCoalescer, coalesce_reports, DEFAULT_WINDOW
+from follow import FileTailer, DEFAULT_POLL_INTERVAL
+from ipfilter import AddressFilter, DEFAULT_ALLOWLIST_FILE, drop_message
+from reputation import ReputationCache, DEFAULT_CHECK_CACHE_FILE, DEFAULT_CHECK_TTL
+from blacklist import BlacklistSnapshot, refresh_blacklist, DEFAULT_BLACKLIST_FILE, DEFAULT_REFRESH_INTERVAL
+from results import ResultWriter, OUTPUT_FORMATS, OUTPUT_JSONL, OUTPUT_TEXT
+from metrics import InMemoryMetrics, MetricsReporter, print_summary, DEFAULT_SUMMARY_INTERVAL
 from ui import (
     print_banner,
     print_menu,
@@ -53,6 +65,57 @@ from ui import (
 )
 
 
+def load_environment() -> None:
+    """
+    Load environment variables from the first .env file found.
+    
+    Only the code paths that need the API key call this, so --help,
+    --list-categories and --dry-run skip the dotenv import and the
+    file search.
+    """
+    from dotenv import load_dotenv
+    
+    # Multi-location .env discovery for better portability
+    # Especially useful for exe distribution where .env might be in different locations
+    env_paths = [
+        Path.cwd() / '.env',              # Current working directory (exe users)
+        Path(__file__).parent / '.env',   # Script/exe directory (development)
+    ]
+    for env_path in env_paths:
+        if env_path.exists():
+            load_dotenv(env_path)
+            break
+    else:
+        load_dotenv()  # Fallback to environment variables only
+
+
+def get_api_key() -> Optional[Union[str, KeyPool]]:
+    """
+    Return ABUSEIPDB_API_KEY after loading the .env file.
+    
+    When ABUSEIPDB_API_KEYS lists further keys, all of them are returned
+    as one KeyPool that spreads requests across the accounts.
+    """
+    load_environment()
+    keys = api_keys_from_env()
+    if len(keys) > 1:
+        return KeyPool(keys)
+    return keys[0] if keys else None
+
+
+def validate_api_key_setting(api_key: Optional[Union[str, KeyPool]]) -> tuple[bool, Optional[str]]:
+    """Validate the key returned by get_api_key(), or every key of a pool."""
+    if isinstance(api_key, KeyPool):
+        return api_key.validate()
+    return validate_api_key(api_key)
+
+
+def print_key_pool_summary(api_key: Optional[Union[str, KeyPool]]) -> None:
+    """After a run with several keys, show each key's quota and state."""
+    if isinstance(api_key, KeyPool):
+        print(f"API keys: {api_key.summary()}", file=sys.stderr)
+
+
 def parse_arguments() -> argparse.Namespace:
     """Parse and return command-line arguments."""
     parser = argparse.ArgumentParser(
@@ -60,10 +123,24 @@ def parse_arguments() -> argparse.Namespace:
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
-  %(prog)s --ip 192.168.1.1 --categories bruteforce,spam --comment "Suspicious activity"
-  %(prog)s --ip 192.168.1.1 --categories bruteforce --confidence 75 --verbose
-  %(prog)s --ip 192.168.1.1 --categories phishing --comment "Test" --dry-run
+  %(prog)s --ip 1.2.3.4 --categories bruteforce,spam --comment "Suspicious activity"
+  %(prog)s --ip 1.2.3.4 --categories bruteforce --confidence 75 --verbose
+  %(prog)s --ip 1.2.3.4 --categories phishing --comment "Test" --dry-run
+  %(prog)s --ip 192.168.1.1 --categories phishing --comment "Test" --dry-run --no-address-filter
   %(prog)s --cli                                          (Interactive menu mode)
+  %(prog)s --cli --concurrency 8                          (Bulk reports with 8 workers)
+  %(prog)s --input fail2ban.csv --categories ssh --comment "SSH brute force"
+  tail -f ips.txt | %(prog)s --input - --categories bruteforce --comment "Brute force"
+  %(prog)s --input big.csv --queue run.sqlite3 --resume     (Continue an interrupted run)
+  %(prog)s --input - --coalesce-window 60                  (One report per IP per minute)
+  echo 1.2.3.0/24 | %(prog)s --input - --categories port-scan --comment "Scan"
+  %(prog)s --input /var/log/auth.log --input-format sshd --coalesce-window 300
+  %(prog)s --follow /var/log/auth.log --input-format sshd   (Daemon; stop with SIGTERM)
+  %(prog)s --serve 8787                                   (Local HTTP ingest endpoint)
+  %(prog)s --check --ip 1.2.3.4                            (Look up an IP's reputation)
+  %(prog)s --input ips.txt --skip-blacklisted              (Skip IPs AbuseIPDB already lists)
+  %(prog)s --input big.csv --verbose --metrics-file abuse.prom (Phase timings and counters)
+  %(prog)s --input big.csv --output jsonl --results out.jsonl (Machine-readable results)
   %(prog)s --list-categories
         """
     )
@@ -105,6 +182,204 @@ Examples:
         help="Show detailed output including API response JSON"
     )
     
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Number of reports submitted in parallel during bulk runs "
+             f"(1-{MAX_CONCURRENCY}, default: {DEFAULT_CONCURRENCY})"
+    )
+    
+    parser.add_argument(
+        "--input",
+        type=str,
+        metavar="FILE",
+        help="Stream reports from a CSV/JSONL/plain-IP file ('-' for stdin); "
+             "--categories/--comment/--confidence act as per-record defaults"
+    )
+    
+    parser.add_argument(
+        "--input-format",
+        choices=INPUT_FORMATS,
+        default="auto",
+        help="Format of --input records; sshd, nginx and fail2ban read log files "
+             "and set categories and comment per event (default: auto-detect per line)"
+    )
+    
+    parser.add_argument(
+        "--results",
+        type=str,
+        metavar="FILE",
+        default="-",
+        help="Where --input, --follow and --serve write one result line per "
+             "record; --follow and --serve append (default: stdout)"
+    )
+    
+    parser.add_argument(
+        "--output",
+        choices=OUTPUT_FORMATS,
+        default=OUTPUT_TEXT,
+        help="Result format: tab-separated text, or jsonl for one compact JSON "
+             "object per report with categories, latency and attempts (default: text)"
+    )
+    
+    parser.add_argument(
+        "--queue",
+        type=str,
+        metavar="FILE",
+        help="Journal --input submissions to this SQLite queue so an interrupted "
+             f"run can be resumed (default with --resume: {DEFAULT_QUEUE_FILE})"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resubmit pending reports from --queue, then continue --input "
+             "after the last line recorded there"
+    )
+    
+    parser.add_argument(
+        "--dedup-cache",
+        type=str,
+        metavar="FILE",
+        default=DEFAULT_CACHE_FILE,
+        help="File remembering recently reported IPs so bulk runs skip repeats "
+             f"within 15 minutes (default: {DEFAULT_CACHE_FILE})"
+    )
+    
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Submit duplicate reports instead of suppressing them"
+    )
+    
+    parser.add_argument(
+        "--allowlist",
+        type=str,
+        metavar="FILE",
+        help="CIDRs/IPs never to report, one per line; private and reserved "
+             f"ranges are always skipped (default: {DEFAULT_ALLOWLIST_FILE} if present)"
+    )
+    
+    parser.add_argument(
+        "--no-address-filter",
+        action="store_true",
+        help="Do not skip private, reserved or allowlisted addresses "
+             "(for testing, e.g. --dry-run or a local mock endpoint)"
+    )
+    
+    parser.add_argument(
+        "--follow",
+        action="append",
+        metavar="FILE",
+        help="Run as a daemon: tail this log file (repeatable), reporting new "
+             "events until SIGTERM; handles rotation and truncation"
+    )
+    
+    parser.add_argument(
+        "--serve",
+        type=str,
+        metavar="[HOST:]PORT",
+        nargs="?",
+        const="",
+        help="Run a local HTTP server that accepts JSON reports from other "
+             "processes until SIGTERM (default: 127.0.0.1:8787)"
+    )
+    
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        metavar="SECONDS",
+        default=DEFAULT_POLL_INTERVAL,
+        help=f"How often --follow checks its files (default: {DEFAULT_POLL_INTERVAL:g})"
+    )
+    
+    parser.add_argument(
+        "--coalesce-window",
+        type=float,
+        metavar="SECONDS",
+        help="Merge events for the same IP seen within this many seconds into "
+             f"one report (default: 0 for --input, {DEFAULT_WINDOW:g} for --follow)"
+    )
+    
+    parser.add_argument(
+        "--max-expansion",
+        type=int,
+        metavar="N",
+        default=DEFAULT_MAX_EXPANSION,
+        help="Largest CIDR block or a-b range expanded from --input "
+             f"(default: {DEFAULT_MAX_EXPANSION})"
+    )
+    
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Look up the reputation of --ip (or of every IP in --input) "
+             "instead of reporting"
+    )
+    
+    parser.add_argument(
+        "--max-age-days",
+        type=int,
+        default=DEFAULT_MAX_AGE_DAYS,
+        help=f"Days of reports --check takes into account (1-365, default: {DEFAULT_MAX_AGE_DAYS})"
+    )
+    
+    parser.add_argument(
+        "--check-cache",
+        type=str,
+        metavar="FILE",
+        default=DEFAULT_CHECK_CACHE_FILE,
+        help=f"SQLite file caching --check lookups (default: {DEFAULT_CHECK_CACHE_FILE})"
+    )
+    
+    parser.add_argument(
+        "--check-ttl",
+        type=float,
+        metavar="SECONDS",
+        default=DEFAULT_CHECK_TTL,
+        help=f"How long a cached lookup is reused (default: {DEFAULT_CHECK_TTL})"
+    )
+    
+    parser.add_argument(
+        "--skip-blacklisted",
+        action="store_true",
+        help="Skip IPs already on the AbuseIPDB blacklist, using a local snapshot "
+             f"refreshed when older than {DEFAULT_REFRESH_INTERVAL // 3600} hours"
+    )
+    
+    parser.add_argument(
+        "--blacklist-file",
+        type=str,
+        metavar="FILE",
+        default=DEFAULT_BLACKLIST_FILE,
+        help=f"Blacklist snapshot used by --skip-blacklisted (default: {DEFAULT_BLACKLIST_FILE})"
+    )
+    
+    parser.add_argument(
+        "--update-blacklist",
+        action="store_true",
+        help="Download the blacklist into --blacklist-file now, then exit "
+             "(or continue, with --skip-blacklisted)"
+    )
+    
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        metavar="FILE",
+        help="Keep client metrics in FILE in the Prometheus text format, rewritten "
+             "every --metrics-interval (for the node_exporter textfile collector)"
+    )
+    
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        metavar="SECONDS",
+        default=DEFAULT_SUMMARY_INTERVAL,
+        help="Seconds between metrics summaries (--verbose) and --metrics-file "
+             f"updates (default: {DEFAULT_SUMMARY_INTERVAL:g})"
+    )
+    
     parser.add_argument(
         "--list-categories",
         action="store_true",
@@ -125,11 +400,14 @@ def validate_inputs(
     categories_str: Optional[str],
     comment: Optional[str],
     confidence: int,
-    verbose: bool
+    verbose: bool,
+    ip_checked: bool = False
 ) -> tuple[bool, Optional[str], list[int]]:
     """
     Validate all input parameters.
     
+    Set ``ip_checked`` when the IP was already validated in a batch.
+    
     Returns:
         Tuple of (is_valid, error_message, category_ids)
     """
@@ -137,7 +415,7 @@ def validate_inputs(
     if not ip:
         return False, "Error: --ip is required", []
     
-    if not validate_ip(ip):
+    if not ip_checked and not validate_ip(ip):
         return False, f"Error: Invalid IP address: {ip}", []
     
     if verbose:
@@ -181,7 +459,12 @@ def validate_inputs(
     return True, None, category_ids
 
 
-def bulk_report_interactive(dry_run: bool = False) -> int:
+def bulk_report_interactive(
+    dry_run: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    dedup_cache: Optional[str] = DEFAULT_CACHE_FILE,
+    address_filter: Optional[AddressFilter] = None
+) -> int:
     """Interactive bulk report submission prompt."""
     print_section("BULK ABUSE REPORT")
     
@@ -204,7 +487,7 @@ def bulk_report_interactive(dry_run: bool = False) -> int:
         print("-" * 50)
         
         # Get IP
-        ip = get_ip_input()
+        ip = get_ip_input(address_filter)
         print_success(f"IP address valid: {ip}")
         
         # Get categories
@@ -256,34 +539,64 @@ def bulk_report_interactive(dry_run: bool = False) -> int:
             return 0
         
         # Submit all reports
-        api_key = os.getenv("ABUSEIPDB_API_KEY")
-        key_valid, key_error = validate_api_key(api_key)
+        api_key = get_api_key()
+        key_valid, key_error = validate_api_key_setting(api_key)
         if not key_valid:
             print_error(key_error)
             return 1
         
-        client = AbuseIPDBClient(api_key)
-        successful = 0
-        failed = 0
-        
-        for idx, report in enumerate(reports, 1):
-            result = client.submit_report(
+        bulk_reports = [
+            BulkReport(
                 ip=report["ip"],
                 category_ids=report["category_ids"],
                 comment=report["comment"],
                 confidence=report["confidence"]
             )
-            
+            for report in reports
+        ]
+        
+        # Merge repeated reports for the same IP into one submission
+        bulk_reports = coalesce_reports(bulk_reports)
+        merged = num_reports - len(bulk_reports)
+        
+        # Drop IPs reported within the last 15 minutes (AbuseIPDB rejects them)
+        cache = RecentReportCache(dedup_cache) if dedup_cache else None
+        if cache:
+            bulk_reports = [report for report in bulk_reports if cache.check(report.ip)]
+        
+        # /bulk-report has no confidence column; keep per-report requests instead
+        if len(bulk_reports) >= BULK_ENDPOINT_THRESHOLD and not can_use_bulk_endpoint(bulk_reports):
+            print_warning(
+                "Some reports have a confidence below 100%, which /bulk-report ignores; "
+                "sending one request per report instead"
+            )
+        
+        def show_result(index: int, report: BulkReport, result: ReportResult) -> None:
             if result.success:
-                print_success(f"Report {idx}: {report['ip']} submitted successfully")
-                successful += 1
+                print_success(f"Report {index + 1}: {report.ip} submitted successfully")
             else:
-                print_error(f"Report {idx}: {report['ip']} failed ({result.message})")
-                failed += 1
+                if cache:
+                    cache.forget(report.ip)
+                print_error(f"Report {index + 1}: {report.ip} failed ({result.message})")
+        
+        # One client (and one connection pool) shared by all workers
+        with AbuseIPDBClient(api_key) as client:
+            results = submit_bulk(client, bulk_reports, concurrency, on_result=show_result)
+        
+        if cache:
+            cache.save()
+        
+        successful = sum(1 for result in results if result.success)
+        suppressed = num_reports - merged - len(bulk_reports)
+        failed = len(bulk_reports) - successful
         
         print()
         print_section("BULK SUBMISSION COMPLETE")
         print_success(f"Successful: {successful}/{num_reports}")
+        if merged > 0:
+            print_info(f"Merged into another report for the same IP: {merged}/{num_reports}")
+        if suppressed > 0:
+            print_info(f"Duplicates suppressed: {suppressed}/{num_reports}")
         if failed > 0:
             print_error(f"Failed: {failed}/{num_reports}")
     else:
@@ -293,12 +606,15 @@ def bulk_report_interactive(dry_run: bool = False) -> int:
     return 0
 
 
-def submit_report_interactive(dry_run: bool = False) -> int:
+def submit_report_interactive(
+    dry_run: bool = False,
+    address_filter: Optional[AddressFilter] = None
+) -> int:
     """Interactive report submission prompt."""
     print_section("SUBMIT ABUSE REPORT")
     
     # Get IP
-    ip = get_ip_input()
+    ip = get_ip_input(address_filter)
     print_success(f"IP address valid: {ip}")
     
     # Get categories
@@ -328,8 +644,8 @@ def submit_report_interactive(dry_run: bool = False) -> int:
         return 0
     
     # Check API key
-    api_key = os.getenv("ABUSEIPDB_API_KEY")
-    key_valid, key_error = validate_api_key(api_key)
+    api_key = get_api_key()
+    key_valid, key_error = validate_api_key_setting(api_key)
     if not key_valid:
         print_error(key_error)
         print_info("Set your API key:")
@@ -340,13 +656,13 @@ def submit_report_interactive(dry_run: bool = False) -> int:
     print_section("SUBMITTING REPORT")
     print_info("Sending request to AbuseIPDB...")
     
-    client = AbuseIPDBClient(api_key)
-    result = client.submit_report(
-        ip=ip,
-        category_ids=category_ids,
-        comment=comment,
-        confidence=confidence
-    )
+    with AbuseIPDBClient(api_key) as client:
+        result = client.submit_report(
+            ip=ip,
+            category_ids=category_ids,
+            comment=comment,
+            confidence=confidence
+        )
     
     if result.success:
         print_box("SUCCESS", "Report submitted successfully!")
@@ -363,12 +679,672 @@ def submit_report_interactive(dry_run: bool = False) -> int:
         return 1
 
 
-def run_interactive_menu() -> int:
+def start_metrics(args: argparse.Namespace) -> tuple[Optional[InMemoryMetrics], Optional[MetricsReporter]]:
+    """
+    Collect client metrics when --verbose or --metrics-file asks for them.
+    
+    Returns:
+        Tuple of (registry to pass to the client, reporter to stop when
+        done), or (None, None) when metrics are off
+    """
+    callbacks = []
+    if args.verbose:
+        callbacks.append(print_summary(sys.stderr))
+    if args.metrics_file:
+        def write_file(metrics: InMemoryMetrics) -> None:
+            try:
+                metrics.write_prometheus(args.metrics_file)
+            except OSError as e:
+                print_warning(f"Warning: Cannot write metrics: {e}")
+        callbacks.append(write_file)
+    if not callbacks:
+        return None, None
+    metrics = InMemoryMetrics()
+    return metrics, MetricsReporter(metrics, callbacks, args.metrics_interval)
+
+
+def run_input_mode(args: argparse.Namespace, address_filter: Optional[AddressFilter] = None) -> int:
+    """
+    Stream reports from --input, validating and submitting each record as
+    it is read. Memory use stays constant regardless of input size.
+    
+    With --queue every submission is journaled; --resume first resubmits
+    the queue's pending reports and then skips input lines it has already
+    recorded.
+    
+    Returns:
+        Exit code (0 if every record was submitted or validated)
+    """
+    api_key = None
+    if not args.dry_run:
+        api_key = get_api_key()
+        key_valid, key_error = validate_api_key_setting(api_key)
+        if not key_valid:
+            print_error(key_error)
+            return 1
+    
+    queue = None
+    skip_until = 0
+    if not args.dry_run and (args.queue or args.resume):
+        queue = SubmissionQueue(args.queue or DEFAULT_QUEUE_FILE)
+        if args.resume:
+            skip_until = queue.last_line_number()
+        elif queue.pending_count():
+            print_error(f"Error: {queue.path} has {queue.pending_count()} pending reports "
+                        "from an interrupted run; use --resume or another --queue file")
+            queue.close()
+            return 1
+        else:
+            queue.reset()
+    
+    stream = None
+    out = None
+    try:
+        if args.input:
+            stream = open_input(args.input)
+        out = ResultWriter.open(args.results, args.output)
+    except OSError as e:
+        print_error(f"Error: {e}")
+        if stream is not None and stream is not sys.stdin:
+            stream.close()
+        if queue:
+            queue.close()
+        return 1
+    
+    cache = None
+    if not args.dry_run and not args.no_dedup:
+        cache = RecentReportCache(args.dedup_cache)
+    
+    coalescer = ReportCoalescer(args.coalesce_window) if args.coalesce_window else None
+    
+    counts = {
+        "submitted": 0, "failed": 0, "invalid": 0, "filtered": 0,
+        "duplicate": 0, "merged": 0, "valid": 0
+    }
+    # (line_number, queue_entry_id, events) for each report in flight, in order
+    in_flight: deque[tuple[int, Optional[int], int]] = deque()
+    
+    def pending_reports():
+        """
+        Yield reports left pending in the queue by a previous run, through
+        the same dedup check as new records.
+        """
+        if queue and args.resume:
+            for entry_id, line_number, report in queue.pending():
+                if cache and not cache.check(report.ip):
+                    # Already reported since (e.g. sent just before the interruption)
+                    counts["duplicate"] += 1
+                    queue.complete(entry_id, ReportResult(
+                        success=True,
+                        message="Already reported within the last 15 minutes",
+                        attempts=0
+                    ))
+                    out.write(line_number or 0, report.ip, "duplicate",
+                              message="Already reported within the last 15 minutes",
+                              categories=report.category_ids)
+                    continue
+                in_flight.append((line_number or 0, entry_id, 1))
+                yield report
+    
+    def admit(ready: list[CoalescedReport], last_line: int):
+        """Yield reports that pass the dedup check, journaling each one."""
+        # Lines up to the oldest still-buffered event are fully handled
+        oldest_line = coalescer.oldest_line() if coalescer else None
+        resume_line = last_line if oldest_line is None else oldest_line - 1
+        
+        for coalesced in ready:
+            report = coalesced.report
+            if cache and not cache.check(report.ip):
+                counts["duplicate"] += 1
+                out.write(coalesced.line_number, report.ip, "duplicate",
+                          message="Already reported within the last 15 minutes",
+                          categories=report.category_ids)
+                continue
+            entry_id = queue.enqueue(report, coalesced.line_number, resume_line) if queue else None
+            in_flight.append((coalesced.line_number, entry_id, coalesced.events))
+            yield report
+    
+    def valid_reports():
+        """Yield BulkReports for valid records, logging invalid ones."""
+        if stream is None:
+            return
+        last_line = skip_until
+        # Files are validated a batch of IPs at a time; stdin stays line by line
+        batch_size = 1 if stream is sys.stdin else RECORD_BATCH_SIZE
+        records = expand_records(read_records(stream, args.input_format), args.max_expansion)
+        
+        for batch in batch_records(records, batch_size):
+            ip_batch = validate_ip_batch(record.ip for record in batch)
+            for record, packed_ip in zip(batch, ip_batch.values):
+                if record.line_number <= skip_until:
+                    continue
+                # A range is only done once its last address is queued
+                last_line = record.line_number - 1 if record.partial else record.line_number
+                report, error = record_to_report(record, args, packed_ip)
+                if report is None:
+                    counts["invalid"] += 1
+                    out.write(record.line_number, record.ip, "invalid", message=error)
+                    continue
+                reason = address_filter.check(packed_ip) if address_filter else None
+                if reason:
+                    counts["filtered"] += 1
+                    out.write(record.line_number, report.ip, "filtered",
+                              message=drop_message(report.ip, reason), categories=report.category_ids)
+                    continue
+                if coalescer:
+                    ready = coalescer.add(report, record.line_number)
+                else:
+                    ready = [CoalescedReport(report, record.line_number, 1)]
+                yield from admit(ready, last_line)
+        
+        if coalescer:
+            yield from admit(coalescer.flush(), last_line)
+            counts["merged"] = coalescer.merged
+    
+    metrics, reporter = (None, None) if args.dry_run else start_metrics(args)
+    try:
+        if args.dry_run:
+            for report in valid_reports():
+                counts["valid"] += 1
+                line_number, _, events = in_flight.popleft()
+                out.write(line_number, report.ip, "valid", message=merged_message("Validation passed", events),
+                          categories=report.category_ids)
+        else:
+            with AbuseIPDBClient(api_key, metrics=metrics) as client:
+                reports = chain(pending_reports(), valid_reports())
+                for _, report, result in iter_bulk(client, reports, args.concurrency):
+                    line_number, entry_id, events = in_flight.popleft()
+                    if queue:
+                        queue.complete(entry_id, result)
+                    if cache and not result.success:
+                        cache.forget(report.ip)
+                    status = "submitted" if result.success else "failed"
+                    counts[status] += 1
+                    message = result.message if result.success else f"{result.message}: {result.error}"
+                    message = merged_message(message, events)
+                    out.write(line_number, report.ip, status, result.status_code, message, result,
+                              report.category_ids)
+    finally:
+        if reporter:
+            reporter.stop()
+        if cache:
+            cache.save()
+        if queue:
+            queue.close()
+        if stream is not None and stream is not sys.stdin:
+            stream.close()
+        out.close()
+    
+    summary = ", ".join(f"{count} {name}" for name, count in counts.items() if count)
+    print(f"Processed input: {summary or 'no records'}", file=sys.stderr)
+    print_key_pool_summary(api_key)
+    if counts["filtered"]:
+        print(f"Filtered addresses: {address_filter.summary()}", file=sys.stderr)
+    return 1 if counts["failed"] or counts["invalid"] else 0
+
+
+def run_follow_mode(args: argparse.Namespace, address_filter: Optional[AddressFilter] = None) -> int:
+    """
+    Tail the --follow files and report new events until SIGTERM or Ctrl+C.
+    
+    A single client (and its connection pool) is kept for the whole run.
+    Events are merged per IP over --coalesce-window seconds and every
+    poll submits the reports whose window has closed as one batch. On
+    shutdown the buffered reports are flushed before exiting.
+    
+    Returns:
+        Exit code (0 after a graceful shutdown)
+    """
+    api_key = None
+    if not args.dry_run:
+        api_key = get_api_key()
+        key_valid, key_error = validate_api_key_setting(api_key)
+        if not key_valid:
+            print_error(key_error)
+            return 1
+    
+    tailers = [FileTailer(path) for path in args.follow]
+    try:
+        out = ResultWriter.open(args.results, args.output, "a")
+    except OSError as e:
+        print_error(f"Error: {e}")
+        return 1
+    
+    window = DEFAULT_WINDOW if args.coalesce_window is None else args.coalesce_window
+    coalescer = ReportCoalescer(window)
+    cache = None
+    if not args.dry_run and not args.no_dedup:
+        cache = RecentReportCache(args.dedup_cache)
+    metrics, reporter = (None, None) if args.dry_run else start_metrics(args)
+    client = None if args.dry_run else AbuseIPDBClient(api_key, metrics=metrics)
+    
+    counts = {
+        "submitted": 0, "failed": 0, "invalid": 0, "filtered": 0,
+        "duplicate": 0, "merged": 0, "valid": 0
+    }
+    
+    stop = threading.Event()
+    
+    def request_stop(signum, frame):
+        stop.set()
+    
+    previous_handlers = {
+        signum: signal.signal(signum, request_stop)
+        for signum in (signal.SIGTERM, signal.SIGINT)
+    }
+    
+    def collect(lines: list[str], first_line: int) -> list[CoalescedReport]:
+        """Validate and filter new lines, returning the reports now due."""
+        ready = []
+        records = expand_records(read_records(lines, args.input_format), args.max_expansion)
+        for batch in batch_records(records):
+            ip_batch = validate_ip_batch(record.ip for record in batch)
+            for record, packed_ip in zip(batch, ip_batch.values):
+                line_number = first_line + record.line_number - 1
+                report, error = record_to_report(record, args, packed_ip)
+                if report is None:
+                    counts["invalid"] += 1
+                    out.write(line_number, record.ip, "invalid", message=error)
+                    continue
+                reason = address_filter.check(packed_ip) if address_filter else None
+                if reason:
+                    counts["filtered"] += 1
+                    out.write(line_number, report.ip, "filtered",
+                              message=drop_message(report.ip, reason), categories=report.category_ids)
+                    continue
+                ready.extend(coalescer.add(report, line_number))
+        return ready
+    
+    def submit(ready: list[CoalescedReport]) -> None:
+        """Submit due reports as one batch and write their results."""
+        due = []
+        for coalesced in ready:
+            if cache and not cache.check(coalesced.report.ip):
+                counts["duplicate"] += 1
+                out.write(coalesced.line_number, coalesced.report.ip, "duplicate",
+                          message="Already reported within the last 15 minutes",
+                          categories=coalesced.report.category_ids)
+                continue
+            due.append(coalesced)
+        
+        if args.dry_run:
+            for coalesced in due:
+                counts["valid"] += 1
+                out.write(coalesced.line_number, coalesced.report.ip, "valid",
+                          message=merged_message("Validation passed", coalesced.events),
+                          categories=coalesced.report.category_ids)
+        elif due:
+            results = submit_bulk(client, [coalesced.report for coalesced in due], args.concurrency)
+            for coalesced, result in zip(due, results):
+                if cache and not result.success:
+                    cache.forget(coalesced.report.ip)
+                status = "submitted" if result.success else "failed"
+                counts[status] += 1
+                message = result.message if result.success else f"{result.message}: {result.error}"
+                out.write(coalesced.line_number, coalesced.report.ip, status, result.status_code,
+                          merged_message(message, coalesced.events), result, coalesced.report.category_ids)
+        out.flush()
+    
+    paths = ", ".join(str(tailer.path) for tailer in tailers)
+    print(f"Following {paths} (window {window:g}s); send SIGTERM or press Ctrl+C to stop",
+          file=sys.stderr)
+    
+    last_save = time.monotonic()
+    try:
+        while not stop.is_set():
+            ready = []
+            for tailer in tailers:
+                first_line, lines = tailer.read_lines()
+                if lines:
+                    ready.extend(collect(lines, first_line))
+            ready.extend(coalescer.pop_due())
+            if ready:
+                submit(ready)
+            
+            if cache and time.monotonic() - last_save >= window:
+                cache.save()
+                last_save = time.monotonic()
+            stop.wait(args.poll_interval)
+        
+        # Shutting down: report everything still buffered
+        submit(coalescer.flush())
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        for tailer in tailers:
+            tailer.close()
+        if client:
+            client.close()
+        if reporter:
+            reporter.stop()
+        if cache:
+            cache.save()
+        out.close()
+    
+    counts["merged"] = coalescer.merged
+    summary = ", ".join(f"{count} {name}" for name, count in counts.items() if count)
+    print(f"Stopped following: {summary or 'no events'}", file=sys.stderr)
+    print_key_pool_summary(api_key)
+    if counts["filtered"]:
+        print(f"Filtered addresses: {address_filter.summary()}", file=sys.stderr)
+    return 0
+
+
+def run_serve_mode(args: argparse.Namespace, address_filter: Optional[AddressFilter] = None) -> int:
+    """
+    Serve the local HTTP ingest endpoint until SIGTERM or Ctrl+C.
+    
+    Other processes POST JSON reports to /reports instead of starting
+    this CLI per event. Each report is validated like an --input JSONL
+    record (--categories/--comment/--confidence act as defaults) and
+    queued on one shared pipeline; the response carries a tracking ID
+    that GET /reports/<id> resolves. On shutdown the queue is drained
+    before exiting.
+    
+    Returns:
+        Exit code (0 after a graceful shutdown)
+    """
+    # http.server pulls in email, ssl, ...; only this mode needs it
+    from server import IngestServer, IngestService, parse_listen_address
+    
+    api_key = None
+    if not args.dry_run:
+        api_key = get_api_key()
+        key_valid, key_error = validate_api_key_setting(api_key)
+        if not key_valid:
+            print_error(key_error)
+            return 1
+    
+    try:
+        address = parse_listen_address(args.serve)
+    except ValueError as e:
+        print_error(f"Error: {e}")
+        return 1
+    
+    try:
+        out = ResultWriter.open(args.results, args.output, "a")
+    except OSError as e:
+        print_error(f"Error: {e}")
+        return 1
+    
+    cache = None
+    if not args.dry_run and not args.no_dedup:
+        cache = RecentReportCache(args.dedup_cache)
+    metrics, reporter = (None, None) if args.dry_run else start_metrics(args)
+    if args.dry_run:
+        client = None
+    else:
+        # GET /metrics needs a registry even when nothing else reports it
+        metrics = metrics or InMemoryMetrics()
+        client = AbuseIPDBClient(api_key, metrics=metrics)
+    
+    def screen(record: InputRecord) -> tuple[Optional[BulkReport], Optional[str]]:
+        """Validate a request record and apply the address filter."""
+        packed_ip = pack_ip(record.ip) if record.ip else INVALID_IP
+        report, error = record_to_report(record, args, packed_ip)
+        if report is None:
+            return None, error
+        reason = address_filter.check(packed_ip) if address_filter else None
+        if reason:
+            return None, f"Error: {drop_message(report.ip, reason)}"
+        return report, None
+    
+    def log_result(tracking_id: int, report: BulkReport, status: str, result: Optional[ReportResult]) -> None:
+        """Write one result line per finished report."""
+        if result is None:
+            message = "Validation passed" if status == "valid" else "Already reported within the last 15 minutes"
+            out.write(tracking_id, report.ip, status, message=message, categories=report.category_ids)
+        else:
+            message = result.message if result.success else f"{result.message}: {result.error}"
+            out.write(tracking_id, report.ip, status, result.status_code, message, result,
+                      report.category_ids)
+        out.flush()
+    
+    service = IngestService(client, screen, args.concurrency, cache, log_result)
+    try:
+        server = IngestServer(address, service, metrics)
+    except OSError as e:
+        print_error(f"Error: Cannot listen on {address[0]}:{address[1]}: {e}")
+        service.close()
+        if client:
+            client.close()
+        if reporter:
+            reporter.stop()
+        return 1
+    
+    stop = threading.Event()
+    
+    def request_stop(signum, frame):
+        stop.set()
+    
+    previous_handlers = {
+        signum: signal.signal(signum, request_stop)
+        for signum in (signal.SIGTERM, signal.SIGINT)
+    }
+    
+    thread = threading.Thread(target=server.serve_forever, name="ingest-server", daemon=True)
+    thread.start()
+    print(f"Accepting reports on http://{address[0]}:{address[1]}/reports; "
+          "send SIGTERM or press Ctrl+C to stop", file=sys.stderr)
+    
+    try:
+        while not stop.wait(1.0):
+            pass
+    finally:
+        server.shutdown()
+        server.server_close()
+        # Submit everything accepted before the server stopped
+        service.close()
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        if client:
+            client.close()
+        if reporter:
+            reporter.stop()
+        if cache:
+            cache.save()
+        out.close()
+    
+    summary = ", ".join(f"{count} {name}" for name, count in service.stats().items() if count)
+    print(f"Stopped serving: {summary or 'no reports'}", file=sys.stderr)
+    print_key_pool_summary(api_key)
+    return 0
+
+
+def load_blacklist(args: argparse.Namespace) -> Optional[BlacklistSnapshot]:
+    """
+    Load the --blacklist-file snapshot, downloading the blacklist into it
+    first when it is stale (or always, with --update-blacklist).
+    
+    Without an API key, or with --dry-run, the snapshot is used as is.
+    
+    Returns:
+        The snapshot, or None if it cannot be read or downloaded
+    """
+    api_key = get_api_key()
+    try:
+        if args.dry_run or not validate_api_key_setting(api_key)[0]:
+            if args.update_blacklist:
+                print_error("Error: --update-blacklist needs a valid API key")
+                return None
+            snapshot = BlacklistSnapshot.load(args.blacklist_file)
+            message = f"Using blacklist snapshot as is ({len(snapshot)} addresses)"
+        else:
+            max_age = 0 if args.update_blacklist else DEFAULT_REFRESH_INTERVAL
+            with AbuseIPDBClient(api_key) as client:
+                snapshot, message = refresh_blacklist(client, args.blacklist_file, max_age)
+    except (OSError, ValueError) as e:
+        print_error(f"Error: Cannot load blacklist: {e}")
+        return None
+    
+    print(message, file=sys.stderr)
+    return snapshot
+
+
+def check_message(result: CheckResult) -> str:
+    """Summarize a reputation lookup in one line."""
+    if not result.success:
+        return f"{result.message}: {result.error}"
+    data = result.data or {}
+    message = f"Score {result.abuse_confidence_score}%, {result.total_reports} reports"
+    if data.get("isWhitelisted"):
+        message += ", whitelisted"
+    if data.get("countryCode"):
+        message += f", {data['countryCode']}"
+    if data.get("isp"):
+        message += f", {data['isp']}"
+    return message + (" (cached)" if result.cached else "")
+
+
+def run_check_mode(args: argparse.Namespace, address_filter: Optional[AddressFilter] = None) -> int:
+    """
+    Look up the reputation of --ip, or of every IP in --input, instead of
+    reporting. Lookups go through a memory + SQLite cache, so IPs repeated
+    in the input or checked within --check-ttl cost no API call.
+    
+    Returns:
+        Exit code (0 if every lookup succeeded)
+    """
+    api_key = get_api_key()
+    key_valid, key_error = validate_api_key_setting(api_key)
+    if not key_valid:
+        print_error(key_error)
+        return 1
+    
+    if args.ip:
+        if not validate_ip(args.ip):
+            print_error(f"Error: Invalid IP address: {args.ip}")
+            return 1
+        reason = address_filter.check(pack_ip(args.ip)) if address_filter else None
+        if reason:
+            print_error(f"Error: {drop_message(args.ip, reason)} and has no public reputation")
+            return 1
+    
+    try:
+        stream = open_input(args.input) if args.input else None
+        cache = ReputationCache(args.check_cache or None, ttl=args.check_ttl)
+    except (OSError, ValueError) as e:
+        print_error(f"Error: {e}")
+        return 1
+    
+    metrics, reporter = start_metrics(args) if stream is not None else (None, None)
+    client = AbuseIPDBClient(api_key, check_cache=cache, metrics=metrics)
+    try:
+        if stream is None:
+            result = client.check(args.ip, args.max_age_days)
+            if args.output == OUTPUT_JSONL:
+                ResultWriter(sys.stdout, OUTPUT_JSONL).write(
+                    None, args.ip, "checked" if result.success else "failed", result.status_code,
+                    check_message(result), result, data=result.data
+                )
+                sys.stdout.flush()
+                return 0 if result.success else 1
+            if not result.success:
+                print_error(check_message(result))
+                return 1
+            print_success(f"{args.ip}: {check_message(result)}")
+            if args.verbose:
+                print(json.dumps(result.data, indent=2))
+            return 0
+        
+        counts = {"checked": 0, "failed": 0, "invalid": 0, "filtered": 0}
+        out = ResultWriter(sys.stdout, args.output)
+        records = expand_records(read_records(stream, args.input_format), args.max_expansion)
+        for batch in batch_records(records, 1 if stream is sys.stdin else RECORD_BATCH_SIZE):
+            ip_batch = validate_ip_batch(record.ip for record in batch)
+            for record, packed_ip in zip(batch, ip_batch.values):
+                if record.error or packed_ip == INVALID_IP:
+                    counts["invalid"] += 1
+                    out.write(record.line_number, record.ip, "invalid",
+                              message=f"Error: {record.error or 'Invalid IP address'}")
+                    continue
+                ip = unpack_ip(packed_ip)
+                reason = address_filter.check(packed_ip) if address_filter else None
+                if reason:
+                    counts["filtered"] += 1
+                    out.write(record.line_number, ip, "filtered", message=drop_message(ip, reason))
+                    continue
+                result = client.check(ip, args.max_age_days)
+                status = "checked" if result.success else "failed"
+                counts[status] += 1
+                out.write(record.line_number, ip, status, result.status_code, check_message(result),
+                          result, data=result.data)
+        out.flush()
+        
+        summary = ", ".join(f"{count} {name}" for name, count in counts.items() if count)
+        print(f"Processed input: {summary or 'no records'}", file=sys.stderr)
+        print(f"Lookup cache: {cache.summary()}", file=sys.stderr)
+        print_key_pool_summary(api_key)
+        return 1 if counts["failed"] or counts["invalid"] else 0
+    finally:
+        client.close()
+        if reporter:
+            reporter.stop()
+        cache.close()
+        if stream is not None and stream is not sys.stdin:
+            stream.close()
+
+
+def merged_message(message: str, events: int) -> str:
+    """Append the number of merged events to a result message."""
+    if events > 1:
+        return f"{message} ({events} events merged)"
+    return message
+
+
+def record_to_report(
+    record: InputRecord,
+    args: argparse.Namespace,
+    packed_ip: Optional[int] = None
+) -> tuple[Optional[BulkReport], Optional[str]]:
+    """
+    Validate an input record, falling back to the command-line defaults
+    for any field the record does not provide.
+    
+    When ``packed_ip`` (from validate_ip_batch, INVALID_IP for an invalid
+    address) is given, the IP is not parsed again and the report uses its
+    canonical form.
+    
+    Returns:
+        Tuple of (report, error_message); report is None when invalid
+    """
+    if record.error:
+        return None, f"Error: {record.error}"
+    
+    ip = record.ip
+    if packed_ip is not None:
+        if packed_ip == INVALID_IP:
+            return None, f"Error: Invalid IP address: {ip}" if ip else "Error: --ip is required"
+        ip = unpack_ip(packed_ip)
+    
+    categories = record.categories or args.categories
+    comment = record.comment or args.comment
+    confidence = record.confidence if record.confidence is not None else args.confidence
+    
+    is_valid, error_msg, category_ids = validate_inputs(
+        ip,
+        categories,
+        comment,
+        confidence,
+        False,
+        ip_checked=packed_ip is not None
+    )
+    if not is_valid:
+        return None, error_msg
+    
+    return BulkReport(ip, category_ids, comment, confidence), None
+
+
+def run_interactive_menu(
+    concurrency: int = DEFAULT_CONCURRENCY,
+    dedup_cache: Optional[str] = DEFAULT_CACHE_FILE,
+    address_filter: Optional[AddressFilter] = None
+) -> int:
     """Run the interactive menu mode."""
     clear_screen()
     print_banner()
     
-    api_key = os.getenv("ABUSEIPDB_API_KEY")
+    api_key = get_api_key()
     if not api_key:
         print_warning("ABUSEIPDB_API_KEY environment variable not set")
         print_info("Set it with: export ABUSEIPDB_API_KEY='your_key_here'")
@@ -381,7 +1357,7 @@ def run_interactive_menu() -> int:
         if choice == "1":
             clear_screen()
             print_banner()
-            submit_report_interactive(dry_run=False)
+            submit_report_interactive(dry_run=False, address_filter=address_filter)
             print_input_prompt("\nPress Enter to continue")
             clear_screen()
             print_banner()
@@ -397,7 +1373,7 @@ def run_interactive_menu() -> int:
         elif choice == "3":
             clear_screen()
             print_banner()
-            submit_report_interactive(dry_run=True)
+            submit_report_interactive(dry_run=True, address_filter=address_filter)
             print_input_prompt("\nPress Enter to continue")
             clear_screen()
             print_banner()
@@ -405,7 +1381,12 @@ def run_interactive_menu() -> int:
         elif choice == "4":
             clear_screen()
             print_banner()
-            bulk_report_interactive(dry_run=False)
+            bulk_report_interactive(
+                dry_run=False,
+                concurrency=concurrency,
+                dedup_cache=dedup_cache,
+                address_filter=address_filter
+            )
             print_input_prompt("\nPress Enter to continue")
             clear_screen()
             print_banner()
@@ -432,9 +1413,83 @@ def main() -> int:
         print_category_list()
         return 0
     
+    conc_valid, conc_error = validate_concurrency(args.concurrency, MAX_CONCURRENCY)
+    if not conc_valid:
+        print_error(f"Error: {conc_error}")
+        return 1
+    
+    if args.coalesce_window is not None and args.coalesce_window < 0:
+        print_error("Error: --coalesce-window cannot be negative")
+        return 1
+    
+    if args.poll_interval <= 0:
+        print_error("Error: --poll-interval must be positive")
+        return 1
+    
+    if args.max_expansion < 1:
+        print_error("Error: --max-expansion must be at least 1")
+        return 1
+    
+    if args.metrics_interval <= 0:
+        print_error("Error: --metrics-interval must be positive")
+        return 1
+    
+    if args.no_address_filter and args.skip_blacklisted:
+        print_error("Error: --no-address-filter and --skip-blacklisted cannot be combined")
+        return 1
+    
+    # Optionally skip IPs AbuseIPDB already lists
+    blacklist = None
+    if args.skip_blacklisted or args.update_blacklist:
+        blacklist = load_blacklist(args)
+        if blacklist is None:
+            return 1
+        if args.update_blacklist and not args.skip_blacklisted:
+            return 0
+    
+    # Private/reserved ranges plus the user's allowlist are never reported
+    # (unless --no-address-filter turns the filter off for testing)
+    address_filter = None
+    allowlist = args.allowlist
+    if allowlist is None and Path(DEFAULT_ALLOWLIST_FILE).exists():
+        allowlist = DEFAULT_ALLOWLIST_FILE
+    if not args.no_address_filter:
+        try:
+            address_filter = AddressFilter.from_allowlist_file(allowlist, blacklist)
+        except (OSError, ValueError) as e:
+            print_error(f"Error: Cannot load allowlist: {e}")
+            return 1
+    
+    # Handle reputation lookups
+    if args.check:
+        if args.follow or args.serve is not None or args.resume:
+            print_error("Error: --check cannot be combined with --follow, --serve or --resume")
+            return 1
+        if not args.ip and not args.input:
+            print_error("Error: --check needs --ip or --input")
+            return 1
+        if not 1 <= args.max_age_days <= 365:
+            print_error("Error: --max-age-days must be between 1 and 365")
+            return 1
+        return run_check_mode(args, address_filter)
+    
+    # Handle daemon modes
+    if args.follow or args.serve is not None:
+        if args.input or args.resume or (args.follow and args.serve is not None):
+            print_error("Error: --follow, --serve and --input/--resume cannot be combined")
+            return 1
+        if args.serve is not None:
+            return run_serve_mode(args, address_filter)
+        return run_follow_mode(args, address_filter)
+    
+    # Handle streaming input mode
+    if args.input or args.resume:
+        return run_input_mode(args, address_filter)
+    
     # Handle interactive mode
     if args.cli or (len(sys.argv) == 1):
-        return run_interactive_menu()
+        dedup_cache = None if args.no_dedup else args.dedup_cache
+        return run_interactive_menu(args.concurrency, dedup_cache, address_filter)
     
     # Command-line mode with arguments
     if not args.ip and not args.cli:
@@ -444,22 +1499,35 @@ def main() -> int:
         parser.print_help()
         return 0
     
+    # JSONL output replaces the styled messages with one record on stdout
+    jsonl = args.output == OUTPUT_JSONL
+    verbose = args.verbose and not jsonl
+    
     # Validate inputs
     is_valid, error_msg, category_ids = validate_inputs(
         args.ip,
         args.categories,
         args.comment,
         args.confidence,
-        args.verbose
+        verbose
     )
     
     if not is_valid:
         print_error(error_msg)
         return 1
     
+    reason = address_filter.check(pack_ip(args.ip)) if address_filter else None
+    if reason:
+        print_error(f"Error: {drop_message(args.ip, reason)} and cannot be reported")
+        return 1
+    
     # Dry-run mode
     if args.dry_run:
-        if args.verbose:
+        if jsonl:
+            ResultWriter(sys.stdout, OUTPUT_JSONL).write(
+                None, args.ip, "valid", message="Validation passed", categories=category_ids
+            )
+        elif verbose:
             print_section("DRY-RUN MODE")
             print_success("Report validation completed successfully")
             print_info("Use without --dry-run to submit the report")
@@ -468,8 +1536,8 @@ def main() -> int:
         return 0
     
     # Validate API key
-    api_key = os.getenv("ABUSEIPDB_API_KEY")
-    key_valid, key_error = validate_api_key(api_key)
+    api_key = get_api_key()
+    key_valid, key_error = validate_api_key_setting(api_key)
     if not key_valid:
         print_error(key_error)
         print_info("Set the API key with:")
@@ -477,22 +1545,37 @@ def main() -> int:
         return 1
     
     # Create client and submit report
-    if args.verbose:
+    if verbose:
         print_section("SUBMITTING REPORT")
     
-    client = AbuseIPDBClient(api_key)
-    result = client.submit_report(
-        ip=args.ip,
-        category_ids=category_ids,
-        comment=args.comment,
-        confidence=args.confidence
-    )
+    # A registry makes the client time connection setup as well
+    with AbuseIPDBClient(api_key, metrics=InMemoryMetrics() if verbose else None) as client:
+        result = client.submit_report(
+            ip=args.ip,
+            category_ids=category_ids,
+            comment=args.comment,
+            confidence=args.confidence
+        )
+    
+    if jsonl:
+        status = "submitted" if result.success else "failed"
+        message = result.message if result.success else f"{result.message}: {result.error}"
+        ResultWriter(sys.stdout, OUTPUT_JSONL).write(
+            None, args.ip, status, result.status_code, message, result, category_ids
+        )
+        return 0 if result.success else 1
+    
+    if verbose and result.attempts > 1:
+        print_info(f"Attempts: {result.attempts}")
+    if verbose and result.timings:
+        phases = ", ".join(f"{phase} {seconds * 1000:.1f}" for phase, seconds in result.timings.items() if seconds)
+        print_info(f"Latency: {result.latency * 1000:.1f} ms ({phases or 'no phases timed'} ms)")
     
     # Display results
     if result.success:
         print_success("Report submitted successfully")
         
-        if args.verbose and result.response_data:
+        if verbose and result.response_data:
             print("\nResponse JSON:")
             print(json.dumps(result.response_data, indent=2))
         
@@ -502,7 +1585,7 @@ def main() -> int:
         if result.error:
             print_error(f"Details: {result.error}")
         
-        if args.verbose and result.response_data:
+        if verbose and result.response_data:
             print("\nResponse JSON:")
             print(json.dumps(result.response_data, indent=2))
         
@@ -0,0 +1,293 @@
+"""Client metrics: a pluggable sink, an in-memory registry and exporters."""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, TextIO, Union
+
+
+# Metric names (Prometheus conventions)
+REQUESTS_TOTAL = "abuseipdb_requests_total"
+REQUEST_PHASE_SECONDS = "abuseipdb_request_phase_seconds"
+REQUESTS_IN_FLIGHT = "abuseipdb_requests_in_flight"
+REQUESTS_WAITING = "abuseipdb_requests_waiting"
+RETRIES_TOTAL = "abuseipdb_retries_total"
+CONNECTIONS_OPENED_TOTAL = "abuseipdb_connections_opened_total"
+QUOTA_REMAINING = "abuseipdb_quota_remaining"
+
+# Request phases, in the order they happen
+PHASE_WAIT = "rate_limit_wait"    # Blocked in the client-side rate limiter
+PHASE_CONNECT = "connect"         # DNS lookup and TCP connect (new connections only)
+PHASE_TLS = "tls"                 # TLS handshake (new connections only)
+PHASE_SERVER = "server"           # Request sent until response headers received
+PHASE_READ = "read"               # Response body download and parsing
+PHASE_BACKOFF = "backoff"         # Sleeping before a retry
+PHASE_TOTAL = "total"             # One attempt, rate-limit wait excluded
+PHASES = (PHASE_WAIT, PHASE_CONNECT, PHASE_TLS, PHASE_SERVER, PHASE_READ, PHASE_BACKOFF, PHASE_TOTAL)
+
+# Status classes, matching the outcomes build_report_result() distinguishes
+STATUS_2XX = "2xx"
+STATUS_4XX = "4xx"                # Any 4xx other than 400, 401 and 429
+STATUS_5XX = "5xx"
+STATUS_TIMEOUT = "timeout"
+STATUS_CONNECTION_ERROR = "connection_error"
+STATUS_ERROR = "error"            # Unexpected exception
+STATUS_NOT_SENT = "not_sent"      # Rate limiter gave up (quota exhausted)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DEFAULT_SUMMARY_INTERVAL = 10.0
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def status_class(status_code: int) -> str:
+    """Map an HTTP status code to its metrics label."""
+    if 200 <= status_code < 300:
+        return STATUS_2XX
+    if status_code in (400, 401, 429):
+        return str(status_code)
+    if status_code >= 500:
+        return STATUS_5XX
+    return STATUS_4XX
+
+
+class MetricsSink:
+    """
+    Interface the client reports to; the base class discards everything.
+    
+    Subclass it to forward measurements elsewhere (StatsD, OpenTelemetry,
+    a test double, ...). Every method must be thread-safe and cheap, as it
+    is called on the request path of every worker thread.
+    """
+    
+    def increment(self, name: str, labels: Labels = (), value: float = 1) -> None:
+        """Add to a counter."""
+    
+    def observe(self, name: str, value: float, labels: Labels = ()) -> None:
+        """Record one sample (e.g. a duration in seconds) in a histogram."""
+    
+    def adjust(self, name: str, delta: float, labels: Labels = ()) -> None:
+        """Move a gauge up or down."""
+    
+    def set(self, name: str, value: float, labels: Labels = ()) -> None:
+        """Set a gauge."""
+
+
+# Shared default for clients created without metrics
+NULL_METRICS = MetricsSink()
+
+
+class _Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+    
+    __slots__ = ("counts", "sum", "count")
+    
+    def __init__(self, buckets: int):
+        self.counts = [0] * (buckets + 1)    # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+
+class InMemoryMetrics(MetricsSink):
+    """
+    Thread-safe registry of counters, gauges and histograms.
+    
+    Series are keyed by metric name plus label tuple. render_prometheus()
+    exports everything in the Prometheus text format; summary() condenses
+    the request metrics into one human-readable line.
+    """
+    
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Initialize an empty registry.
+        
+        Args:
+            buckets: Upper bounds of the histogram buckets, ascending
+        """
+        self.buckets = buckets
+        self._counters: dict[tuple[str, Labels], float] = {}
+        self._gauges: dict[tuple[str, Labels], float] = {}
+        self._histograms: dict[tuple[str, Labels], _Histogram] = {}
+        self._lock = threading.Lock()
+    
+    def increment(self, name: str, labels: Labels = (), value: float = 1) -> None:
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+    
+    def observe(self, name: str, value: float, labels: Labels = ()) -> None:
+        key = (name, labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(len(self.buckets))
+            histogram.counts[index] += 1
+            histogram.sum += value
+            histogram.count += 1
+    
+    def adjust(self, name: str, delta: float, labels: Labels = ()) -> None:
+        key = (name, labels)
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0) + delta
+    
+    def set(self, name: str, value: float, labels: Labels = ()) -> None:
+        with self._lock:
+            self._gauges[(name, labels)] = value
+    
+    def render_prometheus(self) -> str:
+        """Return every series in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            histograms = sorted(
+                (key, (list(h.counts), h.sum, h.count)) for key, h in self._histograms.items()
+            )
+        
+        lines = []
+        for metric_type, series in (("counter", counters), ("gauge", gauges)):
+            declared = None
+            for (name, labels), value in series:
+                if name != declared:
+                    lines.append(f"# TYPE {name} {metric_type}")
+                    declared = name
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        
+        declared = None
+        for (name, labels), (counts, total, count) in histograms:
+            if name != declared:
+                lines.append(f"# TYPE {name} histogram")
+                declared = name
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        
+        return "\n".join(lines) + "\n"
+    
+    def write_prometheus(self, path: Union[str, Path]) -> None:
+        """Write render_prometheus() to a file atomically (textfile collectors)."""
+        path = Path(path)
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(temp_path, path)
+    
+    def summary(self) -> str:
+        """
+        Summarize request metrics across endpoints in one line, e.g.
+        "120 requests (118 2xx, 2 429), 1 retries | in flight 4, waiting 0 |
+        avg ms: rate_limit_wait 3.1, server 84.0, ... (2 connections)".
+        """
+        with self._lock:
+            statuses: dict[str, float] = {}
+            retries = connections = 0.0
+            for (name, labels), value in self._counters.items():
+                if name == REQUESTS_TOTAL:
+                    status = dict(labels).get("status", "")
+                    statuses[status] = statuses.get(status, 0) + value
+                elif name == RETRIES_TOTAL:
+                    retries += value
+                elif name == CONNECTIONS_OPENED_TOTAL:
+                    connections += value
+            
+            gauges = {REQUESTS_IN_FLIGHT: 0.0, REQUESTS_WAITING: 0.0}
+            for (name, _), value in self._gauges.items():
+                if name in gauges:
+                    gauges[name] += value
+            
+            phases: dict[str, list[float]] = {}
+            for (name, labels), histogram in self._histograms.items():
+                if name == REQUEST_PHASE_SECONDS:
+                    totals = phases.setdefault(dict(labels).get("phase", ""), [0.0, 0])
+                    totals[0] += histogram.sum
+                    totals[1] += histogram.count
+        
+        requests = int(sum(statuses.values()))
+        by_status = ", ".join(f"{int(count)} {status}" for status, count in sorted(statuses.items()))
+        text = f"{requests} requests ({by_status or 'none'}), {int(retries)} retries"
+        text += (f" | in flight {int(gauges[REQUESTS_IN_FLIGHT])},"
+                 f" waiting {int(gauges[REQUESTS_WAITING])}")
+        averages = [
+            f"{phase} {phases[phase][0] / phases[phase][1] * 1000:.1f}"
+            for phase in PHASES if phases.get(phase, (0, 0))[1]
+        ]
+        if averages:
+            text += " | avg ms: " + ", ".join(averages)
+        if connections:
+            text += f" ({int(connections)} connections opened)"
+        return text
+
+
+class MetricsReporter:
+    """
+    Background thread that hands an InMemoryMetrics registry to a set of
+    callbacks (print a summary, rewrite a Prometheus file, ...) every
+    ``interval`` seconds, and once more when stopped.
+    """
+    
+    def __init__(
+        self,
+        metrics: InMemoryMetrics,
+        callbacks: list[Callable[[InMemoryMetrics], None]],
+        interval: float = DEFAULT_SUMMARY_INTERVAL
+    ):
+        """
+        Start reporting.
+        
+        Args:
+            metrics: Registry to report
+            callbacks: Called with the registry on every tick
+            interval: Seconds between ticks
+        """
+        self.metrics = metrics
+        self.callbacks = callbacks
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-reporter", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop the thread and report a final time."""
+        self._stop.set()
+        self._thread.join()
+        self._report()
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._report()
+    
+    def _report(self) -> None:
+        for callback in self.callbacks:
+            callback(self.metrics)
+
+
+def print_summary(out: TextIO) -> Callable[[InMemoryMetrics], None]:
+    """Return a MetricsReporter callback printing summary() lines to ``out``."""
+    def report(metrics: InMemoryMetrics) -> None:
+        out.write(f"[metrics {time.strftime('%H:%M:%S')}] {metrics.summary()}\n")
+        out.flush()
+    return report
+
+
+def _format_labels(labels: Labels) -> str:
+    """Render a label tuple as {name="value",...} (empty without labels)."""
+    if not labels:
+        return ""
+    escaped = (
+        name + '="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for name, value in labels
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value the way Prometheus clients do."""
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
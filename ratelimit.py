@@ -0,0 +1,150 @@
+"""Client-side rate limiting driven by AbuseIPDB quota headers."""
+
+import threading
+import time
+from typing import Mapping, Optional
+
+
+DEFAULT_RATE = 10.0      # Requests per second
+DEFAULT_BURST = 10       # Requests allowed back-to-back
+DEFAULT_MAX_WAIT = 60.0  # Longest a caller will block before giving up
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket that also tracks the server-side quota.
+    
+    One limiter is shared by every request made through a client, including
+    the worker threads of a concurrent bulk run. Besides local pacing it
+    follows the X-RateLimit-Limit / X-RateLimit-Remaining /
+    X-RateLimit-Reset and Retry-After response headers, so callers stop
+    sending once the quota is spent instead of collecting 429 responses.
+    """
+    
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        max_wait: float = DEFAULT_MAX_WAIT
+    ):
+        """
+        Initialize the rate limiter.
+        
+        Args:
+            rate: Sustained requests per second
+            burst: Bucket capacity (requests allowed back-to-back)
+            max_wait: Maximum seconds acquire() blocks before giving up
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._reset_at: Optional[float] = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> bool:
+        """
+        Wait for permission to send one request.
+        
+        Every successful acquire() must be followed by exactly one update()
+        once the request has finished (with or without a response).
+        
+        Returns:
+            True if the request may be sent, False if the wait would
+            exceed ``max_wait`` (e.g. the daily quota is exhausted)
+        """
+        deadline = time.monotonic() + self.max_wait
+        
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                
+                if self._reset_at is not None and now >= self._reset_at:
+                    # Quota window rolled over; trust the next response again
+                    self.remaining = None
+                    self._reset_at = None
+                
+                wait = self._blocked_until - now
+                if wait <= 0 and self.remaining is not None and self.remaining <= 0:
+                    if self._reset_at is None:
+                        # Unknown reset time: let the server tell us via 429
+                        wait = 0
+                    else:
+                        wait = self._reset_at - now
+                
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        self._in_flight += 1
+                        if self.remaining is not None:
+                            self.remaining -= 1
+                        return True
+                    wait = (1 - self._tokens) / self.rate
+            
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+    
+    def update(self, headers: Optional[Mapping[str, str]] = None) -> None:
+        """
+        Record the outcome of a request started with acquire().
+        
+        Args:
+            headers: Response headers, or None if no response was received
+        """
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            if not headers:
+                return
+            
+            now = time.monotonic()
+            limit = _int_header(headers, "X-RateLimit-Limit")
+            remaining = _int_header(headers, "X-RateLimit-Remaining")
+            reset = _int_header(headers, "X-RateLimit-Reset")
+            retry_after = _int_header(headers, "Retry-After")
+            
+            if limit is not None:
+                self.limit = limit
+            if remaining is not None:
+                # Requests still in flight were sent after this one
+                self.remaining = remaining - self._in_flight
+            if reset is not None:
+                self._reset_at = now + max(0, reset - time.time())
+            if retry_after is not None:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+    
+    def available_in(self) -> float:
+        """
+        Return the seconds until Retry-After has passed and, if the quota
+        is spent, the quota window has reset (0 if neither blocks).
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = self._blocked_until - now
+            if self.remaining is not None and self.remaining <= 0 and self._reset_at is not None:
+                wait = max(wait, self._reset_at - now)
+            return max(0.0, wait)
+    
+    def _refill(self, now: float) -> None:
+        """Add tokens for the time elapsed since the last refill."""
+        elapsed = now - self._refilled_at
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._refilled_at = now
+
+
+def _int_header(headers: Mapping[str, str], name: str) -> Optional[int]:
+    """Read an integer header, ignoring missing or malformed values."""
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,196 @@
+"""Two-tier cache of /check lookups: an in-memory LRU over SQLite."""
+
+import json
+import threading
+import time
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from validators import pack_ip
+
+
+DEFAULT_CHECK_CACHE_FILE = ".abuse_reporter_check.sqlite3"
+DEFAULT_CHECK_TTL = 6 * 60 * 60    # Reputation changes slowly; refresh after 6 hours
+DEFAULT_MEMORY_SIZE = 10000        # Lookups kept in memory
+
+MEMORY_HIT = "memory_hits"
+DISK_HIT = "disk_hits"
+MISS = "misses"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checks (
+    ip BLOB NOT NULL,
+    max_age_days INTEGER NOT NULL,
+    fetched REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (ip, max_age_days)
+) WITHOUT ROWID;
+"""
+
+
+class ReputationCache:
+    """
+    TTL cache of /check responses, memory first and SQLite second.
+    
+    Entries are keyed on the packed IP (16 bytes, so IPv4 and IPv6 share
+    one key space and every spelling of an address hits the same row)
+    together with the lookup's maxAgeInDays. The memory tier is an LRU of
+    ``memory_size`` entries; disk hits are promoted into it. Without a
+    path only the memory tier is used. Safe to share between threads.
+    """
+    
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        ttl: float = DEFAULT_CHECK_TTL,
+        memory_size: int = DEFAULT_MEMORY_SIZE
+    ):
+        """
+        Initialize the cache, opening (or creating) the database at ``path``.
+        
+        Args:
+            path: SQLite database file, or None for memory only
+            ttl: Seconds a lookup stays valid
+            memory_size: Maximum number of lookups kept in memory
+        """
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.memory_size = memory_size
+        self.counts: Counter = Counter()
+        
+        self._memory: "OrderedDict[tuple[bytes, int], tuple[float, dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        
+        if self.path:
+            import sqlite3    # Only lookups with a disk cache need it
+            
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+    
+    def __enter__(self) -> "ReputationCache":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def get(self, ip: str, max_age_days: int) -> Optional[dict[str, Any]]:
+        """
+        Return the cached ``data`` object of a /check response.
+        
+        Args:
+            ip: IP address looked up
+            max_age_days: maxAgeInDays of the lookup
+            
+        Returns:
+            The cached data, or None if missing or older than the TTL
+        """
+        key = _cache_key(ip, max_age_days)
+        if key is None:
+            return None
+        cutoff = time.time() - self.ttl
+        
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > cutoff:
+                    self._memory.move_to_end(key)
+                    self.counts[MEMORY_HIT] += 1
+                    return entry[1]
+                del self._memory[key]
+            
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT fetched, data FROM checks WHERE ip = ? AND max_age_days = ?",
+                    key
+                ).fetchone()
+                if row is not None and row[0] > cutoff:
+                    data = json.loads(row[1])
+                    self._remember(key, row[0], data)
+                    self.counts[DISK_HIT] += 1
+                    return data
+            
+            self.counts[MISS] += 1
+            return None
+    
+    def put(self, ip: str, max_age_days: int, data: dict[str, Any]) -> None:
+        """
+        Store the ``data`` object of a successful /check response.
+        
+        Args:
+            ip: IP address looked up
+            max_age_days: maxAgeInDays of the lookup
+            data: The response's ``data`` object
+        """
+        key = _cache_key(ip, max_age_days)
+        if key is None:
+            return
+        now = time.time()
+        
+        with self._lock:
+            self._remember(key, now, data)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO checks (ip, max_age_days, fetched, data) "
+                    "VALUES (?, ?, ?, ?)",
+                    key + (now, json.dumps(data, separators=(",", ":")))
+                )
+                self._conn.commit()
+    
+    def purge(self) -> int:
+        """
+        Delete expired lookups from both tiers.
+        
+        Returns:
+            Number of rows deleted from the database
+        """
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            for key in [key for key, (fetched, _) in self._memory.items() if fetched <= cutoff]:
+                del self._memory[key]
+            if self._conn is None:
+                return 0
+            deleted = self._conn.execute("DELETE FROM checks WHERE fetched <= ?", (cutoff,)).rowcount
+            self._conn.commit()
+            return deleted
+    
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters, the hit rate and the memory tier size."""
+        with self._lock:
+            stats = {name: self.counts[name] for name in (MEMORY_HIT, DISK_HIT, MISS)}
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats[MEMORY_HIT] + stats[DISK_HIT] + stats[MISS]
+        stats["hit_rate"] = (stats[MEMORY_HIT] + stats[DISK_HIT]) / lookups if lookups else 0.0
+        return stats
+    
+    def summary(self) -> str:
+        """Return the statistics as one line, e.g. for a run summary."""
+        stats = self.stats()
+        return (f"{stats[MEMORY_HIT]} memory hits, {stats[DISK_HIT]} disk hits, "
+                f"{stats[MISS]} misses ({stats['hit_rate']:.0%} hit rate)")
+    
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    def _remember(self, key: tuple[bytes, int], fetched: float, data: dict[str, Any]) -> None:
+        """Insert into the memory tier, evicting the least recently used entry."""
+        self._memory[key] = (fetched, data)
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+
+def _cache_key(ip: str, max_age_days: int) -> Optional[tuple[bytes, int]]:
+    """Return the (packed IP, max age) key, or None for an invalid IP."""
+    packed = pack_ip(ip)
+    if packed is None:
+        return None
+    return packed.to_bytes(16, "big"), max_age_days
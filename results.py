@@ -0,0 +1,115 @@
+"""Per-report result records for --input, --follow, --serve and --check."""
+
+import json
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, TextIO, Union
+
+if TYPE_CHECKING:
+    from client import CheckResult, ReportResult
+
+
+OUTPUT_TEXT = "text"
+OUTPUT_JSONL = "jsonl"
+OUTPUT_FORMATS = (OUTPUT_TEXT, OUTPUT_JSONL)
+WRITE_BUFFER_SIZE = 1024 * 1024    # Bytes buffered before a result file is written
+
+# Compact separators, no indentation: one record per line
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+
+class ResultWriter:
+    """
+    Writes one record per report, as a tab-separated line or as JSONL.
+    
+    Text lines are "line<TAB>ip<TAB>status<TAB>code<TAB>message". JSONL
+    records carry the same fields plus the categories, latency (seconds),
+    attempt count and error, for tools that consume results directly:
+    
+        {"line":3,"ip":"1.2.3.7","status":"submitted","categories":[18,22],
+         "status_code":200,"latency":0.0841,"attempts":1,"error":null,
+         "message":"Report submitted successfully"}
+         
+    Writes are buffered; callers flush() at the points where a reader
+    should see the results (after each batch in the daemon modes).
+    """
+    
+    def __init__(self, out: TextIO, output_format: str = OUTPUT_TEXT):
+        """
+        Initialize the writer.
+        
+        Args:
+            out: Stream the records are written to
+            output_format: OUTPUT_TEXT or OUTPUT_JSONL
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+        self.out = out
+        self.jsonl = output_format == OUTPUT_JSONL
+    
+    @classmethod
+    def open(cls, path: Union[str, Path], output_format: str = OUTPUT_TEXT, mode: str = "w") -> "ResultWriter":
+        """
+        Open a writer on a file, or on stdout for "-".
+        
+        Raises:
+            OSError: If the file cannot be opened
+        """
+        if str(path) == "-":
+            return cls(sys.stdout, output_format)
+        return cls(open(path, mode, encoding="utf-8", buffering=WRITE_BUFFER_SIZE), output_format)
+    
+    def write(
+        self,
+        line_number: Optional[int],
+        ip: Optional[str],
+        status: str,
+        status_code: Optional[int] = None,
+        message: str = "",
+        result: Optional[Union["ReportResult", "CheckResult"]] = None,
+        categories: Optional[list[int]] = None,
+        data: Optional[dict[str, Any]] = None
+    ) -> None:
+        """
+        Write one record.
+        
+        Args:
+            line_number: Input line (or tracking ID) of the report, None
+                for a single --ip
+            ip: Reported IP, if known
+            status: Outcome (submitted, failed, invalid, filtered, ...)
+            status_code: HTTP status code of the response, if any
+            message: Human-readable description of the outcome
+            result: Result of the API call, for latency, attempts and error
+            categories: Category IDs of the report
+            data: Extra payload (JSONL only), e.g. a /check response
+        """
+        if not self.jsonl:
+            self.out.write(f"{'-' if line_number is None else line_number}\t{ip or '-'}\t{status}\t{status_code or '-'}\t{message}\n")
+            return
+        
+        record = {
+            "line": line_number,
+            "ip": ip,
+            "status": status,
+            "categories": categories,
+            "status_code": status_code,
+            "latency": round(result.latency, 6) if result is not None else None,
+            "attempts": result.attempts if result is not None else 0,
+            "error": result.error if result is not None else None,
+            "message": message,
+        }
+        if data is not None:
+            record["data"] = data
+        self.out.write(_encode(record) + "\n")
+    
+    def flush(self) -> None:
+        """Hand buffered records to the reader."""
+        self.out.flush()
+    
+    def close(self) -> None:
+        """Flush, and close the stream unless it is stdout."""
+        if self.out is sys.stdout:
+            self.out.flush()
+        else:
+            self.out.close()
@@ -0,0 +1,339 @@
+"""Local HTTP endpoint through which other processes enqueue reports."""
+
+import json
+import queue
+import socket
+import threading
+from collections import Counter, OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from typing import Any, Callable, Optional
+
+from bulk import submit_bulk, DEFAULT_CONCURRENCY
+from client import AbuseIPDBClient, BulkReport, ReportResult
+from dedup import RecentReportCache
+from ingest import InputRecord, record_from_mapping
+from metrics import InMemoryMetrics
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8787
+MAX_BODY_SIZE = 1024 * 1024      # Bytes per request
+MAX_BATCH_SIZE = 1000            # Reports per request
+MAX_QUEUED = 100000              # Reports waiting to be sent before requests get 503
+MAX_TRACKED = 100000             # Finished reports whose status can still be looked up
+DISPATCH_BATCH_SIZE = 500        # Reports sent together at most
+
+QUEUED = "queued"
+SUBMITTED = "submitted"
+FAILED = "failed"
+DUPLICATE = "duplicate"
+VALID = "valid"
+QUEUE_FULL_ERROR = "Submission queue is full, retry later"
+
+# Turns a request record into a report, or returns (None, error_message)
+RecordValidator = Callable[[InputRecord], tuple[Optional[BulkReport], Optional[str]]]
+# Called on the dispatcher thread with (tracking_id, report, status, result)
+ResultCallback = Callable[[int, BulkReport, str, Optional[ReportResult]], None]
+
+
+class IngestService:
+    """
+    In-process submission pipeline shared by every HTTP request.
+    
+    Requests only validate and enqueue, so they return immediately. One
+    dispatcher thread drains the queue in batches and sends each batch
+    with submit_bulk() on a single client; under load, batches grow large
+    enough to go through the /bulk-report endpoint (when every report in
+    the batch has confidence 100). Every accepted report
+    gets a tracking ID whose status can be looked up until MAX_TRACKED
+    newer reports have been accepted.
+    """
+    
+    def __init__(
+        self,
+        client: Optional[AbuseIPDBClient],
+        validate: RecordValidator,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        cache: Optional[RecentReportCache] = None,
+        on_result: Optional[ResultCallback] = None
+    ):
+        """
+        Start the dispatcher thread.
+        
+        Args:
+            client: Client used for every submission, or None to only
+                validate (dry-run)
+            validate: Converts a request record into a BulkReport
+            concurrency: Worker threads per submitted batch
+            cache: Optional recent-report cache used to drop duplicates
+            on_result: Optional callback for each finished report
+        """
+        self.client = client
+        self.validate = validate
+        self.concurrency = concurrency
+        self.cache = cache
+        self.on_result = on_result
+        self.counts: Counter = Counter()
+        
+        self._queue: queue.Queue = queue.Queue(MAX_QUEUED)
+        self._ids = count(1)
+        self._status: "OrderedDict[int, dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._dispatch, name="ingest-dispatch", daemon=True)
+        self._thread.start()
+    
+    def enqueue(self, data: Any) -> dict[str, Any]:
+        """
+        Validate one submitted JSON value and queue it for submission.
+        
+        Args:
+            data: Decoded JSON object with ip, categories, comment and
+                confidence fields
+                
+        Returns:
+            {"id", "ip", "status"} for an accepted report, or {"error"}
+        """
+        if not isinstance(data, dict):
+            report, error = None, "Expected a JSON object"
+        else:
+            report, error = self.validate(record_from_mapping(data, 0))
+        if report is None:
+            with self._lock:
+                self.counts["invalid"] += 1
+            return {"error": error}
+        
+        tracking_id = next(self._ids)
+        entry = {"id": tracking_id, "ip": report.ip, "status": QUEUED}
+        with self._lock:
+            self._status[tracking_id] = entry
+            while len(self._status) > MAX_TRACKED:
+                self._status.popitem(last=False)
+        try:
+            self._queue.put_nowait((tracking_id, report))
+        except queue.Full:
+            with self._lock:
+                self._status.pop(tracking_id, None)
+                self.counts["rejected"] += 1
+            return {"error": QUEUE_FULL_ERROR}
+        return dict(entry)
+    
+    def status(self, tracking_id: int) -> Optional[dict[str, Any]]:
+        """Return the status of a tracked report, or None if unknown."""
+        with self._lock:
+            entry = self._status.get(tracking_id)
+            return dict(entry) if entry else None
+    
+    def stats(self) -> dict[str, int]:
+        """Return the number of reports per outcome plus the queue depth."""
+        with self._lock:
+            stats = dict(self.counts)
+        stats[QUEUED] = self._queue.qsize()
+        return stats
+    
+    def close(self) -> None:
+        """Submit everything still queued, then stop the dispatcher."""
+        self._queue.put(None)
+        self._thread.join()
+    
+    def _dispatch(self) -> None:
+        """Drain the queue in batches until close() is called."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            while len(batch) < DISPATCH_BATCH_SIZE:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._submit(batch)
+                    return
+                batch.append(item)
+            self._submit(batch)
+    
+    def _submit(self, batch: list[tuple[int, BulkReport]]) -> None:
+        """Send one batch and record each report's outcome."""
+        due = []
+        for tracking_id, report in batch:
+            if self.cache and not self.cache.check(report.ip):
+                self._finish(tracking_id, report, DUPLICATE, None)
+            else:
+                due.append((tracking_id, report))
+        
+        if self.client is None:
+            for tracking_id, report in due:
+                self._finish(tracking_id, report, VALID, None)
+            return
+        if not due:
+            return
+        
+        results = submit_bulk(self.client, [report for _, report in due], self.concurrency)
+        for (tracking_id, report), result in zip(due, results):
+            if self.cache and not result.success:
+                self.cache.forget(report.ip)
+            self._finish(tracking_id, report, SUBMITTED if result.success else FAILED, result)
+    
+    def _finish(
+        self,
+        tracking_id: int,
+        report: BulkReport,
+        status: str,
+        result: Optional[ReportResult]
+    ) -> None:
+        """Record a report's final status."""
+        with self._lock:
+            self.counts[status] += 1
+            entry = self._status.get(tracking_id)
+            if entry is not None:
+                entry["status"] = status
+                if result is not None:
+                    entry["status_code"] = result.status_code
+                    entry["message"] = result.message if result.success else result.error
+        if self.on_result:
+            self.on_result(tracking_id, report, status, result)
+
+
+class IngestRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API of the ingest server.
+    
+    POST /reports        one report object, or an array of up to
+                         MAX_BATCH_SIZE; answers 202 with a tracking ID
+                         (or error) per report
+    GET  /reports/<id>   status of a tracked report
+    GET  /status         counts per outcome and current queue depth
+    GET  /metrics        client metrics in the Prometheus text format
+                         (404 unless the server was given a registry)
+    """
+    
+    protocol_version = "HTTP/1.1"    # Keep-alive, so clients reuse connections
+    server_version = "abuse-reporter"
+    # Buffer each response so headers and body leave in one send, and never
+    # let Nagle hold a response back waiting for the client's delayed ACK
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") != "/reports":
+            self._send_json(404, {"error": "Not found"})
+            return
+        
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self.close_connection = True
+            self._send_json(411, {"error": "Content-Length is required"})
+            return
+        if length < 0:
+            # rfile.read() with a negative size would block until EOF
+            self.close_connection = True
+            self._send_json(400, {"error": "Invalid Content-Length"})
+            return
+        if length > MAX_BODY_SIZE:
+            self.close_connection = True
+            self._send_json(413, {"error": f"Request body exceeds {MAX_BODY_SIZE} bytes"})
+            return
+        
+        try:
+            data = json.loads(self.rfile.read(length))
+        except ValueError:
+            self._send_json(400, {"error": "Invalid JSON"})
+            return
+        
+        service: IngestService = self.server.service
+        if not isinstance(data, list):
+            result = service.enqueue(data)
+            if "error" not in result:
+                self._send_json(202, result)
+            else:
+                self._send_json(503 if result["error"] == QUEUE_FULL_ERROR else 400, result)
+            return
+        
+        if len(data) > MAX_BATCH_SIZE:
+            self._send_json(413, {"error": f"Batch exceeds {MAX_BATCH_SIZE} reports"})
+            return
+        results = [service.enqueue(item) for item in data]
+        accepted = sum(1 for result in results if "error" not in result)
+        if accepted or not results:
+            code = 202
+        elif any(result["error"] == QUEUE_FULL_ERROR for result in results):
+            code = 503
+        else:
+            code = 400
+        self._send_json(code, {"accepted": accepted, "results": results})
+    
+    def do_GET(self) -> None:
+        service: IngestService = self.server.service
+        path = self.path.rstrip("/")
+        if path == "/status":
+            self._send_json(200, service.stats())
+            return
+        metrics: Optional[InMemoryMetrics] = self.server.metrics
+        if path == "/metrics" and metrics is not None:
+            payload = metrics.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+        
+        prefix, _, tracking_id = path.rpartition("/")
+        entry = None
+        if prefix == "/reports" and tracking_id.isdigit():
+            entry = service.status(int(tracking_id))
+        if entry is None:
+            self._send_json(404, {"error": "Not found"})
+        else:
+            self._send_json(200, entry)
+    
+    def log_message(self, format: str, *args: Any) -> None:
+        """Stay quiet; results are written by the service instead."""
+    
+    def _send_json(self, code: int, body: Any) -> None:
+        payload = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class IngestServer(ThreadingHTTPServer):
+    """Threaded HTTP server bound to an IngestService."""
+    
+    daemon_threads = True
+    request_queue_size = 128
+    
+    def __init__(
+        self,
+        address: tuple[str, int],
+        service: IngestService,
+        metrics: Optional[InMemoryMetrics] = None
+    ):
+        # parse_listen_address() accepts "[::1]:PORT"; IPv6 hosts need an IPv6 socket
+        if ":" in address[0]:
+            self.address_family = socket.AF_INET6
+        super().__init__(address, IngestRequestHandler)
+        self.service = service
+        self.metrics = metrics
+
+
+def parse_listen_address(text: str) -> tuple[str, int]:
+    """
+    Parse "PORT" or "HOST:PORT" (host defaults to DEFAULT_HOST; an empty
+    string means DEFAULT_HOST:DEFAULT_PORT).
+    
+    Raises:
+        ValueError: If the port is not a number from 1 to 65535
+    """
+    if not text:
+        return DEFAULT_HOST, DEFAULT_PORT
+    host, _, port = text.rpartition(":")
+    host = host.strip("[]") or DEFAULT_HOST
+    if not port.isdigit() or not 0 < int(port) < 65536:
+        raise ValueError(f"Invalid listen address: {text}")
+    return host, int(port)
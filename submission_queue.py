@@ -0,0 +1,251 @@
+"""Durable on-disk queue of bulk submissions (SQLite, WAL mode)."""
+
+import time
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from client import BulkReport, ReportResult
+
+
+DEFAULT_QUEUE_FILE = ".abuse_reporter_queue.sqlite3"
+DEFAULT_BATCH_SIZE = 200        # Writes per commit
+DEFAULT_FLUSH_INTERVAL = 1.0    # Seconds between commits at most
+DEFAULT_COMPACT_EVERY = 10000   # Completions between compactions
+PENDING_PAGE_SIZE = 1000
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    ip TEXT NOT NULL,
+    category_ids TEXT NOT NULL,
+    comment TEXT NOT NULL,
+    confidence INTEGER NOT NULL,
+    line_number INTEGER,
+    status TEXT NOT NULL DEFAULT 'pending',
+    status_code INTEGER,
+    message TEXT,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reports_status ON reports (status, id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class SubmissionQueue:
+    """
+    Crash-safe journal of reports waiting to be (or already) submitted.
+    
+    Reports are recorded as pending before they are sent and marked done
+    or failed once a result arrives. Writes are committed in batches, so a
+    crash can at worst re-send the last uncommitted batch; it never loses
+    a report. Transient failures (timeouts, 429, 5xx, exhausted quota) stay
+    pending so a resumed run retries them. Completed rows are deleted
+    periodically to keep the file small.
+    """
+    
+    def __init__(
+        self,
+        path: Union[str, Path],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        compact_every: int = DEFAULT_COMPACT_EVERY
+    ):
+        """
+        Open (or create) a queue file.
+        
+        Args:
+            path: SQLite database file
+            batch_size: Number of writes grouped into one commit
+            flush_interval: Maximum seconds between commits
+            compact_every: Number of completions between compactions
+        """
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+        
+        import sqlite3    # Only --queue runs and the GUI need it
+        
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+        self._completed_since_compact = 0
+    
+    def __enter__(self) -> "SubmissionQueue":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Commit outstanding writes and close the database."""
+        self.flush()
+        self._conn.close()
+    
+    def enqueue(
+        self,
+        report: BulkReport,
+        line_number: Optional[int] = None,
+        resume_line: Optional[int] = None
+    ) -> int:
+        """
+        Record a report as pending.
+        
+        Args:
+            report: The report about to be submitted
+            line_number: Input line the report came from, if any
+            resume_line: Last input line fully handled once this report is
+                queued (defaults to ``line_number``)
+                
+        Returns:
+            Queue entry ID, used later with complete()
+        """
+        cursor = self._conn.execute(
+            "INSERT INTO reports (ip, category_ids, comment, confidence, line_number, updated) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                report.ip,
+                ",".join(str(cid) for cid in report.category_ids),
+                report.comment,
+                report.confidence,
+                line_number,
+                time.time()
+            )
+        )
+        if resume_line is None:
+            resume_line = line_number
+        if resume_line is not None:
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('last_line', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = MAX(value, excluded.value)",
+                (resume_line,)
+            )
+        self._wrote()
+        return cursor.lastrowid
+    
+    def complete(self, entry_id: int, result: ReportResult) -> None:
+        """
+        Record the outcome of a queued report.
+        
+        Args:
+            entry_id: ID returned by enqueue()
+            result: The submission result
+        """
+        if result.success:
+            status = DONE
+        elif is_transient(result):
+            status = PENDING
+        else:
+            status = FAILED
+        
+        self._conn.execute(
+            "UPDATE reports SET status = ?, status_code = ?, message = ?, updated = ? WHERE id = ?",
+            (status, result.status_code, result.error or result.message, time.time(), entry_id)
+        )
+        if status != PENDING:
+            self._completed_since_compact += 1
+        self._wrote()
+    
+    def pending(self) -> Iterator[tuple[int, Optional[int], BulkReport]]:
+        """
+        Iterate over pending reports, oldest first.
+        
+        Rows are read a page at a time, so complete() may be called while
+        iterating.
+        
+        Yields:
+            Tuples of (entry_id, line_number, report)
+        """
+        self.flush()
+        last_id = 0
+        while True:
+            rows = self._conn.execute(
+                "SELECT id, line_number, ip, category_ids, comment, confidence FROM reports "
+                "WHERE status = ? AND id > ? ORDER BY id LIMIT ?",
+                (PENDING, last_id, PENDING_PAGE_SIZE)
+            ).fetchall()
+            if not rows:
+                return
+            for entry_id, line_number, ip, category_ids, comment, confidence in rows:
+                last_id = entry_id
+                report = BulkReport(
+                    ip=ip,
+                    category_ids=[int(cid) for cid in category_ids.split(",") if cid],
+                    comment=comment,
+                    confidence=confidence
+                )
+                yield entry_id, line_number, report
+    
+    def pending_count(self) -> int:
+        """Return the number of reports still waiting to be submitted."""
+        self.flush()
+        row = self._conn.execute(
+            "SELECT COUNT(*) FROM reports WHERE status = ?", (PENDING,)
+        ).fetchone()
+        return row[0]
+    
+    def last_line_number(self) -> int:
+        """Return the input line a resumed run should continue after (0 if none)."""
+        self.flush()
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'last_line'"
+        ).fetchone()
+        return row[0] if row else 0
+    
+    def reset(self) -> None:
+        """Forget every entry, including pending ones and the input position."""
+        self._conn.execute("DELETE FROM reports")
+        self._conn.execute("DELETE FROM meta")
+        self._conn.commit()
+        self._uncommitted = 0
+    
+    def flush(self) -> None:
+        """Commit outstanding writes."""
+        if self._uncommitted:
+            self._conn.commit()
+            self._uncommitted = 0
+        self._last_commit = time.monotonic()
+    
+    def compact(self) -> None:
+        """Delete completed entries and shrink the write-ahead log."""
+        self._conn.execute("DELETE FROM reports WHERE status != ?", (PENDING,))
+        self._conn.commit()
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._uncommitted = 0
+        self._completed_since_compact = 0
+    
+    def _wrote(self) -> None:
+        """Count a write and commit/compact when a batch is due."""
+        self._uncommitted += 1
+        if (self._uncommitted >= self.batch_size
+                or time.monotonic() - self._last_commit >= self.flush_interval):
+            self.flush()
+            if self._completed_since_compact >= self.compact_every:
+                self.compact()
+
+
+def is_transient(result: ReportResult) -> bool:
+    """
+    Return True if a failed result is worth retrying in a later run.
+    
+    Args:
+        result: A failed submission result
+        
+    Returns:
+        True for timeouts, connection errors, 429 and 5xx responses
+    """
+    if result.status_code is None:
+        return result.message != "Unexpected error"
+    return result.status_code == 429 or result.status_code >= 500
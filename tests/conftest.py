@@ -0,0 +1,44 @@
+"""Shared fixtures: import paths and a local mock AbuseIPDB server."""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import client  # noqa: E402
+from mock_server import MockAbuseIPDB, MockConfig  # noqa: E402
+
+
+TEST_API_KEY = "a" * 80
+
+
+@pytest.fixture
+def mock_api(monkeypatch):
+    """
+    Start a mock server and point the client's endpoints at it.
+    
+    Yields a function that applies a MockConfig and returns the server.
+    """
+    server = MockAbuseIPDB(("127.0.0.1", 0), MockConfig())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    for name, path in (
+        ("API_ENDPOINT", "/api/v2/report"),
+        ("BULK_API_ENDPOINT", "/api/v2/bulk-report"),
+        ("CHECK_API_ENDPOINT", "/api/v2/check"),
+        ("BLACKLIST_API_ENDPOINT", "/api/v2/blacklist"),
+    ):
+        monkeypatch.setattr(client, name, server.url + path)
+    
+    def configure(config: MockConfig = MockConfig()) -> MockAbuseIPDB:
+        server.state.config = config
+        return server
+    
+    yield configure
+    server.shutdown()
+    server.server_close()
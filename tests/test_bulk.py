@@ -0,0 +1,44 @@
+"""Tests for the bulk submission engine."""
+
+from bulk import BULK_ENDPOINT_THRESHOLD, submit_bulk
+from client import BulkReport, ReportResult
+
+
+class RecordingClient:
+    """Stands in for AbuseIPDBClient and records which endpoint was used."""
+    
+    def __init__(self):
+        self.single = 0
+        self.bulk = 0
+    
+    def submit_report(self, ip, category_ids, comment="", confidence=100):
+        self.single += 1
+        return ReportResult(success=True, message="ok")
+    
+    def iter_bulk_report(self, reports):
+        for _ in reports:
+            self.bulk += 1
+            yield ReportResult(success=True, message="ok")
+
+
+def make_reports(confidence: int) -> list[BulkReport]:
+    return [
+        BulkReport(f"8.8.{index // 256}.{index % 256}", [18], "test", confidence)
+        for index in range(BULK_ENDPOINT_THRESHOLD)
+    ]
+
+
+def test_large_batch_uses_bulk_endpoint():
+    api = RecordingClient()
+    results = submit_bulk(api, make_reports(100))
+    assert all(result.success for result in results)
+    assert (api.bulk, api.single) == (BULK_ENDPOINT_THRESHOLD, 0)
+
+
+def test_confidence_below_100_keeps_single_reports():
+    # /bulk-report would silently drop the confidence
+    reports = make_reports(100)
+    reports[-1] = BulkReport("1.1.1.1", [18], "test", 75)
+    api = RecordingClient()
+    submit_bulk(api, reports)
+    assert (api.bulk, api.single) == (0, BULK_ENDPOINT_THRESHOLD)
@@ -0,0 +1,34 @@
+"""Tests for AbuseIPDBClient against the mock server."""
+
+from bulk import BULK_ENDPOINT_THRESHOLD, submit_bulk
+from client import AbuseIPDBClient, BulkReport
+from mock_server import MockConfig
+
+from conftest import TEST_API_KEY
+
+
+def test_bulk_quota_does_not_block_single_reports(mock_api):
+    # /bulk-report allows 5 uploads a day; spending them must leave /report alone
+    server = mock_api(MockConfig(quota=1))
+    with AbuseIPDBClient(TEST_API_KEY) as api:
+        results = api.submit_bulk_report([BulkReport("8.8.8.8", [18], "test")])
+        assert results[0].success
+        assert api.bulk_rate_limiter.remaining == 0
+        
+        result = api.submit_report("8.8.4.4", [18], "test")
+    
+    assert result.success, result.error
+    assert result.status_code == 200
+    assert server.state.stats()["counts"]["requests"] == 2
+
+
+def test_throttled_bulk_upload_falls_back_to_single_reports(mock_api):
+    # Once /bulk-report's quota is spent, a large batch must still be reported
+    server = mock_api(MockConfig(bulk_quota=1, retry_after=3600))
+    reports = [BulkReport(f"8.8.{index // 256}.{index % 256}", [18], "test") for index in range(2 * BULK_ENDPOINT_THRESHOLD)]
+    with AbuseIPDBClient(TEST_API_KEY) as api:
+        first = submit_bulk(api, reports[:BULK_ENDPOINT_THRESHOLD])
+        second = submit_bulk(api, reports[BULK_ENDPOINT_THRESHOLD:])
+    
+    assert all(result.success for result in first + second)
+    assert server.state.stats()["counts"]["requests"] == 1 + BULK_ENDPOINT_THRESHOLD
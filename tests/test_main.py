@@ -0,0 +1,68 @@
+"""Tests for the command-line modes, run against the mock server."""
+
+import sys
+
+import main
+from bulk import BulkReport
+from dedup import RecentReportCache
+from submission_queue import SubmissionQueue
+
+from conftest import TEST_API_KEY
+
+
+def run_main(monkeypatch, *argv: str) -> int:
+    monkeypatch.setenv("ABUSEIPDB_API_KEY", TEST_API_KEY)
+    monkeypatch.delenv("ABUSEIPDB_API_KEYS", raising=False)
+    monkeypatch.setattr(sys, "argv", ["main.py", *argv])
+    return main.main()
+
+
+def resume_args(tmp_path) -> list[str]:
+    return [
+        "--resume",
+        "--queue", str(tmp_path / "queue.sqlite3"),
+        "--dedup-cache", str(tmp_path / "cache.json"),
+        "--results", str(tmp_path / "results.txt"),
+    ]
+
+
+def queue_pending(tmp_path, ip: str) -> None:
+    with SubmissionQueue(tmp_path / "queue.sqlite3") as queue:
+        queue.enqueue(BulkReport(ip, [18], "test"), 1, 1)
+
+
+def test_resumed_reports_are_recorded_in_dedup_cache(mock_api, monkeypatch, tmp_path):
+    server = mock_api()
+    queue_pending(tmp_path, "8.8.8.8")
+    
+    assert run_main(monkeypatch, *resume_args(tmp_path)) == 0
+    
+    assert server.state.stats()["counts"]["requests"] == 1
+    assert not RecentReportCache(tmp_path / "cache.json").check("8.8.8.8")
+
+
+def test_resumed_duplicates_are_not_resent(mock_api, monkeypatch, tmp_path):
+    server = mock_api()
+    queue_pending(tmp_path, "8.8.8.8")
+    cache = RecentReportCache(tmp_path / "cache.json")
+    cache.check("8.8.8.8")
+    cache.save()
+    
+    assert run_main(monkeypatch, *resume_args(tmp_path)) == 0
+    
+    assert server.state.stats()["counts"].get("requests", 0) == 0
+    assert "\tduplicate\t" in (tmp_path / "results.txt").read_text()
+    with SubmissionQueue(tmp_path / "queue.sqlite3") as queue:
+        assert queue.pending_count() == 0
+
+
+def test_unspecified_ipv6_address_is_filtered_not_invalid(monkeypatch, tmp_path):
+    # "::" packs to 0, which must not be mistaken for an invalid address
+    (tmp_path / "ips.txt").write_text("::\nnot-an-ip\n")
+    results = tmp_path / "results.txt"
+    
+    run_main(monkeypatch, "--input", str(tmp_path / "ips.txt"), "--categories", "ssh",
+             "--comment", "test", "--dry-run", "--results", str(results))
+    
+    statuses = [line.split("\t")[2] for line in results.read_text().splitlines()]
+    assert statuses == ["filtered", "invalid"]
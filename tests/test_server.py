@@ -0,0 +1,55 @@
+"""Tests for the local HTTP ingest server."""
+
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+from server import IngestServer, IngestService, parse_listen_address
+
+
+@pytest.fixture
+def ingest_server():
+    service = IngestService(None, lambda record: (None, "not used"))
+    server = IngestServer(("127.0.0.1", 0), service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def test_negative_content_length_is_rejected(ingest_server):
+    host, port = ingest_server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=5)
+    connection.putrequest("POST", "/reports")
+    connection.putheader("Content-Length", "-1")
+    connection.endheaders()
+    
+    response = connection.getresponse()
+    assert response.status == 400
+    assert json.loads(response.read()) == {"error": "Invalid Content-Length"}
+    connection.close()
+
+
+def ipv6_loopback_available() -> bool:
+    try:
+        with socket.socket(socket.AF_INET6) as probe:
+            probe.bind(("::1", 0))
+    except OSError:
+        return False
+    return True
+
+
+@pytest.mark.skipif(not ipv6_loopback_available(), reason="IPv6 loopback not available")
+def test_bracketed_ipv6_listen_address():
+    assert parse_listen_address("[::1]:8790") == ("::1", 8790)
+    
+    service = IngestService(None, lambda record: (None, "not used"))
+    server = IngestServer(("::1", 0), service)
+    assert server.socket.family == socket.AF_INET6
+    server.server_close()
+    service.close()
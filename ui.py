@@ -45,8 +45,15 @@ class Colors:
 
 
 def clear_screen() -> None:
-    """Clear the terminal screen."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    """Clear the terminal screen (does nothing when output is redirected)."""
+    if not sys.stdout.isatty():
+        return
+    if os.name == 'nt':
+        os.system('cls')
+    else:
+        # The sequence `clear` prints, without spawning a shell for it
+        sys.stdout.write('\033[H\033[2J\033[3J')
+        sys.stdout.flush()
 
 
 def print_banner() -> None:
@@ -260,18 +267,25 @@ def get_confidence_input(default: int = 100) -> int:
             print_error("Please enter a valid number")
 
 
-def get_ip_input() -> str:
+def get_ip_input(address_filter=None) -> str:
     """Get IP address with enhanced validation feedback."""
-    from validators import validate_ip
+    from validators import pack_ip
+    from ipfilter import drop_message
     
     while True:
         ip = print_input_prompt("IP address (IPv4 or IPv6)")
+        packed_ip = pack_ip(ip)
         
-        if validate_ip(ip):
+        if packed_ip is None:
+            print_error(f"'{ip}' is not a valid IP address")
+            continue
+        
+        reason = address_filter.check(packed_ip) if address_filter else None
+        if reason:
+            print_error(f"{drop_message(ip, reason)} and cannot be reported")
+        else:
             print_success(f"IP address valid: {ip}")
             return ip
-        else:
-            print_error(f"'{ip}' is not a valid IP address")
 
 
 def get_categories_input() -> list[str]:
@@ -1,8 +1,43 @@
 """Input validation utilities."""
 
 import re
+import socket
+from bisect import bisect_left
+from dataclasses import dataclass, field
 from ipaddress import IPv4Address, IPv6Address, AddressValueError
-from typing import Optional
+from typing import Iterable, Optional
+
+
+# Longest comment accepted by the AbuseIPDB API
+MAX_COMMENT_LENGTH = 1000
+
+# Packed addresses share one 128-bit space: IPv4 lives in ::ffff:0:0/96
+IPV4_MAPPED_PREFIX = 0xFFFF << 32
+
+# Packed value of an invalid input in IPBatch.values (every address,
+# including "::", packs to 0 or more)
+INVALID_IP = -1
+
+# Strict dotted quad (no leading zeros, each octet 0-255), ASCII digits only
+_OCTET = r"(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])"
+_IPV4_RE = re.compile(r"\.".join([_OCTET] * 4))
+
+
+@dataclass
+class IPBatch:
+    """Packed result of validating many IP strings at once."""
+    values: list[int] = field(default_factory=list)   # Packed address per input (INVALID_IP if invalid)
+    errors: list[int] = field(default_factory=list)   # Indices of invalid inputs
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    def address(self, index: int) -> Optional[str]:
+        """Return the canonical form of input ``index``, or None if invalid."""
+        position = bisect_left(self.errors, index)
+        if position < len(self.errors) and self.errors[position] == index:
+            return None
+        return unpack_ip(self.values[index])
 
 
 def validate_ipv4(ip: str) -> bool:
@@ -49,7 +84,82 @@ def validate_ip(ip: str) -> bool:
     Returns:
         True if valid IPv4 or IPv6, False otherwise
     """
-    return validate_ipv4(ip) or validate_ipv6(ip)
+    return pack_ip(ip) is not None
+
+
+def pack_ip(ip: str) -> Optional[int]:
+    """
+    Convert an IP address string to its packed integer form.
+    
+    Dotted-quad IPv4 is parsed without the ipaddress module; anything
+    else without a ":" is rejected without raising. IPv4 addresses (and
+    IPv4-mapped IPv6 addresses) map into ::ffff:0:0/96.
+    
+    Args:
+        ip: The IP address string to convert
+        
+    Returns:
+        Packed address, or None if ``ip`` is not a valid IP address
+    """
+    if _IPV4_RE.fullmatch(ip):
+        return IPV4_MAPPED_PREFIX | int.from_bytes(socket.inet_aton(ip), "big")
+    if ":" not in ip:
+        return None
+    try:
+        return int(IPv6Address(ip))
+    except AddressValueError:
+        return None
+
+
+def unpack_ip(value: int) -> str:
+    """
+    Convert a packed address back to its canonical string form.
+    
+    Args:
+        value: Packed address from pack_ip()
+        
+    Returns:
+        Dotted quad for IPv4, compressed lowercase notation for IPv6
+    """
+    if value >> 32 == 0xFFFF:
+        return socket.inet_ntoa((value & 0xFFFFFFFF).to_bytes(4, "big"))
+    return str(IPv6Address(value))
+
+
+def validate_ip_batch(ips: Iterable[str]) -> IPBatch:
+    """
+    Validate and pack many IP address strings in one pass.
+    
+    Much cheaper per address than validate_ip() in a loop: the IPv4 fast
+    path avoids ipaddress objects and exceptions entirely.
+    
+    Args:
+        ips: IP address strings (None or empty strings count as invalid)
+        
+    Returns:
+        IPBatch with one packed value per input and the invalid indices
+    """
+    batch = IPBatch()
+    values = batch.values
+    errors = batch.errors
+    match_ipv4 = _IPV4_RE.fullmatch
+    inet_aton = socket.inet_aton
+    from_bytes = int.from_bytes
+    
+    for index, ip in enumerate(ips):
+        if not ip:
+            errors.append(index)
+            values.append(INVALID_IP)
+        elif match_ipv4(ip):
+            values.append(IPV4_MAPPED_PREFIX | from_bytes(inet_aton(ip), "big"))
+        else:
+            value = pack_ip(ip)
+            if value is None:
+                errors.append(index)
+                values.append(INVALID_IP)
+            else:
+                values.append(value)
+    return batch
 
 
 def validate_confidence(confidence: int) -> tuple[bool, Optional[str]]:
@@ -84,8 +194,28 @@ def validate_comment(comment: str) -> tuple[bool, Optional[str]]:
     if not comment:
         return False, "Comment cannot be empty"
     
-    if len(comment) > 1000:
-        return False, "Comment cannot exceed 1000 characters"
+    if len(comment) > MAX_COMMENT_LENGTH:
+        return False, f"Comment cannot exceed {MAX_COMMENT_LENGTH} characters"
+    
+    return True, None
+
+
+def validate_concurrency(concurrency: int, maximum: int) -> tuple[bool, Optional[str]]:
+    """
+    Validate the number of concurrent bulk submission workers.
+    
+    Args:
+        concurrency: The requested worker count
+        maximum: The largest worker count allowed
+        
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    if not isinstance(concurrency, int):
+        return False, "Concurrency must be an integer"
+    
+    if concurrency < 1 or concurrency > maximum:
+        return False, f"Concurrency must be between 1 and {maximum}"
     
     return True, None
 